@@ -0,0 +1,195 @@
+# benchmarks/bench_conversions.py
+#
+# End-to-end benchmark over every N64 conversion path: each entry of
+# conversion_table plus the SRM layout overrides applied on top of it.
+# Runs headless; the GUI adapter is driven through stub dialogs.
+# Run from Source/universal_save_converter:
+#     python -m benchmarks.bench_conversions --output conversions.json
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_utils import percentile, write_json
+import core.history
+import core.logger
+from core.buffer_pool import BUFFER_POOL
+from core.timing import StageTimer
+from systems.n64.n64_constants import (
+    SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM,
+    EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL, RA_LABEL, SOURCE_LIST, TARGET_LIST
+)
+from systems.n64.n64_conversion_core import convert, write_result
+from systems.n64.n64_conversion_plan import resolve_plan
+from systems.n64.n64_conversion_table import conversion_table, srm_overrides
+
+STAGES = ("plan", "read", "resize", "swap", "write")
+TYPE_SIZES = {EEP_LABEL: SIZE_EEP, SRA_LABEL: SIZE_SRA, FLA_LABEL: SIZE_FLA, MPK_LABEL: SIZE_MPK, SRM_LABEL: SIZE_SRM}
+
+
+def conversion_paths():
+    """
+    (origin, labels) for every table entry, then every SRM override path the
+    table does not already list. Table keys are four labels joined by '-'.
+    """
+    paths = [("table", tuple(key.split("-"))) for key in conversion_table]
+    seen = {labels for _, labels in paths}
+    for src_type, tgt_type in srm_overrides:
+        sources = [RA_LABEL] if src_type == SRM_LABEL else SOURCE_LIST
+        targets = [RA_LABEL] if tgt_type == SRM_LABEL else TARGET_LIST
+        for src in sources:
+            for tgt in targets:
+                labels = (src, src_type, tgt, tgt_type)
+                if labels not in seen:
+                    seen.add(labels)
+                    paths.append(("override", labels))
+    return paths
+
+
+def run_stages(labels, in_path, out_path):
+    """
+    One headless conversion through the shipped convert()/write_result()
+    path, returning the StageTimer's stage times in nanoseconds.
+    """
+    timer = StageTimer()
+    plan = resolve_plan(*labels)
+    timer.lap("plan")
+    with convert(in_path, plan, quiet=True, timer=timer) as result:
+        write_result(result, out_path, quiet=True)
+    return {stage: round(timer.stages.get(stage, 0.0) * 1e9) for stage in STAGES}
+
+
+class _Var:
+    """Minimal stand-in for a Tk variable."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class StubDialogs:
+    """Replaces tkinter filedialog/messagebox so the GUI adapter runs headless."""
+
+    def __init__(self, out_path):
+        self.out_path = out_path
+        self.errors = []
+
+    def asksaveasfilename(self, **kwargs):
+        return self.out_path
+
+    def showinfo(self, title, message):
+        pass
+
+    def showerror(self, title, message):
+        self.errors.append(message)
+
+
+def run_adapter(labels, in_path, out_path):
+    """Full GUI-adapter conversion (convert_save_n64) with stubbed dialogs."""
+    from systems.n64.gui import n64_callbacks
+
+    stub = StubDialogs(out_path)
+    saved = n64_callbacks.filedialog, n64_callbacks.messagebox
+    n64_callbacks.filedialog = n64_callbacks.messagebox = stub
+    try:
+        start = time.perf_counter_ns()
+        n64_callbacks.convert_save_n64(
+            input_path=_Var(in_path), source_var=_Var(labels[0]), source_type_var=_Var(labels[1]),
+            target_var=_Var(labels[2]), target_type_var=_Var(labels[3]), byteswap_var=_Var("Default"),
+            trim_pad_var=_Var(False), log_box=None
+        )
+        elapsed = time.perf_counter_ns() - start
+    finally:
+        n64_callbacks.filedialog, n64_callbacks.messagebox = saved
+    if stub.errors:
+        raise RuntimeError(stub.errors[0])
+    return elapsed
+
+
+def summarize(samples):
+    return {
+        "p50_us": percentile(samples, 50) / 1000,
+        "p90_us": percentile(samples, 90) / 1000,
+        "p99_us": percentile(samples, 99) / 1000,
+        "max_us": max(samples) / 1000,
+    }
+
+
+def bench_path(origin, labels, work_dir, warm_runs, adapter):
+    plan = resolve_plan(*labels)
+    size = plan.src_size or TYPE_SIZES.get(labels[1], SIZE_SRA)
+    in_path = os.path.join(work_dir, "input.bin")
+    out_path = os.path.join(work_dir, "output.bin")
+    with open(in_path, "wb") as f:
+        f.write(os.urandom(size))
+
+    # Cold: empty plan cache and buffer pool, first touch of the output file
+    resolve_plan.cache_clear()
+    BUFFER_POOL.clear()
+    if os.path.exists(out_path):
+        os.remove(out_path)
+    cold = run_stages(labels, in_path, out_path)
+
+    warm = {stage: [] for stage in STAGES}
+    totals = []
+    for _ in range(warm_runs):
+        timings = run_stages(labels, in_path, out_path)
+        for stage in STAGES:
+            warm[stage].append(timings[stage])
+        totals.append(sum(timings.values()))
+
+    record = {
+        "origin": origin,
+        "key": plan.key,
+        "input_size": size,
+        "output_size": plan.output_size(size),
+        "offset": plan.offset,
+        "swap_size": plan.swap_size,
+        "cold_us": {stage: cold[stage] / 1000 for stage in STAGES},
+        "cold_total_us": sum(cold.values()) / 1000,
+        "warm": {stage: summarize(samples) for stage, samples in warm.items()},
+        "warm_total": summarize(totals),
+    }
+    if adapter:
+        record["gui_adapter"] = summarize([run_adapter(labels, in_path, out_path) for _ in range(warm_runs)])
+    return record
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end N64 conversion matrix benchmark")
+    parser.add_argument("--output", default="bench_conversions.json", help="JSON result file")
+    parser.add_argument("--runs", type=int, default=50, help="Warm runs per path")
+    parser.add_argument("--no-adapter", action="store_true",
+                        help="Skip the GUI adapter (needs tkinter importable, no display)")
+    args = parser.parse_args(argv)
+
+    # Keep the benchmark's own log lines out of the terminal, conversion_log.txt and the history
+    devnull = open(os.devnull, "w")
+    core.logger.set_console_stream(devnull)
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        core.logger.LOG_FILE = os.path.join(work_dir, "bench_log.txt")
+        core.history.HISTORY_FILE = os.path.join(work_dir, "bench_history.jsonl")
+        for origin, labels in conversion_paths():
+            results.append(bench_path(origin, labels, work_dir, args.runs, not args.no_adapter))
+        core.logger.flush_logs()
+
+    devnull.close()
+    write_json(args.output, results, benchmark="conversions", warm_runs=args.runs)
+
+    print(f"{'origin':9}{'path':90} {'cold':>9} {'p50':>9} {'p99':>9}  slowest stage")
+    for record in sorted(results, key=lambda r: r["warm_total"]["p50_us"], reverse=True):
+        slowest = max(STAGES, key=lambda stage: record["warm"][stage]["p50_us"])
+        print(f"{record['origin']:9}{record['key']:90} {record['cold_total_us']:8.0f}u "
+              f"{record['warm_total']['p50_us']:8.0f}u {record['warm_total']['p99_us']:8.0f}u  {slowest}")
+    print(f"\nWrote {len(results)} paths to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
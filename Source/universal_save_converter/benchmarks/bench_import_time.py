@@ -0,0 +1,159 @@
+# benchmarks/bench_import_time.py
+#
+# Cold import-time budgets. Each module is imported in a fresh interpreter
+# under `python -X importtime`; the median cumulative time over --repeat
+# runs is compared with benchmarks/import_budgets.json. Exits 1 when any
+# module is over budget, listing its slowest transitive imports.
+# Run from Source/universal_save_converter:
+#     python -m benchmarks.bench_import_time
+#     python -m benchmarks.bench_import_time --output imports.json --top 15
+
+import argparse
+import os
+import pkgutil
+import subprocess
+import sys
+from statistics import median
+
+from benchmarks.bench_utils import load_json, write_json
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGETS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budgets.json")
+
+# Entry points and the headless core; systems.* modules are added by discovery
+BASE_MODULES = [
+    "main",
+    "cli",
+    "gui.main_gui",
+    "systems.registry",
+    "core.logger",
+    "core.file_utils",
+    "core.swap_utils",
+    "core.stream_utils",
+    "core.history",
+    "core.timing",
+    "core.profiling",
+]
+
+
+def system_modules():
+    """Every importable module under systems/ (package names must be identifiers)."""
+    found = []
+    systems_dir = os.path.join(SOURCE_DIR, "systems")
+    for info in pkgutil.walk_packages([systems_dir], prefix="systems.", onerror=lambda name: None):
+        if all(part.isidentifier() for part in info.name.split(".")):
+            found.append(info.name)
+    return sorted(found)
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Parse `-X importtime` lines into (module, self_us, cumulative_us, depth)
+    tuples in output order (children are printed before their parent).
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            head, cumulative_us, raw_name = line.split("|", 2)
+            self_us = int(head.split(":", 1)[1])
+            cumulative_us = int(cumulative_us)
+        except ValueError:
+            continue
+        name = raw_name.lstrip()
+        depth = (len(raw_name) - len(name) - 1) // 2
+        records.append((name.strip(), self_us, cumulative_us, depth))
+    return records
+
+
+def transitive_imports(records, index) -> list:
+    """
+    The imports triggered by records[index]: the run of deeper-indented
+    lines printed just before it (interpreter start-up imports are excluded).
+    """
+    depth = records[index][3]
+    start = index
+    while start > 0 and records[start - 1][3] > depth:
+        start -= 1
+    return records[start:index]
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Median cumulative import time of module in fresh interpreters, plus its slowest imports."""
+    env = dict(os.environ, PYTHONPATH=SOURCE_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    totals, runs = [], []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, cwd=SOURCE_DIR, env=env
+        )
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1:] or ["import failed"]}
+        records = parse_importtime(proc.stderr)
+        index = next((i for i in range(len(records) - 1, -1, -1) if records[i][0] == module), None)
+        if index is None:
+            return {"module": module, "error": ["module missing from -X importtime output"]}
+        totals.append(records[index][2])
+        runs.append(transitive_imports(records, index))
+
+    # Slowest transitive imports from the median run, by cumulative time
+    transitive = runs[sorted(range(len(totals)), key=totals.__getitem__)[len(totals) // 2]]
+    return {
+        "module": module,
+        "median_ms": median(totals) / 1000,
+        "min_ms": min(totals) / 1000,
+        "modules_imported": len(transitive) + 1,
+        "slowest": [{"module": name, "cumulative_ms": cumulative / 1000, "self_ms": self_us / 1000}
+                    for name, self_us, cumulative, _ in
+                    sorted(transitive, key=lambda r: r[2], reverse=True)],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold import-time budget check")
+    parser.add_argument("modules", nargs="*", help="Modules to measure (default: entry points, core and systems.*)")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="JSON file of {module: budget_ms}")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=8, help="Slowest transitive imports to list per module")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    budgets = load_json(args.budgets) if os.path.exists(args.budgets) else {}
+    default_budget = budgets.pop("*", None)
+    modules = args.modules or list(dict.fromkeys(BASE_MODULES + system_modules()))
+
+    results, over = [], []
+    for module in modules:
+        result = measure(module, args.repeat)
+        budget = budgets.get(module, default_budget)
+        result["budget_ms"] = budget
+        results.append(result)
+
+        if "error" in result:
+            over.append(result)
+            print(f"{module:45} ERROR {result['error'][0]}")
+            continue
+        status = "ok"
+        if budget is not None and result["median_ms"] > budget:
+            status = "OVER"
+            over.append(result)
+        budget_text = f"{budget:8.1f}" if budget is not None else "       -"
+        print(f"{module:45} {result['median_ms']:8.1f} ms  budget {budget_text}  "
+              f"{result['modules_imported']:4d} modules  {status}", flush=True)
+
+    if args.output:
+        write_json(args.output, results, benchmark="import_time", repeat=args.repeat)
+
+    for result in over:
+        if "error" in result:
+            continue
+        print(f"\n{result['module']} is over budget ({result['median_ms']:.1f} ms > {result['budget_ms']:.1f} ms). "
+              f"Slowest imports:")
+        for entry in result["slowest"][:args.top]:
+            print(f"  {entry['module']:40} {entry['cumulative_ms']:8.2f} ms cumulative  {entry['self_ms']:7.2f} ms self")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# benchmarks/bench_kernels.py
+#
+# Microbenchmarks for the byte-swap and resize kernels.
+# Run from Source/universal_save_converter:
+#     python -m benchmarks.bench_kernels --output kernels.json
+#     python -m benchmarks.bench_kernels --baseline old.json --quick
+
+import argparse
+import io
+import os
+import sys
+
+from benchmarks.bench_utils import (
+    human_size, load_json, peak_allocation, summarize, time_call, write_json
+)
+from benchmarks.legacy_kernels import byteswap_loop, resize_bytes_loop
+from core.buffer_pool import BufferPool
+from core.file_utils import resize_bytes
+from core.stream_utils import stream_convert
+from core.swap_utils import byteswap, byteswap_inplace
+from systems.n64.n64_constants import SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM
+
+MIB = 1024 * 1024
+SAVE_SIZES = sorted({SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM})
+LARGE_SIZES = [1 * MIB, 8 * MIB, 64 * MIB]
+SWAP_WIDTHS = (2, 4, 8)
+
+
+def swap_impls(width):
+    """(name, func, setup) triples; setup output is passed to func untimed."""
+    return [
+        ("legacy_loop", lambda data: byteswap_loop(data, width), None),
+        ("byteswap", lambda data: byteswap(data, width), None),
+        ("byteswap_inplace", lambda buf: byteswap_inplace(buf, width), bytearray),
+        ("stream_convert", lambda data: stream_convert(io.BytesIO(data), io.BytesIO(), None, 0, width), None),
+    ]
+
+
+def resize_impls(new_size, offset):
+    pool = BufferPool(sizes=(new_size,))
+    pool.release(bytearray(new_size))
+
+    def pooled(data):
+        buffer = pool.acquire(new_size)
+        resize_bytes(memoryview(data), new_size, offset, out=buffer)
+        pool.release(buffer)
+
+    return [
+        ("legacy_loop", lambda data: resize_bytes_loop(data, new_size, offset), None),
+        ("resize_bytes", lambda data: resize_bytes(data, new_size, offset), None),
+        ("resize_bytes_out", lambda out_and_data: resize_bytes(out_and_data[1], new_size, offset,
+                                                               out=out_and_data[0]), "prealloc"),
+        ("resize_bytes_pooled", pooled, None),
+        ("stream_convert", lambda data: stream_convert(io.BytesIO(data), io.BytesIO(), new_size, offset), None),
+    ]
+
+
+def run_case(results, kernel, impl, size, func, setup, data, repeat, params, track_alloc):
+    """Time one implementation on one input and append its record."""
+    if setup is None:
+        call, make = (lambda: func(data)), None
+    elif setup == "prealloc":
+        call, make = func, (lambda: (bytearray(params["new_size"]), memoryview(data)))
+    else:
+        call, make = func, (lambda: setup(data))
+
+    samples = time_call(call, repeat, setup=make)
+    record = {"kernel": kernel, "impl": impl, "size": size, **params, **summarize(samples)}
+    record["ns_per_byte"] = record["median_ns"] / size
+    if track_alloc:
+        peak = peak_allocation(call, setup=make)
+        record["peak_alloc_bytes"] = peak
+        record["alloc_copies"] = round(peak / size, 2)
+    results.append(record)
+    print(f"  {kernel:8} {impl:20} {human_size(size):>10} "
+          f"{' '.join(f'{k}={v}' for k, v in params.items()):24} "
+          f"{record['ns_per_byte']:9.3f} ns/B"
+          + (f"  peak {human_size(record['peak_alloc_bytes'])}" if track_alloc else ""),
+          flush=True)
+
+
+def run(sizes, repeat, legacy_max_size, track_alloc):
+    results = []
+    for size in sizes:
+        data = os.urandom(size)
+        runs = max(1, repeat if size <= 8 * MIB else repeat // 4)
+
+        for width in SWAP_WIDTHS:
+            for impl, func, setup in swap_impls(width):
+                if impl == "legacy_loop" and size > legacy_max_size:
+                    continue
+                run_case(results, "byteswap", impl, size, func, setup, data,
+                         1 if impl == "legacy_loop" else runs, {"width": width}, track_alloc)
+
+        offset = (size // 4) & ~7
+        for signed_offset in (offset, -offset):
+            new_size = size + signed_offset
+            for impl, func, setup in resize_impls(new_size, signed_offset):
+                if impl == "legacy_loop" and size > legacy_max_size:
+                    continue
+                run_case(results, "resize", impl, size, func, setup, data,
+                         1 if impl == "legacy_loop" else runs,
+                         {"offset": signed_offset, "new_size": new_size}, track_alloc)
+    return results
+
+
+def compare(results, baseline_path):
+    """Print median speed ratios against an earlier result file."""
+    def key(r):
+        return (r["kernel"], r["impl"], r["size"], r.get("width"), r.get("offset"))
+
+    baseline = {key(r): r for r in load_json(baseline_path)["results"]}
+    print(f"\nCompared with {baseline_path} (ratio > 1 is faster now):")
+    for record in results:
+        old = baseline.get(key(record))
+        if old:
+            ratio = old["median_ns"] / record["median_ns"] if record["median_ns"] else float("inf")
+            print(f"  {record['kernel']:8} {record['impl']:20} {human_size(record['size']):>10} {ratio:7.2f}x")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Byte-swap and resize kernel benchmarks")
+    parser.add_argument("--output", default="bench_kernels.json", help="JSON result file")
+    parser.add_argument("--baseline", help="Earlier JSON result file to compare against")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--quick", action="store_true", help="Standard save sizes only")
+    parser.add_argument("--legacy-max-size", type=int, default=8 * MIB,
+                        help="Skip the legacy loops above this input size")
+    parser.add_argument("--no-alloc", action="store_true", help="Skip tracemalloc allocation tracking")
+    args = parser.parse_args(argv)
+
+    sizes = SAVE_SIZES if args.quick else SAVE_SIZES + LARGE_SIZES
+    results = run(sizes, args.repeat, args.legacy_max_size, not args.no_alloc)
+    write_json(args.output, results, benchmark="kernels")
+    print(f"\nWrote {len(results)} results to {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
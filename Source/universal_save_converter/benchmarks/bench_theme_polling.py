@@ -0,0 +1,193 @@
+# benchmarks/bench_theme_polling.py
+#
+# Idle cost of dark-mode watching. A ThemeWatcher is driven by a stub
+# provider on a simulated clock (no display needed), counting provider
+# reads (process spawns with the macOS provider) and the CPU spent in
+# polling over an idle session. Then the appearance is changed several
+# times, each after the watcher has backed off fully and at a different
+# point of its poll period, and the median and worst pickup latency are
+# reported: backoff trades reads for up to max_interval of latency.
+# "fixed" polls every second like the old start_polling loop; "backoff"
+# and "hidden" use the default intervals.
+# Run from Source/universal_save_converter:
+#     python -m benchmarks.bench_theme_polling --seconds 3600 --output theme.json
+
+import argparse
+import heapq
+import itertools
+import statistics
+import sys
+import time
+
+from benchmarks.bench_utils import summarize, time_call, write_json
+from core import theme_utils
+from core.theme_utils import (
+    POLL_BACKOFF, POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, StaticThemeProvider, ThemeWatcher
+)
+
+
+class SimulatedRoot:
+    """Just enough of a Tk toplevel for a ThemeWatcher, on a virtual clock (ms)."""
+
+    def __init__(self):
+        self.now = 0
+        self.visible = True
+        self.bindings = {}
+        self.configures = 0
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def __str__(self):
+        return "."
+
+    # Scheduling
+    def after(self, delay, func, *args):
+        timer_id = f"after#{next(self._ids)}"
+        heapq.heappush(self._queue, (self.now + delay, timer_id, func, args))
+        return timer_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, timer_id):
+        self._cancelled.add(timer_id)
+
+    def run_until(self, end_ms):
+        """Run due callbacks up to end_ms; returns CPU seconds spent in them."""
+        cpu = 0.0
+        while self._queue and self._queue[0][0] <= end_ms:
+            when, timer_id, func, args = heapq.heappop(self._queue)
+            if timer_id in self._cancelled:
+                continue
+            self.now = when
+            start = time.process_time()
+            func(*args)
+            cpu += time.process_time() - start
+        self.now = end_ms
+        return cpu
+
+    # Widget interface
+    def bind(self, sequence, func, add=None):
+        self.bindings.setdefault(sequence, []).append(func)
+
+    def fire(self, sequence):
+        event = type("Event", (), {"widget": self})()
+        for func in self.bindings.get(sequence, ()):
+            func(event)
+
+    def configure(self, **options):
+        self.configures += 1
+
+    def winfo_toplevel(self):
+        return self
+
+    def winfo_children(self):
+        return []
+
+    def winfo_viewable(self):
+        return self.visible
+
+
+def backoff_span(min_interval, max_interval):
+    """Idle ms until a watcher polls at max_interval, plus one full period."""
+    total, interval = 0, min_interval
+    while interval < max_interval:
+        total += interval
+        interval = min(interval * POLL_BACKOFF, max_interval)
+    return total + max_interval
+
+
+def change_latency(root, provider, limit_ms, step=10):
+    """Switch the appearance now (showing the window if hidden); ms until it is applied."""
+    provider.dark = not provider.dark
+    if not root.visible:
+        root.visible = True
+        root.fire("<Map>")
+    start = root.now
+    applies = root.configures
+    while root.configures == applies and root.now < start + limit_ms:
+        root.run_until(root.now + step)
+    return root.now - start
+
+
+def run_scenario(name, seconds, min_interval, max_interval, hide_after=None, changes=8):
+    theme_utils._toplevels.clear()
+    root = SimulatedRoot()
+    provider = StaticThemeProvider(dark=False, dynamic=True)
+    watcher = ThemeWatcher(root, provider, min_interval=min_interval, max_interval=max_interval).start()
+
+    end_ms = seconds * 1000
+    cpu = 0.0
+    if hide_after is not None:
+        cpu += root.run_until(hide_after * 1000)
+        root.visible = False
+        root.fire("<Unmap>")
+    cpu += root.run_until(end_ms)
+    idle_reads = provider.reads
+
+    # Each change comes after a full backoff, shifted by a fraction of the
+    # poll period so the changes do not all land on a poll boundary
+    settle = backoff_span(min_interval, max_interval)
+    latencies = []
+    for i in range(changes):
+        if hide_after is not None:
+            root.visible = False
+            root.fire("<Unmap>")
+        root.run_until(root.now + settle + (i * max_interval) // changes + 1)
+        latencies.append(change_latency(root, provider, 10 * max_interval))
+    watcher.stop()
+
+    return {
+        "scenario": name,
+        "seconds": seconds,
+        "min_interval_ms": min_interval,
+        "max_interval_ms": max_interval,
+        "hidden_after_s": hide_after,
+        "idle_reads": idle_reads,
+        "reads_per_minute": idle_reads / (seconds / 60),
+        "cpu_ms": cpu * 1000,
+        "changes": changes,
+        "change_latency_ms": latencies,
+        "median_latency_ms": statistics.median(latencies),
+        "max_latency_ms": max(latencies),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Idle cost of dark-mode polling")
+    parser.add_argument("--seconds", type=int, default=3600, help="Simulated idle session length")
+    parser.add_argument("--hide-after", type=int, default=60, help="Seconds visible before hiding (hidden scenario)")
+    parser.add_argument("--changes", type=int, default=8,
+                        help="Appearance changes to time, spread over the poll period")
+    parser.add_argument("--real-reads", type=int, default=5,
+                        help="Time this many reads of the platform's real provider (0 to skip)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_scenario("fixed", args.seconds, POLL_MIN_INTERVAL, POLL_MIN_INTERVAL, changes=args.changes),
+        run_scenario("backoff", args.seconds, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, changes=args.changes),
+        run_scenario("hidden", args.seconds, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, hide_after=args.hide_after,
+                     changes=args.changes),
+    ]
+
+    print(f"{'scenario':10} {'reads':>7} {'reads/min':>10} {'cpu':>10} {'latency p50':>12} {'latency max':>12}")
+    for result in results:
+        print(f"{result['scenario']:10} {result['idle_reads']:7d} {result['reads_per_minute']:10.2f} "
+              f"{result['cpu_ms']:8.2f}ms {result['median_latency_ms']:10.0f}ms {result['max_latency_ms']:10.0f}ms")
+
+    real = None
+    if args.real_reads > 0:
+        provider = theme_utils.default_provider()
+        real = summarize(time_call(provider.read, args.real_reads))
+        real["provider"] = type(provider).__name__
+        print(f"\n{real['provider']}.read(): median {real['median_ns'] / 1e6:.3f} ms over {real['runs']} reads")
+
+    if args.output:
+        write_json(args.output, results, benchmark="theme_polling", real_provider=real)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
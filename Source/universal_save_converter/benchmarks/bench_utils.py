@@ -0,0 +1,98 @@
+# benchmarks/bench_utils.py
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from statistics import median
+
+
+def git_commit() -> str | None:
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def environment() -> dict:
+    """Metadata stored with every result file so runs can be compared."""
+    return {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    rank = max(1, min(len(ordered), round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[rank - 1]
+
+
+def time_call(func, repeat: int, setup=None) -> list:
+    """
+    Run func() repeat times and return each duration in nanoseconds.
+    setup(), if given, runs untimed before every call and its result is passed in.
+    """
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter_ns()
+        func(arg) if setup else func()
+        samples.append(time.perf_counter_ns() - start)
+    return samples
+
+
+def peak_allocation(func, setup=None) -> int:
+    """Peak bytes allocated by one call of func, measured with tracemalloc."""
+    arg = setup() if setup else None
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func(arg) if setup else func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(0, peak - before)
+
+
+def summarize(samples) -> dict:
+    return {
+        "runs": len(samples),
+        "min_ns": min(samples),
+        "median_ns": median(samples),
+        "p90_ns": percentile(samples, 90),
+        "p99_ns": percentile(samples, 99),
+    }
+
+
+def write_json(path: str, results, **extra) -> None:
+    payload = {"environment": environment(), **extra, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def human_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:g} {unit}" if unit == "B" else f"{size:.4g} {unit}"
+        size /= 1024
@@ -0,0 +1,30 @@
+# benchmarks/legacy_kernels.py
+#
+# The original per-byte/per-chunk Python loops, kept only as a baseline for
+# the benchmarks. Nothing in the converter imports this module.
+
+
+def byteswap_loop(data: bytes, swap_size: int) -> bytes:
+    """Original core/swap_utils.byteswap."""
+    if swap_size <= 1:
+        return data
+
+    swapped = bytearray(len(data))
+    for i in range(0, len(data), swap_size):
+        chunk = data[i:i + swap_size]
+        swapped[i:i + len(chunk)] = chunk[::-1]
+    return bytes(swapped)
+
+
+def resize_bytes_loop(data: bytes, new_size: int, offset: int = 0) -> bytes:
+    """Original core/file_utils.resize_bytes."""
+    if offset < 0:
+        data = data[abs(offset):]
+        offset = 0
+
+    result = bytearray(new_size)
+    for i in range(len(data)):
+        dest_index = i + offset
+        if 0 <= dest_index < new_size:
+            result[dest_index] = data[i]
+    return bytes(result)
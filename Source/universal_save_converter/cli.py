@@ -0,0 +1,237 @@
+# cli.py
+#
+# Command-line entry point: `usc convert ...` (run as `python main.py convert ...`).
+# `usc convert - -` filters a single save from stdin to stdout;
+# `usc history` queries the structured conversion history.
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+
+from core.exceptions import ConversionError
+from core.file_utils import detect_file_type
+from core.history import read_history, record_conversion, RESULT_CANCELLED, RESULT_FAILED, RESULT_OK
+from core.logger import log, set_console_stream
+from core.profiling import DEFAULT_MEMORY_TOP, DEFAULT_PREFIX, maybe_profiled
+from core.stream_utils import STREAM_CHUNK_SIZE, LazyFileWriter
+from core.timing import format_stats, stats
+from core.trace import write_trace
+from systems.n64.n64_batch import expand_inputs, plan_jobs, record_batch_result, run_batch
+from systems.n64.n64_constants import (
+    N64System, N64SaveType, SYSTEM_LABELS, SAVE_TYPE_LABELS, LABEL_TO_SAVE_TYPE
+)
+from systems.n64.n64_conversion_core import convert_stream, record_stats
+from systems.n64.n64_conversion_plan import get_plan
+from systems.n64.n64_utils import determine_valid_target_types
+
+# Command-line names for systems (aliases map onto the same enum)
+SYSTEM_NAMES = {
+    "native": N64System.NATIVE,
+    "pj64": N64System.PJ64,
+    "project64": N64System.PJ64,
+    "mupen64": N64System.PJ64,
+    "ra": N64System.RA,
+    "retroarch": N64System.RA,
+    "wii": N64System.WII,
+    "everdrive": N64System.WII,
+}
+SAVE_TYPE_NAMES = {save_type.name.lower(): save_type for save_type in N64SaveType}
+BYTESWAP_CHOICES = {"default": "Default", "2": "2 bytes", "4": "4 bytes"}
+
+
+def positive_int(text: str) -> int:
+    """argparse type for sizes and counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def plan_for(args, path=None):
+    """
+    Pick the ConversionPlan for one input. Returns (plan, None), or
+    (None, reason) when the save type cannot be determined.
+    """
+    src = SYSTEM_NAMES[args.source]
+    tgt = SYSTEM_NAMES[args.target]
+
+    if args.source_type:
+        src_type = SAVE_TYPE_NAMES[args.source_type]
+    else:
+        label = detect_file_type(path) if path else None
+        if label is None:
+            return None, "unknown save type (use --source-type)"
+        src_type = LABEL_TO_SAVE_TYPE[label]
+
+    if args.target_type:
+        tgt_type = SAVE_TYPE_NAMES[args.target_type]
+    else:
+        valid = determine_valid_target_types(SYSTEM_LABELS[src], SAVE_TYPE_LABELS[src_type], SYSTEM_LABELS[tgt])
+        if len(valid) != 1:
+            return None, "target type is ambiguous (use --target-type)"
+        tgt_type = LABEL_TO_SAVE_TYPE[valid[0]]
+
+    return get_plan(src, src_type, tgt, tgt_type), None
+
+
+def build_jobs(args):
+    """Turn parsed arguments into BatchJobs, logging inputs that cannot be planned."""
+    jobs, skipped = plan_jobs(
+        expand_inputs(args.inputs, recursive=args.recursive),
+        lambda path: plan_for(args, path),
+        args.output_dir, prefix=args.prefix,
+        byteswap_option=BYTESWAP_CHOICES[args.byteswap], overwrite=args.overwrite
+    )
+    for path, reason in skipped:
+        log(f"Skipping {path}: {reason}.", level="WARN")
+    return jobs, len(skipped)
+
+
+def cmd_convert_stream(args) -> int:
+    """`usc convert - [OUTPUT]`: convert one save from stdin to OUTPUT or stdout."""
+    if len(args.inputs) > 2:
+        log("Reading stdin takes at most one output argument.", level="ERROR")
+        return 2
+    output = args.inputs[1] if len(args.inputs) == 2 else "-"
+    if output == "-":
+        # stdout carries the save data; keep log lines off it
+        set_console_stream(sys.stderr)
+
+    plan, reason = plan_for(args)
+    if plan is None:
+        log(f"Cannot convert stdin: {reason}.", level="ERROR")
+        return 2
+
+    out_path = None if output == "-" else output
+    # OUTPUT is only opened (and truncated) once stdin has produced data
+    writer = sys.stdout.buffer if output == "-" else LazyFileWriter(output)
+    start = time.perf_counter()
+    result = None
+    try:
+        result = convert_stream(sys.stdin.buffer, writer, plan, BYTESWAP_CHOICES[args.byteswap],
+                                chunk_size=args.chunk_size, drain=True, quiet=not args.verbose)
+        writer.flush()
+    except ConversionError as e:
+        log(str(e), level="ERROR")
+        record_conversion(None, out_path, plan, result=RESULT_FAILED, error=e, origin="stream",
+                          timings={"stream": time.perf_counter() - start})
+        return 1
+    finally:
+        if writer is not sys.stdout.buffer:
+            writer.close()
+    record_stats(result)
+    record_conversion(None, out_path, plan, input_size=result.input_size,
+                      output_size=result.size, swap_size=result.swap_size, origin="stream",
+                      timings=result.timings.stages)
+    if args.stats:
+        log_stats()
+    return 0
+
+
+def cmd_convert(args) -> int:
+    if args.inputs[0] == "-":
+        return cmd_convert_stream(args)
+
+    jobs, skipped = build_jobs(args)
+    if not jobs:
+        log("No input files to convert.", level="ERROR")
+        return 1
+
+    summary = run_batch(jobs, max_workers=args.jobs, trace=bool(args.trace))
+
+    for job, result in zip(jobs, summary.results):
+        record_batch_result(job, result)
+        if result.error:
+            log(f"{result.input_path}: {result.error}", level="ERROR")
+        elif args.verbose:
+            log(f"{result.input_path} → {result.output_path}", level="SUCCESS")
+
+    log(
+        f"Converted {summary.converted} file(s), {summary.failed} failed, {skipped} skipped "
+        f"in {summary.elapsed:.2f}s ({summary.files_per_second:.1f} files/s, "
+        f"{summary.megabytes_per_second:.1f} MB/s)",
+        level="SUCCESS" if not summary.failed else "WARN"
+    )
+    if args.stats:
+        log_stats()
+    if args.trace:
+        count = write_trace(args.trace, summary, jobs)
+        log(f"Wrote {count} trace events to {args.trace} (open in chrome://tracing or Perfetto)", level="INFO")
+    return 0 if not summary.failed else 1
+
+
+def log_stats():
+    """Log per-path stage timings (p50/p95/p99 and throughput) for this run."""
+    for line in format_stats(stats()):
+        log(line, level="INFO")
+
+
+def cmd_history(args) -> int:
+    """`usc history`: print matching conversion records as JSON lines, oldest first."""
+    records = read_history(args.file, include_rotated=not args.current_only, result=args.result,
+                           plan_key=args.plan, since=args.since)
+    if args.last:
+        records = deque(records, maxlen=args.last)
+    for record in records:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="usc", description="Universal Save Converter")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert = commands.add_parser("convert", help="Batch-convert N64 saves")
+    convert.add_argument("inputs", nargs="+",
+                         help="Save files, directories or glob patterns; '- [OUTPUT]' reads stdin")
+    convert.add_argument("--source", required=True, choices=sorted(SYSTEM_NAMES), help="Source system")
+    convert.add_argument("--target", required=True, choices=sorted(SYSTEM_NAMES), help="Target system")
+    convert.add_argument("--source-type", choices=sorted(SAVE_TYPE_NAMES),
+                         help="Source save type (default: detect from extension)")
+    convert.add_argument("--target-type", choices=sorted(SAVE_TYPE_NAMES),
+                         help="Target save type (default: the only valid type)")
+    convert.add_argument("--byteswap", choices=sorted(BYTESWAP_CHOICES), default="default",
+                         help="Force a byte swap width")
+    convert.add_argument("-o", "--output-dir", help="Output directory (default: next to each input)")
+    convert.add_argument("--prefix", default="Converted_", help="Output filename prefix")
+    convert.add_argument("-r", "--recursive", action="store_true", help="Walk directories recursively")
+    convert.add_argument("-j", "--jobs", type=positive_int, default=None, help="Worker processes (default: CPU count)")
+    convert.add_argument("--overwrite", action="store_true", help="Replace existing output files")
+    convert.add_argument("--chunk-size", type=positive_int, default=STREAM_CHUNK_SIZE,
+                         help="Chunk size in bytes when streaming stdin")
+    convert.add_argument("-v", "--verbose", action="store_true", help="Log every converted file")
+    convert.add_argument("--stats", action="store_true",
+                         help="Log per-path stage timings (p50/p95/p99, MB/s) when done")
+    convert.add_argument("--trace", metavar="FILE",
+                         help="Write a Chrome trace-event timeline of the batch (per file and stage, per worker)")
+    convert.add_argument("--profile", nargs="?", const=DEFAULT_PREFIX, metavar="PREFIX",
+                         help="Profile the run with cProfile into PREFIX-*.pstats/.collapsed "
+                              "(also enabled by USC_PROFILE); use -j 1 to include conversion work")
+    convert.add_argument("--profile-memory", type=int, nargs="?", const=DEFAULT_MEMORY_TOP, metavar="N",
+                         help="With --profile, also report the top N tracemalloc allocation sites")
+    convert.set_defaults(func=cmd_convert)
+
+    history = commands.add_parser("history", help="Query the structured conversion history")
+    history.add_argument("--file", default=None, help="History file (default: conversion_history.jsonl)")
+    history.add_argument("--result", choices=[RESULT_OK, RESULT_FAILED, RESULT_CANCELLED], help="Only this outcome")
+    history.add_argument("--plan", help="Only plans whose key contains this text")
+    history.add_argument("--since", help="Only records at or after this ISO timestamp")
+    history.add_argument("--last", type=positive_int, default=None, help="Only the newest N matching records")
+    history.add_argument("--current-only", action="store_true", help="Skip rotated segments")
+    history.set_defaults(func=cmd_history)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    with maybe_profiled(args.command, getattr(args, "profile", None), getattr(args, "profile_memory", None)):
+        return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
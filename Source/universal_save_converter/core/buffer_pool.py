@@ -0,0 +1,84 @@
+# core/buffer_pool.py
+
+import threading
+from systems.n64.n64_constants import SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM
+
+# Size classes the default pool keeps buffers for (standard N64 save sizes)
+STANDARD_SIZES = tuple(sorted({SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM}))
+
+
+class BufferPool:
+    """
+    Lends out zeroed bytearrays of fixed size classes and takes them back,
+    so repeated conversions reuse the same few buffers instead of
+    allocating fresh ones. Sizes outside the classes are plain allocations.
+    Thread-safe.
+    """
+
+    def __init__(self, sizes=STANDARD_SIZES, max_per_size: int = 4):
+        self.max_per_size = max_per_size
+        self._free = {size: [] for size in sizes}
+        self._zeros = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.returns = 0
+        self.discards = 0
+
+    def acquire(self, size: int) -> bytearray:
+        """Return a zero-filled bytearray of exactly size bytes."""
+        free = self._free.get(size)
+        with self._lock:
+            if free:
+                self.hits += 1
+                return free.pop()
+            self.misses += 1
+        return bytearray(size)
+
+    def release(self, buffer) -> None:
+        """Give a buffer back. Buffers that don't fit a size class are dropped."""
+        size = len(buffer)
+        free = self._free.get(size)
+        if free is None or not isinstance(buffer, bytearray):
+            with self._lock:
+                self.discards += 1
+            return
+
+        # Zero outside the lock; same-length slice assignment never reallocates
+        buffer[:] = self._zero_block(size)
+        with self._lock:
+            if len(free) < self.max_per_size:
+                free.append(buffer)
+                self.returns += 1
+            else:
+                self.discards += 1
+
+    def _zero_block(self, size: int) -> bytes:
+        zeros = self._zeros.get(size)
+        if zeros is None:
+            zeros = self._zeros.setdefault(size, bytes(size))
+        return zeros
+
+    def stats(self) -> dict:
+        """Hit/miss counters plus the number of idle buffers per size class."""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "returns": self.returns,
+                "discards": self.discards,
+                "idle": {size: len(free) for size, free in self._free.items()},
+            }
+
+    def clear(self) -> None:
+        """Drop every idle buffer and reset the statistics."""
+        with self._lock:
+            for free in self._free.values():
+                free.clear()
+            self.hits = self.misses = self.returns = self.discards = 0
+
+
+# Process-wide pool used by the conversion core
+BUFFER_POOL = BufferPool()
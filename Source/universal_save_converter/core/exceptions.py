@@ -0,0 +1,21 @@
+# core/exceptions.py
+
+
+class ConversionError(Exception):
+    """Base class for every save conversion failure."""
+
+
+class InvalidInputError(ConversionError):
+    """The input path is missing, unreadable as a save, or not selected."""
+
+
+class SaveReadError(ConversionError):
+    """The input save could not be read."""
+
+
+class SaveWriteError(ConversionError):
+    """The converted save could not be written."""
+
+
+class ConversionCancelled(Exception):
+    """The conversion job was cancelled between stages; nothing was written."""
@@ -1,7 +1,9 @@
 # core/file_utils.py
+import mmap
 import os
+from contextlib import contextmanager
 from datetime import datetime
-from tkinter import messagebox
+from core.exceptions import SaveReadError, SaveWriteError
 from systems.n64.n64_constants import (
     EEP_EXT, SRA_EXT, FLA_EXT, MPK_EXT, SRM_EXT,
     SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM,
@@ -10,6 +12,9 @@ from systems.n64.n64_constants import (
     FILE_TYPES, SOURCE_LIST, TARGET_LIST
 )
 
+# Inputs at least this large are converted through memory-mapped files
+MMAP_THRESHOLD: int = 1 << 20
+
 def detect_file_type(filename: str) -> str | None:
     """Detect the type of N64 save file based on extension."""
     ext = os.path.splitext(filename)[1].lower()
@@ -22,51 +27,155 @@ def detect_file_type(filename: str) -> str | None:
     }.get(ext, None)
 
 
-def read_bytes(path: str) -> bytes | None:
-    """Read binary data from a file, return None if error occurs."""
+def read_bytes(path: str) -> bytes:
+    """Read binary data from a file, raise SaveReadError if an error occurs."""
     try:
         with open(path, "rb") as f:
             return f.read()
-    except Exception:
-        messagebox.showerror("Error", f"Could not read file: {path}")
-        return None
+    except OSError as e:
+        raise SaveReadError(f"Could not read file: {path}") from e
+
+
+def read_bytes_into(path: str, pool) -> bytearray:
+    """
+    Read a whole file into a buffer borrowed from pool (see core.buffer_pool).
+    The caller gives it back with pool.release(). Raises SaveReadError.
+    """
+    try:
+        with open(path, "rb") as f:
+            buffer = pool.acquire(os.fstat(f.fileno()).st_size)
+            count = f.readinto(buffer)
+    except OSError as e:
+        raise SaveReadError(f"Could not read file: {path}") from e
+    if count < len(buffer):
+        # File shrank after stat; the short buffer simply won't be pooled again
+        del buffer[count:]
+    return buffer
 
 
 def write_bytes(data: bytes, path: str) -> bool:
-    """Write binary data to a file, return True on success, False on failure."""
+    """Write binary data to a file, raise SaveWriteError if an error occurs."""
     try:
         with open(path, "wb") as f:
             f.write(data)
         return True
-    except Exception:
-        messagebox.showerror("Error", f"Could not write file: {path}")
-        return False
+    except OSError as e:
+        raise SaveWriteError(f"Could not write file: {path}") from e
+
+
+@contextmanager
+def map_input(path: str):
+    """
+    Yield a read-only memoryview of the file, backed by mmap (no copy).
+    Views taken from it must not outlive the with block.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError as e:
+        raise SaveReadError(f"Could not read file: {path}") from e
+
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SaveReadError(f"Could not map file: {path}") from e
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            mapped.close()
+
+
+@contextmanager
+def map_output(path: str, size: int):
+    """
+    Create (or truncate) path, preallocate it to size zero bytes and yield a
+    writable mmap-backed memoryview over it. Flushed when the block exits.
+    """
+    try:
+        f = open(path, "w+b")
+        f.truncate(size)
+    except OSError as e:
+        raise SaveWriteError(f"Could not write file: {path}") from e
+
+    with f:
+        if size == 0:
+            yield memoryview(bytearray())
+            return
+        try:
+            mapped = mmap.mmap(f.fileno(), size)
+        except (OSError, ValueError) as e:
+            raise SaveWriteError(f"Could not map file: {path}") from e
+        view = memoryview(mapped)
+        try:
+            yield view
+            mapped.flush()
+        finally:
+            view.release()
+            mapped.close()
+
+
+def place_bytes(data, out, offset: int = 0, zero_fill: bool = True) -> int:
+    """
+    Copy data into the writable buffer out at offset in a single slice
+    assignment. With zero_fill, everything outside the copied window is
+    cleared (skip it when out is freshly allocated).
+
+    Positive offset: data lands at out[offset:].
+    Negative offset: the first abs(offset) bytes of data are skipped.
+    Returns the number of bytes copied.
+    """
+    src = memoryview(data).cast("B")
+    dst = memoryview(out).cast("B")
+    src_start = max(-offset, 0)
+    dst_start = max(offset, 0)
+    length = max(0, min(len(src) - src_start, len(dst) - dst_start))
+    dst_end = dst_start + length
+
+    if length:
+        dst[dst_start:dst_end] = src[src_start:src_start + length]
+    if zero_fill:
+        if not length:
+            dst_start = dst_end = len(dst)
+        if dst_start:
+            dst[:dst_start] = bytes(dst_start)
+        if dst_end < len(dst):
+            dst[dst_end:] = bytes(len(dst) - dst_end)
+    return length
 
 
-def resize_bytes(data: bytes, new_size: int, offset: int = 0) -> bytes:
+def resize_bytes(data: bytes, new_size: int, offset: int = 0, out=None) -> bytes:
     """
     Resize data to new_size bytes.
 
     Positive offset: copy data starting at offset in new array.
     Negative offset: trim data from the start.
+    Accepts any bytes-like object (memoryviews are never copied). When out is
+    given it must hold new_size bytes; it is filled in place and returned.
     """
-    if offset < 0:
-        data = data[abs(offset):]
-        offset = 0
+    if out is None:
+        result = bytearray(new_size)
+        place_bytes(data, result, offset, zero_fill=False)
+        return bytes(result)
 
-    result = bytearray(new_size)
-    for i in range(len(data)):
-        dest_index = i + offset
-        if 0 <= dest_index < new_size:
-            result[dest_index] = data[i]
-    return bytes(result)
+    if len(out) != new_size:
+        raise ValueError(f"Output buffer holds {len(out)} bytes, expected {new_size}")
+    place_bytes(data, out, offset)
+    return out
 
 
-def new_filename(filename: str, extension: str, prefix: str = "Converted_") -> str:
+def new_filename(filename: str, extension: str, prefix: str = "Converted_", timestamp: bool = True) -> str:
     """
     Generate a new filename with a timestamp and optional prefix.
     Example: MySave.sra → Converted_20251014-153245_MySave.sra
+    With timestamp=False the name is deterministic: Converted_MySave.sra
     """
     base, _ = os.path.splitext(filename)
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    return f"{prefix}{timestamp}_{base}{extension}"
+    if not timestamp:
+        return f"{prefix}{base}{extension}"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{prefix}{stamp}_{base}{extension}"
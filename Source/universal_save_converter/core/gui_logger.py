@@ -1,12 +1,16 @@
 # core/gui_logger.py
 from datetime import datetime
-from core.log_utils import gui_log, PASTEL_GUI_COLORS
+from core.log_utils import gui_log, register_log_view, start_gui_log_drain, PASTEL_GUI_COLORS
+from core.log_view import LogView, GUI_LOG_MAX_LINES
 
 # Global reference to the active Text widget
 log_widget = None
 
-def set_log_widget(widget):
-    """Assign the GUI log Text widget for logging."""
+def set_log_widget(widget, max_lines=GUI_LOG_MAX_LINES):
+    """
+    Assign the GUI log Text widget for logging. The widget keeps at most
+    max_lines lines (0 = unbounded); returns its LogView.
+    """
     global log_widget
     log_widget = widget
 
@@ -14,15 +18,18 @@ def set_log_widget(widget):
     for tag, color in PASTEL_GUI_COLORS.items():
         log_widget.tag_config(tag, foreground=color, background="#111")
 
+    # Records logged from worker threads are inserted by this widget's drain loop
+    view = LogView(log_widget, max_lines=max_lines)
+    register_log_view(log_widget, view)
+    start_gui_log_drain(log_widget)
+    return view
+
 def _log(msg, level="level_info"):
     """Internal helper to log with timestamp to the global log widget."""
     if not log_widget:
         return
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    # Insert timestamp with its tag
-    log_widget.insert("end", f"[{timestamp}] ", "timestamp")
-    # Insert message
-    gui_log(log_widget, msg, level=level)
+    gui_log(log_widget, msg, level=level, timestamp=timestamp)
 
 # Convenience functions
 def info(msg):       _log(msg, level="level_info")
@@ -0,0 +1,94 @@
+# core/history.py
+#
+# Structured conversion history: one JSON object per conversion, one per
+# line (JSONL). Records are appended by the background log writer and the
+# file is size-rotated with gzip-compressed older segments.
+
+import json
+import os
+from datetime import datetime
+from core.log_rotation import Rotation, open_segment, segment_paths
+from core.logger import flush_logs, write_line
+
+HISTORY_FILE = "conversion_history.jsonl"
+HISTORY_ROTATION = Rotation(max_bytes=2 * 1024 * 1024, backups=5, compress=True)
+
+# Values for a record's "result" field
+RESULT_OK = "ok"
+RESULT_FAILED = "failed"
+RESULT_CANCELLED = "cancelled"
+
+
+def conversion_record(input_path, output_path=None, plan=None, *, input_size=None, output_size=None,
+                      swap_size=None, timings=None, result=RESULT_OK, error=None, origin="gui") -> dict:
+    """
+    Build one history record. plan is a ConversionPlan (or None when the
+    conversion failed before one was chosen); timings maps stage names to
+    seconds and is stored in milliseconds.
+    """
+    record = {
+        "time": datetime.now().isoformat(timespec="milliseconds"),
+        "origin": origin,
+        "result": result,
+        "input_path": os.path.abspath(input_path) if input_path else None,
+        "output_path": os.path.abspath(output_path) if output_path else None,
+        "input_size": input_size,
+        "output_size": output_size,
+        "swap_size": swap_size,
+        "plan": None,
+        "timings_ms": {stage: round(seconds * 1000, 3) for stage, seconds in (timings or {}).items()},
+    }
+    if plan is not None:
+        record["plan"] = {
+            "key": plan.key,
+            "matched": plan.matched,
+            "native": plan.native,
+            "offset": plan.offset,
+            "target_size": plan.tgt_size,
+            "swap_size": plan.swap_size,
+        }
+    if error is not None:
+        record["error"] = str(error)
+    return record
+
+
+def record_conversion(input_path, output_path=None, plan=None, **fields) -> dict:
+    """Append a conversion record to HISTORY_FILE (asynchronously) and return it."""
+    record = conversion_record(input_path, output_path, plan, **fields)
+    write_line(HISTORY_FILE, json.dumps(record, ensure_ascii=False) + "\n", HISTORY_ROTATION)
+    return record
+
+
+def read_history(path=None, include_rotated=True, result=None, plan_key=None, since=None):
+    """
+    Stream history records oldest first, across rotated (and gzipped)
+    segments, one line at a time. Optional filters: result status, plan key
+    substring, and since (an ISO timestamp string or datetime).
+    Lines that are not valid JSON (e.g. a torn final write) are skipped.
+    """
+    path = path or HISTORY_FILE
+    if path == HISTORY_FILE:
+        flush_logs()
+    if isinstance(since, datetime):
+        since = since.isoformat(timespec="milliseconds")
+
+    for segment in segment_paths(path, include_rotated):
+        try:
+            f = open_segment(segment)
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if result and record.get("result") != result:
+                    continue
+                if plan_key and plan_key not in ((record.get("plan") or {}).get("key") or ""):
+                    continue
+                if since and record.get("time", "") < since:
+                    continue
+                yield record
@@ -0,0 +1,278 @@
+# core/jobs.py
+#
+# Shared job manager for GUI conversions. Jobs run on a bounded thread
+# pool and each gets an ID, a state and a CancelToken that is checked
+# between conversion stages. Workers never touch Tk: their state and
+# progress changes are queued and delivered to callbacks and listeners on
+# the Tk thread by poll(), which start_job_drain() schedules.
+
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+
+from core.exceptions import ConversionCancelled
+from core.logger import log
+from core.timing import StageTimer
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+# Conversions running at once; further jobs wait in the queue
+MAX_WORKERS = 2
+# Finished jobs kept for the jobs panel
+MAX_FINISHED_JOBS = 50
+JOB_DRAIN_INTERVAL_MS = 50
+
+# Once one of these stages has finished the output exists, so cancelling
+# no longer has any effect
+COMMIT_STAGES = ("write", "stream")
+
+
+class CancelToken:
+    """Cooperative cancellation flag, set from any thread."""
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """Raise ConversionCancelled if cancellation was requested."""
+        if self._event.is_set():
+            raise ConversionCancelled("Cancelled by user")
+
+
+class Job:
+    """
+    One queued unit of work. The worker function receives it as job= and
+    reports through report() or a StageTimer from stage_timer(), which
+    updates progress and checks the cancel token after every stage.
+    """
+
+    def __init__(self, job_id, name, stages=(), manager=None):
+        self.id = job_id
+        self.name = name
+        self.stages = tuple(stages)
+        self.state = JOB_QUEUED
+        self.stage = None
+        self.progress = 0.0
+        self.nbytes = 0
+        self.result = None
+        self.error = None
+        self.token = CancelToken()
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+        self._manager = manager
+
+    @property
+    def done(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second over the job's run time so far."""
+        elapsed = self.elapsed
+        return self.nbytes / elapsed if elapsed > 0 else 0.0
+
+    def report(self, stage=None, fraction=None, nbytes=None) -> None:
+        """Record progress from the worker; listeners see it on the next poll()."""
+        if stage is not None:
+            self.stage = stage
+            if fraction is None and stage in self.stages:
+                fraction = (self.stages.index(stage) + 1) / len(self.stages)
+        if fraction is not None:
+            self.progress = max(self.progress, min(1.0, fraction))
+        if nbytes is not None:
+            self.nbytes = nbytes
+        if self._manager is not None:
+            self._manager._notify(self)
+
+    def stage_timer(self, trace: bool = False) -> StageTimer:
+        """A StageTimer that reports each finished stage and then checks for cancellation."""
+        return StageTimer(trace, on_lap=self._on_lap)
+
+    def _on_lap(self, stage, seconds):
+        self.report(stage)
+        if stage not in COMMIT_STAGES:
+            self.token.check()
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.name!r}, state={self.state!r}, progress={self.progress:.2f})"
+
+
+class JobManager:
+    """
+    Bounded pool for background jobs. submit() returns at once; callbacks
+    and listeners always run on the thread that calls poll() (the Tk thread).
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self.jobs = OrderedDict()
+        self._executor = None
+        self._ids = itertools.count(1)
+        self._events = deque()
+        self._callbacks = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="usc-job")
+        return self._executor
+
+    def submit(self, name, func, *args, stages=(), on_progress=None, on_done=None, **kwargs) -> Job:
+        """
+        Queue func(*args, job=job, **kwargs). on_progress(job) and on_done(job)
+        are called on the polling thread; on_done once the job has finished,
+        failed or been cancelled.
+        """
+        with self._lock:
+            job = Job(next(self._ids), name, stages, self)
+            self.jobs[job.id] = job
+            self._callbacks[job.id] = (on_progress, on_done)
+            self._prune()
+        job.future = self._get_executor().submit(self._run, job, func, args, kwargs)
+        self._notify(job)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job.token.cancelled:
+            self._finish(job, JOB_CANCELLED)
+            return None
+        job.started = time.time()
+        job.state = JOB_RUNNING
+        self._notify(job)
+        try:
+            job.result = func(*args, job=job, **kwargs)
+        except ConversionCancelled as e:
+            job.error = e
+            self._finish(job, JOB_CANCELLED)
+        except Exception as e:
+            job.error = e
+            self._finish(job, JOB_FAILED)
+        else:
+            # Workers that handle their own errors flag them through job.error
+            if job.error is None:
+                job.progress = 1.0
+            self._finish(job, JOB_DONE if job.error is None else JOB_FAILED)
+        return job.result
+
+    def _finish(self, job, state):
+        job.finished = time.time()
+        job.state = state
+        self._notify(job)
+
+    def _notify(self, job):
+        self._events.append(job)
+
+    def _prune(self):
+        # Caller holds the lock: forget the oldest finished jobs
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+            self._callbacks.pop(job_id, None)
+
+    def cancel(self, job_id) -> bool:
+        """Request cancellation; queued jobs never start, running ones stop at the next stage."""
+        job = self.jobs.get(job_id)
+        if job is None or job.done:
+            return False
+        job.token.cancel()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, JOB_CANCELLED)
+        return True
+
+    def cancel_all(self) -> int:
+        return sum(self.cancel(job_id) for job_id in list(self.jobs))
+
+    def active(self) -> list:
+        """Queued and running jobs, oldest first."""
+        return [job for job in list(self.jobs.values()) if not job.done]
+
+    def add_listener(self, func) -> None:
+        """func(job) is called on the polling thread whenever a job changes."""
+        self._listeners.append(func)
+
+    def remove_listener(self, func) -> None:
+        if func in self._listeners:
+            self._listeners.remove(func)
+
+    def poll(self) -> int:
+        """
+        Deliver queued job changes: each changed job once per call, with
+        on_done for the ones that finished. Returns the number of jobs seen.
+        """
+        changed = {}
+        while self._events:
+            job = self._events.popleft()
+            changed[job.id] = job
+        for job in changed.values():
+            on_progress, on_done = self._callbacks.get(job.id, (None, None))
+            if on_progress is not None:
+                self._call(on_progress, job)
+            if job.done and on_done is not None:
+                self._callbacks.pop(job.id, None)
+                self._call(on_done, job)
+            for listener in list(self._listeners):
+                self._call(listener, job)
+        return len(changed)
+
+    @staticmethod
+    def _call(func, job):
+        # A failing callback must not cost the other jobs their updates
+        try:
+            func(job)
+        except Exception as e:
+            log(f"Job callback {getattr(func, '__name__', func)!r} failed for {job!r}: {e}", level="ERROR")
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel outstanding jobs and stop the pool."""
+        self.cancel_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Shared by every console window
+JOBS = JobManager()
+
+_drain_widgets = set()
+
+
+def start_job_drain(widget, manager=JOBS, interval_ms=JOB_DRAIN_INTERVAL_MS):
+    """Polls manager every interval_ms on the Tk thread for as long as widget exists."""
+    if widget in _drain_widgets:
+        return
+    _drain_widgets.add(widget)
+
+    def tick():
+        if not widget.winfo_exists():
+            _drain_widgets.discard(widget)
+            return
+        try:
+            manager.poll()
+        finally:
+            widget.after(interval_ms, tick)
+
+    widget.after(interval_ms, tick)
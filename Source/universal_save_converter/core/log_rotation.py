@@ -0,0 +1,75 @@
+# core/log_rotation.py
+#
+# Size-based rotation shared by the text log and the JSONL history:
+# path -> path.1 -> path.2 ... up to `backups` segments, optionally gzipped
+# (path.1.gz). Rotation runs on the background log writer thread.
+
+import gzip
+import os
+import re
+import shutil
+from typing import NamedTuple
+
+
+class Rotation(NamedTuple):
+    """Rotate once a file reaches max_bytes, keeping `backups` older segments."""
+    max_bytes: int
+    backups: int = 3
+    compress: bool = False
+
+
+def _segment_numbers(path):
+    """{n: segment path} for every rotated segment of path on disk."""
+    directory = os.path.dirname(path) or "."
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.(\d+)(\.gz)?$")
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return {}
+    found = {}
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            found[int(match.group(1))] = os.path.join(directory, name)
+    return found
+
+
+def segment_paths(path, include_rotated=True):
+    """Existing segments of path, oldest first; the live file comes last."""
+    segments = []
+    if include_rotated:
+        numbered = _segment_numbers(path)
+        segments = [numbered[n] for n in sorted(numbered, reverse=True)]
+    if os.path.exists(path):
+        segments.append(path)
+    return segments
+
+
+def open_segment(path, mode="rt"):
+    """Open a segment for reading, decompressing .gz segments transparently."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, encoding="utf-8") if "t" in mode else gzip.open(path, mode)
+    return open(path, mode, encoding="utf-8") if "t" in mode else open(path, mode)
+
+
+def rotate(path, backups=3, compress=False):
+    """
+    Shift path to path.1 (path.1.gz when compress), path.1 to path.2 and so
+    on, deleting segments past `backups`. The caller must have closed path.
+    """
+    numbered = _segment_numbers(path)
+    for n in sorted(numbered, reverse=True):
+        segment = numbered[n]
+        if n >= backups:
+            os.remove(segment)
+        else:
+            os.replace(segment, f"{path}.{n + 1}" + (".gz" if segment.endswith(".gz") else ""))
+
+    if backups <= 0:
+        os.remove(path)
+    elif compress:
+        with open(path, "rb") as src, gzip.open(f"{path}.1.gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(path)
+    else:
+        os.replace(path, f"{path}.1")
@@ -1,6 +1,17 @@
 # core/log_utils.py
+import threading
+from collections import deque
 from datetime import datetime
 
+# GUI records are queued from any thread and inserted on the Tk main thread
+GUI_DRAIN_INTERVAL_MS = 30
+GUI_DRAIN_MAX_RECORDS = 500
+
+_gui_queue = deque()
+_drain_widgets = set()
+_log_views = {}
+_idle_drain_pending = False
+
 # Terminal Colours
 class TermColors:
     RESET = "\033[0m"
@@ -23,14 +34,67 @@ PASTEL_GUI_COLORS = {
     "level_conversion": "#7FFFD4"  # cyan/aqua
 }
 
-def gui_log(log_box, message, level="level_info"):
+def gui_log(log_box, message, level="level_info", timestamp=None):
     """
-    Inserts a message into the GUI log box with a specified tag.
-    Assumes the Text widget already has tags configured from PASTEL_GUI_COLORS.
+    Queues a message for the GUI log box with a specified tag (and an optional
+    timestamp prefix). Safe to call from any thread; the Tk main thread inserts
+    queued records in batches. Assumes the Text widget already has tags
+    configured from PASTEL_GUI_COLORS.
     """
+    global _idle_drain_pending
     if not log_box:
         return
 
-    log_box.insert("end", message + "\n", level)
-    log_box.see("end")
-    log_box.update_idletasks()
+    _gui_queue.append((log_box, timestamp, message, level))
+    # Widgets without a drain loop get a one-off drain, but only Tk's own thread may schedule it
+    if (log_box not in _drain_widgets and not _idle_drain_pending
+            and threading.current_thread() is threading.main_thread()):
+        _idle_drain_pending = True
+        log_box.after_idle(drain_gui_log)
+
+def drain_gui_log():
+    """
+    Inserts queued records, one insert and one scroll per widget.
+    Must run on the Tk main thread.
+    """
+    from tkinter import TclError
+    global _idle_drain_pending
+    _idle_drain_pending = False
+
+    batches = {}
+    for _ in range(min(len(_gui_queue), GUI_DRAIN_MAX_RECORDS)):
+        log_box, timestamp, message, level = _gui_queue.popleft()
+        chunks = batches.setdefault(log_box, [])
+        if timestamp:
+            chunks += (f"[{timestamp}] ", "timestamp")
+        chunks += (message + "\n", level)
+
+    for log_box, chunks in batches.items():
+        try:
+            log_box.insert("end", *chunks)
+            view = _log_views.get(log_box)
+            if view:
+                view.trim()
+            log_box.see("end")
+        except TclError:
+            pass  # widget destroyed while records were queued
+
+def register_log_view(widget, view):
+    """Have the drain trim widget through view (a core.log_view.LogView) after each batch."""
+    _log_views[widget] = view
+
+def start_gui_log_drain(widget, interval_ms=GUI_DRAIN_INTERVAL_MS):
+    """Drains queued GUI records every interval_ms for as long as widget exists."""
+    if widget in _drain_widgets:
+        return
+    _drain_widgets.add(widget)
+
+    def tick():
+        if not widget.winfo_exists():
+            _drain_widgets.discard(widget)
+            _log_views.pop(widget, None)
+            return
+        drain_gui_log()
+        widget.after(interval_ms, tick)
+
+    widget.after(interval_ms, tick)
@@ -0,0 +1,152 @@
+# core/log_view.py
+
+import os
+import re
+from core.log_rotation import segment_paths
+
+# Lines the GUI log keeps before trimming, and how far below the limit a trim cuts
+GUI_LOG_MAX_LINES = 2000
+GUI_LOG_TRIM_LINES = 250
+# Lines paged in from the log file per "load older" request
+GUI_LOG_PAGE_LINES = 200
+
+READ_BLOCK_SIZE = 64 * 1024
+
+# "[2024-01-01 12:00:00] [LEVEL] message" as written by core.logger
+_FILE_LINE = re.compile(r"^\[(?P<timestamp>[^\]]+)\] \[(?P<level>[A-Z]+)\] (?P<message>.*)$")
+
+
+def read_lines_reverse(path, end=None, block_size=READ_BLOCK_SIZE):
+    """
+    Yield (offset, line) for the lines of a text file from last to first,
+    reading block_size bytes at a time from the end. offset is where the
+    line starts, so passing it back as end resumes just before that line.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return
+    with f:
+        if end is None:
+            end = f.seek(0, os.SEEK_END)
+        pos, buf = end, b""
+        stop = 0
+        while True:
+            # buf holds bytes [pos, pos + len(buf)); lines before stop are still unread
+            nl = buf.rfind(b"\n", 0, stop - 1) if stop else -1
+            if nl >= 0:
+                yield pos + nl + 1, buf[nl + 1:stop].rstrip(b"\r\n").decode("utf-8", "replace")
+                stop = nl + 1
+                continue
+            if pos == 0:
+                if stop:
+                    yield 0, buf[:stop].rstrip(b"\r\n").decode("utf-8", "replace")
+                return
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf[:stop]
+            stop = len(buf)
+
+
+class LogView:
+    """
+    Keeps a Text log widget bounded to max_lines by trimming the oldest lines
+    in batches (max_lines 0 never trims), and pages earlier records back in
+    from the log file on request.
+    """
+
+    def __init__(self, widget, max_lines=GUI_LOG_MAX_LINES, trim_lines=GUI_LOG_TRIM_LINES,
+                 page_lines=GUI_LOG_PAGE_LINES):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.trim_lines = min(trim_lines, max_lines)
+        self.page_lines = page_lines
+        self.loaded_lines = 0
+        # (segments newest first, index, end offset) once anchored; end None = whole segment
+        self._position = None
+        self._file_path = None
+
+    def line_count(self) -> int:
+        return int(self.widget.index("end-1c").split(".")[0])
+
+    def trim(self) -> int:
+        """Delete the oldest lines once the widget passes its limit; returns lines removed."""
+        if not self.max_lines:
+            return 0
+        limit = self.max_lines + self.loaded_lines
+        lines = self.line_count()
+        if lines <= limit:
+            return 0
+        remove = lines - limit + self.trim_lines
+        self.widget.delete("1.0", f"{remove + 1}.0")
+        # The oldest visible line changed; the next page re-anchors on it
+        self.loaded_lines = 0
+        self._position = None
+        return remove
+
+    def _anchor(self, path):
+        """File offset just before the oldest record the widget still shows."""
+        oldest = self.widget.get("1.0", "1.end")
+        if not oldest.strip():
+            return None
+        timestamp = oldest[1:oldest.find("]")] if oldest.startswith("[") else None
+
+        for offset, line in read_lines_reverse(path):
+            match = _FILE_LINE.match(line)
+            if not match:
+                continue
+            if f"[{match['timestamp']}] {match['message']}" == oldest:
+                return offset
+            # Records the file never saw (GUI-only lines): stop at the first older one
+            if timestamp and match["timestamp"] < timestamp:
+                return offset + len(line.encode("utf-8")) + 1
+        return 0
+
+    def load_older(self, count=None) -> int:
+        """
+        Prepend up to count earlier records from the log file, above the oldest
+        line shown, continuing into rotated (uncompressed) segments. Returns the
+        number of lines added (0 once the history is exhausted).
+        """
+        from core import logger  # core.logger imports this module through core.gui_logger
+
+        count = count or self.page_lines
+        path = logger.LOG_FILE
+        logger.flush_logs()
+
+        if self._position is None or self._file_path != path:
+            self._file_path = path
+            segments = [segment for segment in reversed(segment_paths(path)) if not segment.endswith(".gz")]
+            self._position = [segments, 0, self._anchor(path)]
+
+        segments, index, end = self._position
+        lines = []
+        while len(lines) < count and index < len(segments):
+            if end != 0:
+                for offset, line in read_lines_reverse(segments[index], end=end):
+                    end = offset
+                    if line:
+                        lines.append(line)
+                        if len(lines) >= count:
+                            break
+                else:
+                    end = 0
+            if end == 0:
+                index, end = index + 1, None
+        self._position = [segments, index, end]
+        if not lines:
+            return 0
+
+        chunks = []
+        for line in reversed(lines):
+            match = _FILE_LINE.match(line)
+            if match:
+                level = logger.GUI_LEVELS.get(match["level"], "level_info")
+                chunks += (f"[{match['timestamp']}] ", "timestamp", match["message"] + "\n", level)
+            else:
+                chunks += (line + "\n", "level_info")
+        self.widget.insert("1.0", *chunks)
+        self.widget.yview_moveto(0)
+        self.loaded_lines += len(lines)
+        return len(lines)
@@ -1,11 +1,51 @@
 # core/logger.py
 
+import atexit
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
 from core.log_utils import TermColors, gui_log
-from core.gui_logger import log_widget as global_log_widget, PASTEL_GUI_COLORS
+from core.log_rotation import Rotation, rotate
+from core import gui_logger
 
 LOG_FILE = "conversion_log.txt"
+# Size cap for LOG_FILE; older text is kept in conversion_log.txt.1 ... .N
+LOG_ROTATION = Rotation(max_bytes=5 * 1024 * 1024, backups=3)
+# Files the writer may keep open at once (log file, history file, ...)
+MAX_OPEN_FILES = 8
+
+# Background writer batching: flush after this many records or this many seconds
+FLUSH_MAX_RECORDS = 256
+FLUSH_INTERVAL = 0.25
+
+# Terminal stream for log lines (None = sys.stdout); set to sys.stderr when
+# stdout carries data, e.g. `usc convert - -`
+console_stream = None
+
+TERM_COLORS = {
+    "INFO": TermColors.WHITE,
+    "WARN": TermColors.YELLOW,
+    "ERROR": TermColors.RED,
+    "SUCCESS": TermColors.GREEN,
+    "CONVERSION": TermColors.CYAN
+}
+
+GUI_LEVELS = {
+    "INFO": "level_info",
+    "WARN": "level_warn",
+    "ERROR": "level_error",
+    "SUCCESS": "level_success",
+    "CONVERSION": "level_conversion"
+}
+
+def set_console_stream(stream):
+    """Redirect terminal log output to another text stream."""
+    global console_stream
+    flush_logs()
+    console_stream = stream
 
 def setup_logging():
     """Ensure the log file exists."""
@@ -13,46 +53,171 @@ def setup_logging():
         with open(LOG_FILE, "w", encoding="utf-8") as f:
             f.write("=== Conversion Log Initialized ===\n")
 
+
+class _LogWriter(threading.Thread):
+    """
+    Drains queued log records on a background thread. Output files stay
+    open between batches; terminal and each file are written once per batch,
+    and files are rotated once they pass their size cap.
+    """
+
+    _STOP = object()
+
+    def __init__(self):
+        super().__init__(name="usc-log-writer", daemon=True)
+        self.queue = queue.SimpleQueue()
+        self.pid = os.getpid()
+        self._files = {}
+
+    def run(self):
+        batch, flush_events = [], []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is self._STOP
+            if isinstance(item, threading.Event):
+                flush_events.append(item)
+            elif item is not None and not stop:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + FLUSH_INTERVAL
+
+            if batch and (item is None or stop or flush_events or len(batch) >= FLUSH_MAX_RECORDS):
+                self._write(batch)
+                batch, deadline = [], None
+            for event in flush_events:
+                event.set()
+            flush_events.clear()
+            if stop:
+                self._close_all()
+                return
+
+    def _write(self, batch):
+        # batch items are (console_line or None, path, file_line, rotation or None)
+        try:
+            stream = console_stream or sys.stdout
+            console = "".join(item[0] for item in batch if item[0])
+            if stream is not None and console:
+                stream.write(console)
+                stream.flush()
+        except (OSError, ValueError):
+            pass
+
+        by_path = {}
+        for _, path, line, rotation in batch:
+            lines, _ = by_path.setdefault(path, ([], rotation))
+            lines.append(line)
+        for path, (lines, rotation) in by_path.items():
+            self._append(path, "".join(lines), rotation)
+
+    def _append(self, path, text, rotation):
+        try:
+            f = self._files.get(path)
+            if f is None:
+                if len(self._files) >= MAX_OPEN_FILES:
+                    self._close_all()
+                f = self._files[path] = open(path, "a", encoding="utf-8")
+            f.write(text)
+            f.flush()
+            if rotation and f.tell() >= rotation.max_bytes:
+                self._close(path)
+                rotate(path, rotation.backups, rotation.compress)
+        except OSError:
+            self._close(path)
+
+    def _close(self, path):
+        f = self._files.pop(path, None)
+        if f is not None:
+            try:
+                f.close()
+            except OSError:
+                pass
+
+    def _close_all(self):
+        for path in list(self._files):
+            self._close(path)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def _get_writer():
+    """The running writer for this process (restarted after a fork)."""
+    global _writer
+    writer = _writer
+    if writer is not None and writer.pid == os.getpid():
+        return writer
+    with _writer_lock:
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = _LogWriter()
+            _writer.start()
+            if "multiprocessing" in sys.modules:
+                _flush_at_worker_exit()
+        return _writer
+
+def write_line(path, line, rotation=None):
+    """
+    Queue one line (newline included) for appending to path on the writer
+    thread, rotating the file per rotation (a core.log_rotation.Rotation).
+    """
+    _get_writer().queue.put((None, path, line, rotation))
+
+def flush_logs(timeout=5.0):
+    """Block until every record logged so far has reached terminal and file."""
+    writer = _writer
+    if writer is None or writer.pid != os.getpid() or not writer.is_alive():
+        return
+    done = threading.Event()
+    writer.queue.put(done)
+    done.wait(timeout)
+
+def shutdown_logging(timeout=5.0):
+    """Flush outstanding records and stop the background writer."""
+    global _writer
+    writer = _writer
+    if writer is None or writer.pid != os.getpid() or not writer.is_alive():
+        return
+    writer.queue.put(_LogWriter._STOP)
+    writer.join(timeout)
+    _writer = None
+
+atexit.register(shutdown_logging)
+
+def _flush_at_worker_exit():
+    # Pool workers leave through os._exit, which skips atexit handlers
+    import multiprocessing
+    from multiprocessing import util
+    if multiprocessing.parent_process() is not None:
+        util.Finalize(None, shutdown_logging, exitpriority=0)
+
 def log(message, *, level="INFO", log_box=None):
     """
     Logs a message to:
     1. Terminal (with color)
     2. GUI Text widget (if provided or global)
     3. File
-    Supports custom levels for future expandability.
+    Terminal and file output are queued for the background writer and GUI
+    output for the Tk drain, so the caller only pays for formatting and it is
+    safe to call from worker threads. Supports custom levels for future expandability.
     """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    full_message = f"[{timestamp}] [{level}] {message}"
-
-    # --- Terminal logging ---
-    term_colors = {
-        "INFO": TermColors.WHITE,
-        "WARN": TermColors.YELLOW,
-        "ERROR": TermColors.RED,
-        "SUCCESS": TermColors.GREEN,
-        "CONVERSION": TermColors.CYAN
-    }
-    color = term_colors.get(level, TermColors.WHITE)
-    print(f"{TermColors.ORANGE}[{timestamp}]{TermColors.RESET} {color}{message}{TermColors.RESET}", flush=True)
+
+    # --- Terminal + file logging (batched in the background) ---
+    color = TERM_COLORS.get(level, TermColors.WHITE)
+    _get_writer().queue.put((
+        f"{TermColors.ORANGE}[{timestamp}]{TermColors.RESET} {color}{message}{TermColors.RESET}\n",
+        LOG_FILE,
+        f"[{timestamp}] [{level}] {message}\n",
+        LOG_ROTATION
+    ))
 
     # --- GUI logging ---
-    active_log_box = log_box or global_log_widget
+    # Read the widget at call time; set_log_widget rebinds it after import
+    active_log_box = log_box or gui_logger.log_widget
     if active_log_box:
-        # Insert timestamp separately (always orange)
-        active_log_box.insert("end", f"[{timestamp}] ", "timestamp")
-        # Insert message with level tag
-        level_map = {
-            "INFO": "level_info",
-            "WARN": "level_warn",
-            "ERROR": "level_error",
-            "SUCCESS": "level_success",
-            "CONVERSION": "level_conversion"
-        }
-        gui_level = level_map.get(level, "level_info")
-        active_log_box.insert("end", f"{message}\n", gui_level)
-        active_log_box.see("end")
-        active_log_box.update_idletasks()
-
-    # --- File logging ---
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(full_message + "\n")
\ No newline at end of file
+        gui_log(active_log_box, message, level=GUI_LEVELS.get(level, "level_info"), timestamp=timestamp)
@@ -0,0 +1,185 @@
+# core/profiling.py
+#
+# Opt-in profiling for conversion runs. Set USC_PROFILE (to an output
+# prefix, or 1 for "usc_profile") or pass --profile on the command line:
+#   <prefix>.pstats      cProfile data (python -m pstats, snakeviz, ...)
+#   <prefix>.collapsed   folded stacks for flamegraph.pl / speedscope
+#   <prefix>.memory.txt  top tracemalloc allocation sites (USC_PROFILE_MEMORY=N)
+# cProfile, pstats and tracemalloc are only imported once a session starts.
+
+import functools
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from core.logger import log
+
+PROFILE_ENV = "USC_PROFILE"
+PROFILE_MEMORY_ENV = "USC_PROFILE_MEMORY"
+DEFAULT_PREFIX = "usc_profile"
+DEFAULT_MEMORY_TOP = 25
+
+# Collapsed-stack walk limits: deeper or cheaper (microseconds) branches are dropped
+MAX_STACK_DEPTH = 64
+MIN_STACK_US = 1.0
+
+# Held while a session runs. Conversions on other job threads skip
+# profiling rather than start a second, overlapping cProfile session.
+_session_lock = threading.Lock()
+
+
+def _func_label(func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in, e.g. <method 'readinto' of ...>
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats) -> dict:
+    """
+    Fold a pstats call graph into {"root;caller;callee": self microseconds}.
+    cProfile keeps only caller->callee edges, not full stacks, so a function's
+    time is split across its callers in proportion to each edge's cumulative time.
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+
+    folded = defaultdict(float)
+
+    def walk(func, stack, on_stack, scale):
+        _, _, self_time, _, _ = entries[func]
+        stack.append(_func_label(func))
+        on_stack.add(func)
+        if self_time * scale * 1e6 >= MIN_STACK_US:
+            folded[";".join(stack)] += self_time * scale * 1e6
+        if len(stack) < MAX_STACK_DEPTH:
+            for callee, edge in callees.get(func, {}).items():
+                callee_total = entries[callee][3]
+                if callee in on_stack or callee_total <= 0:
+                    continue
+                share = scale * min(1.0, edge[3] / callee_total)
+                if callee_total * share * 1e6 >= MIN_STACK_US:
+                    walk(callee, stack, on_stack, share)
+        stack.pop()
+        on_stack.discard(func)
+
+    for func, entry in entries.items():
+        if not entry[4]:
+            walk(func, [], set(), 1.0)
+    return folded
+
+
+def write_collapsed(stats, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, micros in sorted(collapsed_stacks(stats).items()):
+            f.write(f"{stack} {round(micros)}\n")
+
+
+def write_memory_report(snapshot, path: str, top: int) -> list:
+    """Write the top allocation sites of a tracemalloc snapshot; returns them."""
+    sites = snapshot.statistics("lineno")[:top]
+    with open(path, "w", encoding="utf-8") as f:
+        for stat in sites:
+            frame = stat.traceback[0]
+            f.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+    return sites
+
+
+def _write_reports(stats, snapshot, prefix: str, memory_top: int) -> None:
+    """Write a finished session's .pstats, .collapsed and (with a snapshot) .memory.txt."""
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    stats.dump_stats(f"{prefix}.pstats")
+    write_collapsed(stats, f"{prefix}.collapsed")
+    log(f"Profile written to {prefix}.pstats and {prefix}.collapsed", level="INFO")
+    if snapshot is not None:
+        sites = write_memory_report(snapshot, f"{prefix}.memory.txt", memory_top)
+        for stat in sites[:5]:
+            frame = stat.traceback[0]
+            log(f"Top allocation: {stat.size / 1024:.1f} KiB at {frame.filename}:{frame.lineno}", level="INFO")
+        log(f"Allocation report written to {prefix}.memory.txt", level="INFO")
+
+
+@contextmanager
+def profiled(prefix: str = DEFAULT_PREFIX, memory_top: int = 0):
+    """
+    Profile the enclosed block with cProfile (and tracemalloc when memory_top
+    > 0), then write <prefix>.pstats, <prefix>.collapsed and, with memory
+    tracking, <prefix>.memory.txt. Nested sessions, and sessions started
+    while another thread's is running, are no-ops. Reports that cannot be
+    written are logged; they never replace an exception from the block.
+    """
+    if not _session_lock.acquire(blocking=False):
+        yield None
+        return
+    try:
+        import cProfile
+        import pstats
+        import tracemalloc
+
+        profiler = cProfile.Profile()
+        tracing = memory_top > 0 and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+        finally:
+            snapshot = tracemalloc.take_snapshot() if tracing else None
+            if tracing:
+                tracemalloc.stop()
+            # A report that can't be written must not replace the profiled block's own exception
+            try:
+                _write_reports(pstats.Stats(profiler), snapshot, prefix, memory_top)
+            except OSError as e:
+                log(f"Could not write profile {prefix}: {e}", level="ERROR")
+    finally:
+        _session_lock.release()
+
+
+def profile_settings():
+    """(prefix, memory_top) from the environment, or (None, 0) when profiling is off."""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value == "0":
+        return None, 0
+    prefix = DEFAULT_PREFIX if value == "1" else value
+    memory = os.environ.get(PROFILE_MEMORY_ENV, "").strip()
+    try:
+        memory_top = int(memory) if memory else 0
+    except ValueError:
+        memory_top = DEFAULT_MEMORY_TOP
+    return prefix, memory_top
+
+
+def maybe_profiled(name: str, prefix: str = None, memory_top: int = None):
+    """
+    A profiled() session when a prefix is given or USC_PROFILE is set,
+    otherwise a no-op context. Output files are suffixed with name, a
+    timestamp and the pid so repeated runs don't overwrite each other.
+    """
+    env_prefix, env_memory = profile_settings()
+    prefix = prefix or env_prefix
+    if not prefix:
+        return nullcontext()
+    memory_top = env_memory if memory_top is None else memory_top
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    return profiled(f"{prefix}-{name}-{stamp}-{os.getpid()}", memory_top)
+
+
+def profile_when_enabled(name: str):
+    """Decorator: run the function under maybe_profiled(name) on every call."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with maybe_profiled(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
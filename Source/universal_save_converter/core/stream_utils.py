@@ -0,0 +1,168 @@
+# core/stream_utils.py
+
+from itertools import chain
+
+from core.exceptions import SaveReadError
+from core.swap_utils import byteswap_inplace
+
+# Default chunk size for streaming conversions (a multiple of every swap width)
+STREAM_CHUNK_SIZE: int = 1 << 16
+
+# Shared source of padding bytes; never written to
+ZERO_BLOCK = memoryview(bytes(STREAM_CHUNK_SIZE))
+
+
+def zero_chunks(count: int):
+    """Yield count zero bytes as views of ZERO_BLOCK (no allocation)."""
+    while count > 0:
+        step = min(count, len(ZERO_BLOCK))
+        yield ZERO_BLOCK[:step]
+        count -= step
+
+
+def read_chunks(reader, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Yield views of successive chunks read from a binary file object.
+    The same buffer is reused, so each view is only valid until the next one.
+    """
+    readinto = getattr(reader, "readinto", None)
+    if readinto is None:
+        while True:
+            chunk = reader.read(chunk_size)
+            if not chunk:
+                return
+            yield memoryview(chunk)
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        count = readinto(buffer)
+        if not count:
+            return
+        yield view[:count]
+
+
+class LazyFileWriter:
+    """
+    Binary file writer that opens (and truncates) path on the first write,
+    so a conversion that fails before producing output leaves the file alone.
+    """
+
+    def __init__(self, path: str):
+        self.name = path
+        self._file = None
+
+    @property
+    def opened(self) -> bool:
+        return self._file is not None
+
+    def write(self, data) -> int:
+        if self._file is None:
+            self._file = open(self.name, "wb")
+        return self._file.write(data)
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class _SwapWriter:
+    """Collects output into word-aligned blocks, swaps each block and writes it."""
+
+    def __init__(self, writer, swap_size: int, chunk_size: int):
+        self.writer = writer
+        self.swap_size = swap_size
+        self.written = 0
+        if swap_size > 1:
+            chunk_size = max(chunk_size - chunk_size % swap_size, swap_size)
+            self.stage = bytearray(chunk_size)
+            self.fill = 0
+
+    def write(self, view):
+        if self.swap_size <= 1:
+            self.writer.write(view)
+            self.written += len(view)
+            return
+
+        stage = self.stage
+        while view:
+            take = min(len(view), len(stage) - self.fill)
+            stage[self.fill:self.fill + take] = view[:take]
+            self.fill += take
+            view = view[take:]
+            if self.fill == len(stage):
+                byteswap_inplace(stage, self.swap_size)
+                self.writer.write(stage)
+                self.written += len(stage)
+                self.fill = 0
+
+    def close(self):
+        if self.swap_size > 1 and self.fill:
+            tail = memoryview(self.stage)[:self.fill]
+            # A partial trailing word is reversed on its own, as in byteswap()
+            byteswap_inplace(tail, self.swap_size)
+            self.writer.write(tail)
+            self.written += self.fill
+            self.fill = 0
+
+
+def stream_convert(reader, writer, tgt_size=None, offset: int = 0, swap_size: int = 1,
+                   chunk_size: int = STREAM_CHUNK_SIZE, drain: bool = False):
+    """
+    Resize and byte-swap a save from one binary file object to another in
+    fixed-size chunks, producing the same bytes as
+    byteswap(resize_bytes(data, tgt_size, offset), swap_size).
+
+    tgt_size None keeps the input size (offset must then be 0). With drain,
+    input past the target window is still read (and discarded) so an
+    upstream pipe writer never sees a broken pipe.
+    Memory use is constant in the input size. Returns (bytes_in, bytes_out).
+    Raises SaveReadError for an empty input before anything is written.
+    """
+    if tgt_size is None and offset:
+        raise ValueError("An offset needs a fixed target size")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    # Nothing, not even leading padding, is written until the input has data
+    chunks = read_chunks(reader, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        raise SaveReadError("Input stream is empty")
+
+    out = _SwapWriter(writer, swap_size, chunk_size)
+    bytes_in = 0
+
+    lead = max(offset, 0) if tgt_size is None else min(max(offset, 0), tgt_size)
+    for chunk in zero_chunks(lead):
+        out.write(chunk)
+
+    skip = max(-offset, 0)
+    remaining = None if tgt_size is None else tgt_size - lead
+    # The first chunk has been read already; only read on while it is needed
+    chunks = chain((first,), chunks) if remaining is None or remaining > 0 or drain else (first,)
+    for chunk in chunks:
+        bytes_in += len(chunk)
+        if remaining == 0:
+            continue
+        if skip:
+            dropped = min(skip, len(chunk))
+            skip -= dropped
+            chunk = chunk[dropped:]
+        if remaining is not None:
+            chunk = chunk[:remaining]
+            remaining -= len(chunk)
+        if chunk:
+            out.write(chunk)
+        if remaining == 0 and not drain:
+            break
+
+    for chunk in zero_chunks(remaining or 0):
+        out.write(chunk)
+
+    out.close()
+    return bytes_in, out.written
@@ -1,15 +1,72 @@
 # core/swap_utils.py
 
+from array import array
+
+# Largest block swapped in one go by byteswap_inplace (multiple of every word width)
+SWAP_BLOCK_SIZE: int = 1 << 20
+
+# Word width (bytes) -> array typecode with that itemsize on this platform
+_WORD_TYPECODES = {}
+for _typecode in "HILQ":
+    _WORD_TYPECODES.setdefault(array(_typecode).itemsize, _typecode)
+
+
+def _swap_words(view: memoryview, swap_size: int) -> None:
+    """Swap the whole words in a writable byte view, one block at a time."""
+    typecode = _WORD_TYPECODES.get(swap_size)
+    length = len(view)
+
+    if typecode is None:
+        # Odd widths: strided slice copy, one column per byte of the word
+        source = bytes(view)
+        for k in range(swap_size):
+            view[k:length:swap_size] = source[swap_size - 1 - k:length:swap_size]
+        return
+
+    block = SWAP_BLOCK_SIZE - SWAP_BLOCK_SIZE % swap_size
+    for start in range(0, length, block):
+        end = min(start + block, length)
+        words = array(typecode)
+        words.frombytes(view[start:end])
+        words.byteswap()
+        view[start:end] = memoryview(words).cast("B")
+
+
+def byteswap_inplace(buffer, swap_size: int):
+    """
+    Swap the byte order of a writable buffer (bytearray, memoryview, mmap)
+    in place, in words of swap_size bytes.
+
+    A trailing partial word is reversed on its own, matching byteswap().
+    Returns the buffer for convenience.
+    """
+    if swap_size <= 1:
+        return buffer
+
+    view = memoryview(buffer).cast("B")
+    whole = len(view) - len(view) % swap_size
+    if whole:
+        _swap_words(view[:whole], swap_size)
+    if whole < len(view):
+        view[whole:] = bytes(view[whole:])[::-1]
+    return buffer
+
+
 def byteswap(data: bytes, swap_size: int) -> bytes:
     """Swap the byte order of data in chunks of the given size."""
     if swap_size <= 1:
         return data
 
-    swapped = bytearray(len(data))
-    for i in range(0, len(data), swap_size):
-        chunk = data[i:i + swap_size]
-        swapped[i:i + len(chunk)] = chunk[::-1]
-    return bytes(swapped)
+    typecode = _WORD_TYPECODES.get(swap_size)
+    if typecode is not None and len(data) % swap_size == 0:
+        # Fast path: whole words only, one C-level pass
+        words = array(typecode)
+        words.frombytes(data)
+        words.byteswap()
+        return words.tobytes()
+
+    return bytes(byteswap_inplace(bytearray(data), swap_size))
+
 
 def determine_swap_size(swap_required_from_table: bool = False, user_choice: str = "Default") -> int:
     """
@@ -1,17 +1,42 @@
 # core/theme_utils.py
+#
+# Light/dark theming. The OS appearance comes from a ThemeProvider; a
+# ThemeWatcher caches it, polls with exponential backoff while nothing
+# changes and pauses while its window is hidden. Themed widgets are found
+# with one walk of the tree, then tracked from <Map>/<Destroy> events.
 
 import platform
 import subprocess
 import tkinter as tk
+from abc import ABC, abstractmethod
 
-current_mode = None  # module-level variable
+current_mode = None  # last appearance applied by a watcher
 
-def is_dark_mode():
-    """
-    Returns True if macOS is in Dark Mode.
-    On other systems, defaults to False.
-    """
-    if platform.system() == "Darwin":
+# Polling interval bounds in ms: back to the minimum after a change,
+# multiplied by POLL_BACKOFF after every unchanged read up to the maximum
+POLL_MIN_INTERVAL = 1000
+POLL_MAX_INTERVAL = 30000
+POLL_BACKOFF = 2
+
+
+class ThemeProvider(ABC):
+    """Source of the OS appearance. Subclasses implement read()."""
+    # False when the appearance can never change, so watchers don't poll
+    dynamic = True
+
+    @abstractmethod
+    def read(self) -> bool:
+        """True when the OS is in dark mode."""
+
+
+class MacDefaultsProvider(ThemeProvider):
+    """macOS: `defaults read -g AppleInterfaceStyle`, one process per read."""
+
+    def __init__(self):
+        self.spawns = 0
+
+    def read(self) -> bool:
+        self.spawns += 1
         try:
             result = subprocess.run(
                 ["defaults", "read", "-g", "AppleInterfaceStyle"],
@@ -20,7 +45,49 @@ def is_dark_mode():
             return result.stdout.strip().lower() == "dark"
         except Exception:
             return False
-    return False
+
+
+class StaticThemeProvider(ThemeProvider):
+    """
+    A fixed appearance, for platforms without detection. With dynamic=True
+    it stands in for a real provider: set .dark to simulate an OS change;
+    .reads counts how often it was polled.
+    """
+
+    def __init__(self, dark: bool = False, dynamic: bool = False):
+        self.dark = dark
+        self.dynamic = dynamic
+        self.reads = 0
+
+    def read(self) -> bool:
+        self.reads += 1
+        return self.dark
+
+
+_provider = None
+
+
+def default_provider() -> ThemeProvider:
+    """The platform's provider: `defaults` on macOS, light and static elsewhere."""
+    global _provider
+    if _provider is None:
+        _provider = MacDefaultsProvider() if platform.system() == "Darwin" else StaticThemeProvider()
+    return _provider
+
+
+def set_provider(provider: ThemeProvider) -> None:
+    """Replace the default provider (used by new watchers and is_dark_mode)."""
+    global _provider
+    _provider = provider
+
+
+def is_dark_mode():
+    """
+    Returns True if the OS is in Dark Mode (macOS only; False elsewhere).
+    Reads the provider every call; watchers keep the cached value.
+    """
+    return default_provider().read()
+
 
 def detect_widgets(root):
     """
@@ -47,25 +114,21 @@ def detect_widgets(root):
     # Optional: detect a label for log_label (first Label inside log_frame)
     log_frame = widgets.get("log_frame")
     if log_frame:
-        for child in log_frame.winfo_children():
-            if isinstance(child, tk.Label):
-                widgets["log_label"] = child
-                break
+        widgets["log_label"] = _first_label(log_frame)
 
     return widgets
 
-def apply_theme(root, widgets=None, dark=None):
-    """
-    Apply light/dark theme to the GUI.
-    If widgets is None, automatically detects them.
-    """
-    if widgets is None:
-        widgets = detect_widgets(root)
 
-    if dark is None:
-        dark = is_dark_mode()
+def _first_label(frame):
+    for child in frame.winfo_children():
+        if isinstance(child, tk.Label):
+            return child
+    return None
 
-    colors = {
+
+def theme_colors(dark):
+    """Color scheme for the light or dark theme."""
+    return {
         "bg": "#222" if dark else "#fff",           # root background → dark grey instead of black
         "fg": "#e0e0e0" if dark else "#000",       # text
         "label_bg": "#222" if dark else "#fff",    # labels → match root bg
@@ -79,48 +142,284 @@ def apply_theme(root, widgets=None, dark=None):
         "log_tag_timestamp": "#FFA500" if dark else "#FF8C00",
     }
 
+
+def _style_label(lbl, colors):
+    lbl.configure(bg=colors["label_bg"], fg=colors["label_fg"])
+
+
+def _style_log_frame(log_frame, colors):
+    # Force true black background, remove any border/highlight
+    log_frame.configure(
+        bg=colors["log_bg"],
+        highlightthickness=0,
+        bd=0
+    )
+
+
+def _style_log_box(log_box, colors):
+    log_box.configure(
+        bg=colors["log_bg"],
+        fg=colors["log_fg"],
+        insertbackground=colors["log_fg"],  # cursor color
+        highlightthickness=0,
+        bd=0
+    )
+    log_box.tag_config("timestamp", foreground=colors["log_tag_timestamp"])
+    log_box.tag_config("level_info", foreground=colors["log_tag_info"])
+    log_box.tag_config("level_conversion", foreground=colors["log_tag_conversion"])
+    log_box.tag_config("level_warn", foreground=colors["log_tag_warn"])
+    log_box.tag_config("level_error", foreground=colors["log_tag_error"])
+
+
+def _style_log_label(log_label, colors):
+    log_label.configure(bg=colors["log_bg"], fg=colors["log_fg"])
+
+
+def apply_theme(root, widgets=None, dark=None):
+    """
+    Apply light/dark theme to the GUI.
+    If widgets is None, automatically detects them.
+    """
+    if widgets is None:
+        widgets = detect_widgets(root)
+
+    if dark is None:
+        dark = is_dark_mode()
+
+    colors = theme_colors(dark)
+
     # Root background
     root.configure(bg=colors["bg"])
 
     # Labels
     for lbl in widgets.get("labels", []):
-        lbl.configure(bg=colors["label_bg"], fg=colors["label_fg"])
+        _style_label(lbl, colors)
 
     # Log frame & box
     if widgets.get("log_frame"):
-        log_frame = widgets["log_frame"]
-        # Force true black background, remove any border/highlight
-        log_frame.configure(
-            bg=colors["log_bg"],
-            highlightthickness=0,
-            bd=0
-        )
+        _style_log_frame(widgets["log_frame"], colors)
 
     if widgets.get("log_box"):
-        log_box = widgets["log_box"]
-        log_box.configure(
-            bg=colors["log_bg"],
-            fg=colors["log_fg"],
-            insertbackground=colors["log_fg"],  # cursor color
-            highlightthickness=0,
-            bd=0
-        )
-        log_box.tag_config("timestamp", foreground=colors["log_tag_timestamp"])
-        log_box.tag_config("level_info", foreground=colors["log_tag_info"])
-        log_box.tag_config("level_conversion", foreground=colors["log_tag_conversion"])
-        log_box.tag_config("level_warn", foreground=colors["log_tag_warn"])
-        log_box.tag_config("level_error", foreground=colors["log_tag_error"])
+        _style_log_box(widgets["log_box"], colors)
 
     if widgets.get("log_label"):
-        widgets["log_label"].configure(bg=colors["log_bg"], fg=colors["log_fg"])
-        
-def start_polling(root, widgets=None, interval=1000):
+        _style_log_label(widgets["log_label"], colors)
+
+
+class WidgetRegistry:
+    """
+    The themed widgets under root, in the shape detect_widgets() returns.
+    Built with one walk of the tree; track() and forget() keep it current.
+    Labels are keyed by Tk path name, so lookups are a dict hit.
+    """
+
+    def __init__(self, root, widgets=None):
+        self.root = root
+        if widgets is None:
+            widgets = detect_widgets(root)
+        self.labels = {str(lbl): lbl for lbl in widgets.get("labels", [])}
+        self.log_box = widgets.get("log_box")
+        self.log_frame = widgets.get("log_frame")
+        self.log_label = widgets.get("log_label")
+
+    def as_dict(self) -> dict:
+        return {
+            "labels": list(self.labels.values()),
+            "log_box": self.log_box,
+            "log_frame": self.log_frame,
+            "log_label": self.log_label,
+        }
+
+    def track(self, widget, colors=None) -> bool:
+        """
+        Add a widget that appeared after the registry was built; with colors,
+        style it right away. Returns True when the widget was new.
+        """
+        if isinstance(widget, tk.Label):
+            path = str(widget)
+            if path in self.labels:
+                return False
+            self.labels[path] = widget
+            if colors:
+                _style_label(widget, colors)
+            return True
+        if isinstance(widget, tk.Text) and widget is not self.log_box:
+            self.log_box = widget
+            self.log_frame = widget.master
+            self.log_label = _first_label(self.log_frame)
+            if colors:
+                _style_log_frame(self.log_frame, colors)
+                _style_log_box(widget, colors)
+                if self.log_label is not None:
+                    _style_log_label(self.log_label, colors)
+            return True
+        return False
+
+    def forget(self, path: str) -> None:
+        """Drop a destroyed widget, by Tk path name."""
+        self.labels.pop(path, None)
+        if self.log_box is not None and str(self.log_box) == path:
+            self.log_box = None
+        if self.log_frame is not None and str(self.log_frame) == path:
+            self.log_frame = None
+        if self.log_label is not None and str(self.log_label) == path:
+            self.log_label = None
+
+
+class ThemeWatcher:
+    """
+    Keeps the widgets under root in sync with the OS appearance.
+    The provider's value is cached; while it doesn't change the polling
+    interval backs off from min_interval to max_interval, and polling stops
+    while root is hidden (withdrawn, iconified or unpacked) until it maps
+    again. Static providers are read once and never polled.
+    """
+
+    def __init__(self, root, provider=None, widgets=None,
+                 min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL):
+        self.root = root
+        self.provider = provider or default_provider()
+        self.registry = WidgetRegistry(root, widgets)
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.interval = min_interval
+        self.dark = None
+        self.paused = False
+        self.stopped = False
+        self.polls = 0
+        self._path = str(root)
+        self._prefix = "." if self._path == "." else self._path + "."
+        self._top_path = None
+        self._after = None
+
+    def start(self):
+        """Read the appearance, theme the widgets and start polling."""
+        self._top_path = _watch_toplevel(self)
+        self.dark = self._read()
+        self.apply()
+        self._schedule(self.min_interval)
+        return self
+
+    def stop(self):
+        self.stopped = True
+        self._cancel()
+        _unwatch_toplevel(self)
+        _watchers.pop(self._path, None)
+
+    def apply(self):
+        """Re-theme every registered widget with the cached appearance."""
+        global current_mode
+        current_mode = self.dark
+        apply_theme(self.root, self.registry.as_dict(), self.dark)
+
+    def poll(self):
+        self._after = None
+        if self.stopped:
+            return
+        if not self._viewable():
+            self.paused = True
+            return
+
+        dark = self._read()
+        if dark != self.dark:
+            self.dark = dark
+            self.apply()
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * POLL_BACKOFF, self.max_interval)
+        self._schedule(self.interval)
+
+    def _read(self):
+        self.polls += 1
+        return self.provider.read()
+
+    def _viewable(self):
+        try:
+            return bool(self.root.winfo_viewable())
+        except tk.TclError:
+            return False
+
+    def _schedule(self, delay):
+        if self.provider.dynamic and not self.stopped and self._after is None:
+            self._after = self.root.after(delay, self.poll)
+
+    def _cancel(self):
+        if self._after is not None:
+            try:
+                self.root.after_cancel(self._after)
+            except tk.TclError:
+                pass
+            self._after = None
+
+    # Events from the toplevel's bindings (see _watch_toplevel)
+
+    def on_map(self, widget, path):
+        if path == self._path or path == self._top_path:
+            if self.paused:
+                # The appearance may have changed while hidden: check right away
+                self.paused = False
+                self.interval = self.min_interval
+                if self.provider.dynamic and self._after is None:
+                    self._after = self.root.after_idle(self.poll)
+        elif path.startswith(self._prefix) and not isinstance(widget, str):
+            self.registry.track(widget, theme_colors(self.dark))
+
+    def on_unmap(self, widget, path):
+        if path == self._path or path == self._top_path:
+            self.paused = True
+            self._cancel()
+
+    def on_destroy(self, widget, path):
+        if path == self._path or path == self._top_path:
+            self.stop()
+        elif path.startswith(self._prefix):
+            self.registry.forget(path)
+
+
+# Toplevel path -> watchers under it. Tk delivers a descendant's <Map>,
+# <Unmap> and <Destroy> to its toplevel's bindings, so each toplevel is
+# bound once and the events fanned out to its watchers.
+_toplevels = {}
+
+# Watched root path -> its ThemeWatcher
+_watchers = {}
+
+
+def _watch_toplevel(watcher):
+    top = watcher.root.winfo_toplevel()
+    top_path = str(top)
+    watchers = _toplevels.get(top_path)
+    if watchers is None:
+        watchers = _toplevels[top_path] = []
+        top.bind("<Map>", lambda event: _dispatch(top_path, "on_map", event), add="+")
+        top.bind("<Unmap>", lambda event: _dispatch(top_path, "on_unmap", event), add="+")
+        top.bind("<Destroy>", lambda event: _dispatch(top_path, "on_destroy", event), add="+")
+    watchers.append(watcher)
+    return top_path
+
+
+def _unwatch_toplevel(watcher):
+    watchers = _toplevels.get(watcher._top_path)
+    if watchers and watcher in watchers:
+        watchers.remove(watcher)
+
+
+def _dispatch(top_path, handler, event):
+    widget = event.widget
+    path = str(widget)
+    for watcher in list(_toplevels.get(top_path, ())):
+        getattr(watcher, handler)(widget, path)
+    if handler == "on_destroy" and path == top_path:
+        _toplevels.pop(top_path, None)
+
+
+def start_polling(root, widgets=None, interval=POLL_MIN_INTERVAL, provider=None):
     """
-    Polls for dark/light mode changes and reapplies theme.
+    Watch for dark/light mode changes and reapply the theme. Returns the
+    root's ThemeWatcher; calling again for the same root returns it unchanged.
     """
-    global current_mode
-    dark = is_dark_mode()
-    if dark != current_mode:
-        current_mode = dark
-        apply_theme(root, widgets, dark)
-    root.after(interval, start_polling, root, widgets, interval)
\ No newline at end of file
+    watcher = _watchers.get(str(root))
+    if watcher is not None and not watcher.stopped:
+        return watcher
+    watcher = _watchers[str(root)] = ThemeWatcher(root, provider, widgets, min_interval=interval)
+    return watcher.start()
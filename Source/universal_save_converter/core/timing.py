@@ -0,0 +1,166 @@
+# core/timing.py
+#
+# Per-stage conversion timing: a StageTimer rides along with each
+# conversion, and STATS keeps rolling percentiles per conversion path.
+
+import math
+import threading
+from collections import deque
+from time import perf_counter_ns, time_ns
+
+# Stage names, in pipeline order
+STAGES = ("plan", "read", "resize", "swap", "dialog", "write", "stream")
+
+# Samples kept per path key and stage for the rolling percentiles
+STATS_WINDOW = 1024
+
+
+class StageTimer:
+    """
+    Accumulates how long each conversion stage took, in seconds.
+    lap(stage) charges the time since the previous lap (or restart) to stage.
+    With trace=True every lap is also kept in spans as (stage, start_ns, end_ns)
+    on the perf_counter_ns clock; wall_spans() converts them to epoch time.
+    on_lap(stage, seconds), if given, is called after every lap (progress
+    reporting and cancellation checks between stages).
+    """
+    __slots__ = ("stages", "spans", "on_lap", "_last")
+
+    def __init__(self, trace: bool = False, on_lap=None):
+        self.stages = {}
+        self.spans = [] if trace else None
+        self.on_lap = on_lap
+        self._last = perf_counter_ns()
+
+    def restart(self) -> None:
+        """Start the next lap now, discarding time spent since the last one."""
+        self._last = perf_counter_ns()
+
+    def lap(self, stage: str) -> float:
+        now = perf_counter_ns()
+        seconds = (now - self._last) / 1e9
+        if self.spans is not None:
+            self.spans.append((stage, self._last, now))
+        self._last = now
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        if self.on_lap is not None:
+            self.on_lap(stage, seconds)
+        return seconds
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def wall_spans(self) -> list:
+        """Traced spans as (stage, start_ns, end_ns) in epoch nanoseconds, comparable across processes."""
+        offset = time_ns() - perf_counter_ns()
+        return [(stage, start + offset, end + offset) for stage, start, end in self.spans or ()]
+
+
+def _percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    # ceil(pct/100 * n), computed as pct * n / 100 so whole ranks stay exact
+    rank = max(1, min(len(ordered), math.ceil(pct * len(ordered) / 100)))
+    return ordered[rank - 1]
+
+
+def _summary(samples) -> dict:
+    ordered = sorted(samples)
+    return {
+        "p50_ms": _percentile(ordered, 50) * 1000,
+        "p95_ms": _percentile(ordered, 95) * 1000,
+        "p99_ms": _percentile(ordered, 99) * 1000,
+    }
+
+
+class _PathStats:
+    __slots__ = ("count", "totals", "nbytes", "stages")
+
+    def __init__(self, window):
+        self.count = 0
+        self.totals = deque(maxlen=window)
+        self.nbytes = deque(maxlen=window)
+        self.stages = {}
+
+
+class RollingStats:
+    """
+    Rolling per-path timing statistics over the last `window` conversions
+    of each path key. Thread-safe; record() is cheap, stats() does the sorting.
+    """
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self.window = window
+        self._paths = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, stages: dict, nbytes: int = 0) -> None:
+        """Add one conversion: stage name -> seconds, plus the input size in bytes."""
+        with self._lock:
+            path = self._paths.get(key)
+            if path is None:
+                path = self._paths[key] = _PathStats(self.window)
+            path.count += 1
+            path.totals.append(sum(stages.values()))
+            path.nbytes.append(nbytes or 0)
+            for stage, seconds in stages.items():
+                samples = path.stages.get(stage)
+                if samples is None:
+                    samples = path.stages[stage] = deque(maxlen=self.window)
+                samples.append(seconds)
+
+    def stats(self) -> dict:
+        """
+        {path key: {"count", "window", "total": {p50_ms, p95_ms, p99_ms},
+        "stages": {stage: {...}}, "bytes_per_second"}}
+        """
+        with self._lock:
+            snapshot = {key: (path.count, list(path.totals), list(path.nbytes),
+                              {stage: list(samples) for stage, samples in path.stages.items()})
+                        for key, path in self._paths.items()}
+
+        result = {}
+        for key, (count, totals, nbytes, stages) in snapshot.items():
+            elapsed = sum(totals)
+            result[key] = {
+                "count": count,
+                "window": len(totals),
+                "total": _summary(totals),
+                "stages": {stage: _summary(samples)
+                           for stage, samples in sorted(stages.items(), key=lambda s: _stage_order(s[0]))},
+                "bytes_per_second": sum(nbytes) / elapsed if elapsed > 0 else 0.0,
+            }
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._paths.clear()
+
+
+def _stage_order(stage):
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+def format_stats(stats: dict) -> list:
+    """Human-readable lines for RollingStats.stats(), slowest path first."""
+    lines = []
+    for key, path in sorted(stats.items(), key=lambda item: item[1]["total"]["p50_ms"], reverse=True):
+        total = path["total"]
+        lines.append(f"{key.strip()}: {path['count']} run(s), p50 {total['p50_ms']:.3f} ms, "
+                     f"p95 {total['p95_ms']:.3f} ms, p99 {total['p99_ms']:.3f} ms, "
+                     f"{path['bytes_per_second'] / (1024 * 1024):.1f} MB/s")
+        lines.append("    " + ", ".join(f"{stage} {summary['p50_ms']:.3f}/{summary['p99_ms']:.3f} ms"
+                                        for stage, summary in path["stages"].items()) + " (p50/p99)")
+    return lines
+
+
+# Process-wide statistics for every finished conversion
+STATS = RollingStats()
+
+
+def stats() -> dict:
+    """Rolling timing statistics per conversion path key."""
+    return STATS.stats()
@@ -0,0 +1,76 @@
+# core/trace.py
+#
+# Chrome trace-event export for batch runs (open in chrome://tracing or
+# https://ui.perfetto.dev). One track per worker process, a span per file
+# and, nested inside it, a span per conversion stage.
+
+import json
+import os
+from datetime import datetime
+
+
+def _us(epoch_ns, anchor_ns):
+    return (epoch_ns - anchor_ns) / 1000
+
+
+def trace_events(summary, jobs, anchor_ns=None) -> list:
+    """
+    Trace events for a BatchSummary from run_batch(..., trace=True).
+    Timestamps are microseconds after anchor_ns (default: batch start).
+    """
+    anchor_ns = anchor_ns if anchor_ns is not None else int(summary.started * 1e9)
+    parent = os.getpid()
+    events = [
+        {"name": "process_name", "ph": "M", "pid": parent, "tid": 0, "args": {"name": f"batch (pid {parent})"}},
+        {"name": "batch", "cat": "batch", "ph": "X", "pid": parent, "tid": 0, "ts": 0.0,
+         "dur": summary.elapsed * 1e6,
+         "args": {"files": len(summary.results), "converted": summary.converted, "failed": summary.failed}},
+    ]
+
+    workers = {}
+    for job, result in zip(jobs, summary.results):
+        pid = result.worker or parent
+        if pid not in workers:
+            workers[pid] = len(workers) + 1
+            if pid != parent:
+                events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                               "args": {"name": f"worker {workers[pid]} (pid {pid})"}})
+                events.append({"name": "process_sort_index", "ph": "M", "pid": pid, "tid": 0,
+                               "args": {"sort_index": workers[pid]}})
+
+        args = {
+            "input": result.input_path,
+            "output": result.output_path,
+            "plan": job.plan.key.strip(),
+            "bytes_in": result.bytes_in,
+            "bytes_out": result.bytes_out,
+            "worker": workers[pid],
+        }
+        if result.error:
+            args["error"] = result.error
+        events.append({"name": os.path.basename(result.input_path), "cat": "file", "ph": "X",
+                       "pid": pid, "tid": 0, "ts": _us(int(result.started * 1e9), anchor_ns),
+                       "dur": result.elapsed * 1e6, "args": args})
+        for stage, start, end in result.spans or ():
+            events.append({"name": stage, "cat": "stage", "ph": "X", "pid": pid, "tid": 0,
+                           "ts": _us(start, anchor_ns), "dur": (end - start) / 1000,
+                           "args": {"plan": args["plan"], "bytes_in": result.bytes_in}})
+    return events
+
+
+def write_trace(path: str, summary, jobs) -> int:
+    """Write a trace-event JSON file for a traced batch; returns the number of events."""
+    anchor_ns = int(summary.started * 1e9)
+    events = trace_events(summary, jobs, anchor_ns)
+    payload = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            # ts 0 in the timeline is this wall-clock instant
+            "wall_clock_anchor": datetime.fromtimestamp(summary.started).isoformat(timespec="microseconds"),
+            "elapsed_seconds": summary.elapsed,
+        },
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    return len(events)
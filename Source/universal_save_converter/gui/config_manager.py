@@ -1,43 +1,250 @@
 # gui/config_manager.py
+#
+# GUI settings in gui_config.json. Each file has one in-memory ConfigStore,
+# loaded on first access. set() only updates memory and restarts a debounce
+# timer, so a burst of changes costs a single write. Writes go to a temp
+# file in the same directory, which then atomically replaces the config.
+# Pending changes are flushed at exit.
 
+import atexit
 import json
 import os
+import stat
 import sys
+import tempfile
+import threading
+from time import monotonic
+
+# Seconds without changes before pending changes are written, and the
+# longest a change may wait while new ones keep arriving
+SAVE_DELAY = 0.5
+SAVE_MAX_DELAY = 5.0
+
+
+def default_config_dir():
+    """Directory next to the executable (PyInstaller) or this script."""
+    if getattr(sys, 'frozen', False):
+        # Running as PyInstaller executable
+        return os.path.dirname(sys.executable)
+    # Running as script
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+class ConfigStore:
+    """
+    A JSON object kept in memory and written back lazily. Thread-safe;
+    the debounce timer flushes from its own thread.
+    """
+
+    def __init__(self, path: str, delay: float = SAVE_DELAY, max_delay: float = SAVE_MAX_DELAY):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.writes = 0
+        self._data = None
+        self._dirty_since = None
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _loaded(self) -> dict:
+        # Caller holds the lock
+        if self._data is None:
+            self._data = self._read()
+        return self._data
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty_since is not None
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            return self._loaded().get(key, default)
+
+    def set(self, key: str, value) -> None:
+        """Change a value in memory; the file is written after SAVE_DELAY."""
+        with self._lock:
+            data = self._loaded()
+            if key in data and data[key] == value:
+                return
+            data[key] = value
+            self._changed()
+
+    def update(self, values: dict) -> None:
+        with self._lock:
+            data = self._loaded()
+            changed = {key: value for key, value in values.items() if key not in data or data[key] != value}
+            if changed:
+                data.update(changed)
+                self._changed()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            data = self._loaded()
+            if key in data:
+                del data[key]
+                self._changed()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._loaded()))
+
+    def reload(self) -> None:
+        """Re-read the file, discarding changes not yet written."""
+        with self._lock:
+            self._cancel()
+            self._dirty_since = None
+            self._data = self._read()
+
+    # Typed accessors: a missing value, or one of the wrong type in a
+    # hand-edited file, gives the default
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        value = self.get(key)
+        return value if isinstance(value, bool) else default
+
+    def get_int(self, key: str, default: int = 0, minimum: int = None, maximum: int = None) -> int:
+        value = self.get(key)
+        if not isinstance(value, int) or isinstance(value, bool):
+            return default
+        if minimum is not None and value < minimum:
+            return minimum
+        if maximum is not None and value > maximum:
+            return maximum
+        return value
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        value = self.get(key)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return default
+        return float(value)
+
+    def get_str(self, key: str, default: str = "") -> str:
+        value = self.get(key)
+        return value if isinstance(value, str) else default
+
+    def get_list(self, key: str, default: list = None) -> list:
+        value = self.get(key)
+        return list(value) if isinstance(value, list) else list(default or [])
+
+    def get_dict(self, key: str, default: dict = None) -> dict:
+        value = self.get(key)
+        return dict(value) if isinstance(value, dict) else dict(default or {})
+
+    # Persistence
+
+    def _changed(self):
+        # Caller holds the lock: restart the debounce timer, unless changes
+        # have already been pending for max_delay
+        now = monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        elif self._timer is not None and now - self._dirty_since >= self.max_delay:
+            return
+        self._cancel()
+        self._timer = threading.Timer(self.delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self) -> bool:
+        """Write pending changes now. Returns True when the file was written."""
+        with self._lock:
+            self._cancel()
+            if self._dirty_since is None:
+                return False
+            try:
+                self._write(json.dumps(self._data, indent=4))
+            except (OSError, TypeError, ValueError):
+                # Keep the changes pending; the next set() or exit retries
+                return False
+            self._dirty_since = None
+            self.writes += 1
+            return True
+
+    def _write(self, text: str) -> None:
+        directory = os.path.dirname(self.path) or "."
+        fd, temp_path = tempfile.mkstemp(prefix=".gui_config.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(temp_path, stat.S_IMODE(os.stat(self.path).st_mode))
+            except OSError:
+                pass  # new file: keep mkstemp's owner-only mode
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: str) -> ConfigStore:
+    """The shared ConfigStore for a config file path (nothing is read yet)."""
+    path = os.path.abspath(path)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = ConfigStore(path)
+        return store
+
+
+def flush_all() -> None:
+    """Write every store's pending changes (registered with atexit)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+atexit.register(flush_all)
+
 
 class ConfigManager:
+    """Typed GUI settings. Managers for the same file share one ConfigStore."""
+
     def __init__(self, filename="gui_config.json"):
         # Determine path next to executable or script
-        if getattr(sys, 'frozen', False):
-            # Running as PyInstaller executable
-            self.config_dir = os.path.dirname(sys.executable)
-        else:
-            # Running as script
-            self.config_dir = os.path.dirname(os.path.abspath(__file__))
-
+        self.config_dir = default_config_dir()
         self.config_path = os.path.join(self.config_dir, filename)
-        self.config = {}
-        self.load_config()
+        self.store = get_store(self.config_path)
+
+    @property
+    def config(self) -> dict:
+        """A copy of every setting."""
+        return self.store.snapshot()
 
     def load_config(self):
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, "r") as f:
-                    self.config = json.load(f)
-            except Exception:
-                self.config = {}
-        else:
-            self.config = {}
+        self.store.reload()
 
     def save_config(self):
-        try:
-            with open(self.config_path, "w") as f:
-                json.dump(self.config, f, indent=4)
-        except Exception:
-            pass
+        self.store.flush()
 
     def get_log_visible(self, default=True):
-        return self.config.get("log_visible", default)
+        return self.store.get_bool("log_visible", default)
 
     def set_log_visible(self, visible: bool):
-        self.config["log_visible"] = visible
-        self.save_config()
\ No newline at end of file
+        self.store.set("log_visible", bool(visible))
+
+    def get_log_max_lines(self, default=2000):
+        """Line limit for the GUI log; 0 keeps every line."""
+        return self.store.get_int("log_max_lines", default, minimum=0)
@@ -1,15 +1,22 @@
 # gui/gui_utils.py
 import tkinter as tk
+from collections import deque
+from graphlib import CycleError, TopologicalSorter
+
+from core.logger import log
 
 class GUIResetManager:
-    def __init__(self):
+    def __init__(self, scheduler=None):
         # internal dict: id(upstream_var) -> (upstream_var_obj, list of (downstream_var, custom_reset_func))
         self.dependencies = {}
+        # With an UpdateScheduler, resets run as its nodes instead of from traces
+        self.scheduler = scheduler
 
-    def add_dependency(self, upstream_var, downstream_vars, custom_resets=None):
+    def add_dependency(self, upstream_var, downstream_vars, custom_resets=None, name=None):
         """
         downstream_vars: list of variables to reset
         custom_resets: dict {id(var): callable} for custom reset logic
+        name: scheduler node name (default "reset:<upstream variable>")
         """
         key = id(upstream_var)
         if key not in self.dependencies:
@@ -21,6 +28,19 @@ class GUIResetManager:
                 reset_func = custom_resets[id(var)]
             self.dependencies[key][1].append((var, reset_func))
 
+        if self.scheduler is not None:
+            node_name = name or f"reset:{upstream_var}"
+            if node_name in self.scheduler.nodes:
+                self.scheduler.add_outputs(node_name, downstream_vars)
+            else:
+                self.scheduler.add_node(
+                    node_name,
+                    lambda k=key: self.reset_downstream(k),
+                    inputs=[upstream_var],
+                    outputs=downstream_vars
+                )
+            return
+
         # Attach trace
         upstream_var.trace_add("write", lambda *args, k=key: self.reset_downstream(k))
 
@@ -34,4 +54,162 @@ class GUIResetManager:
                 if isinstance(var, (tk.StringVar, tk.IntVar, tk.DoubleVar)):
                     var.set("")
                 elif isinstance(var, tk.BooleanVar):
-                    var.set(False)
\ No newline at end of file
+                    var.set(False)
+
+
+class _Node:
+    __slots__ = ("name", "func", "inputs", "outputs", "after")
+
+    def __init__(self, name, func, inputs, outputs, after):
+        self.name = name
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.after = after
+
+
+class UpdateScheduler:
+    """
+    Coalesced, dependency-ordered updates for derived GUI state.
+
+    Each node is a recompute function plus the Tk variables it reads
+    (inputs) and writes (outputs). Writing an input only marks its nodes
+    dirty; once per idle cycle every dirty node runs once, in topological
+    order (a node that writes another node's input runs first; `after`
+    adds explicit orderings). Writes made while flushing mark later nodes
+    for the same pass, so one user action costs one recompute per node.
+    Per-node counters of every action are kept in `actions` / stats().
+    """
+    # Extra passes allowed when a node dirties one that already ran
+    MAX_PASSES = 3
+    # Actions kept in the history
+    HISTORY = 50
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.nodes = {}
+        self.order = []
+        self.totals = {}
+        self.actions = deque(maxlen=self.HISTORY)
+        self._inputs = {}      # Tk variable name -> (label, [node names])
+        self._labels = {}
+        self._dirty = set()
+        self._triggers = []
+        self._pending = None
+        self._flushing = False
+
+    def add_node(self, name, func, inputs=(), outputs=(), after=()):
+        """Register func(); it runs whenever one of the inputs was written."""
+        if name in self.nodes:
+            raise ValueError(f"Update node {name!r} already exists")
+        self.nodes[name] = _Node(name, func, list(inputs), list(outputs), list(after))
+        try:
+            self.order = self._sorted()
+        except CycleError as e:
+            del self.nodes[name]
+            raise ValueError(f"Update node {name!r} creates a cycle: {e.args[1]}") from None
+
+        for var in inputs:
+            key = str(var)
+            if key not in self._inputs:
+                self._inputs[key] = (self._labels.get(key, key), [])
+                var.trace_add("write", lambda *args, k=key: self.mark(k))
+            self._inputs[key][1].append(name)
+        return name
+
+    def add_outputs(self, name, outputs):
+        """Declare more variables written by an existing node."""
+        node = self.nodes[name]
+        added = [var for var in outputs if var not in node.outputs]
+        node.outputs.extend(added)
+        try:
+            self.order = self._sorted()
+        except CycleError as e:
+            del node.outputs[len(node.outputs) - len(added):]
+            raise ValueError(f"Update node {name!r} creates a cycle: {e.args[1]}") from None
+
+    def name_input(self, var, label):
+        """Readable name for a Tk variable (PY_VARn by default) in the action counters."""
+        key = str(var)
+        self._labels[key] = label
+        if key in self._inputs:
+            self._inputs[key] = (label, self._inputs[key][1])
+
+    def _sorted(self):
+        writers = {}
+        for node in self.nodes.values():
+            for var in node.outputs:
+                writers.setdefault(str(var), []).append(node.name)
+        graph = {}
+        for node in self.nodes.values():
+            deps = set(node.after)
+            for var in node.inputs:
+                deps.update(writer for writer in writers.get(str(var), ()) if writer != node.name)
+            graph[node.name] = deps & self.nodes.keys()
+        return list(TopologicalSorter(graph).static_order())
+
+    def mark(self, key):
+        """A traced input was written: mark its nodes dirty and schedule a flush."""
+        label, names = self._inputs.get(key, (key, ()))
+        self._dirty.update(names)
+        if not self._flushing:
+            self._triggers.append(label)
+            if self._pending is None:
+                self._pending = self.widget.after_idle(self.flush)
+
+    def run(self, *names):
+        """Mark nodes dirty directly (e.g. for an initial update)."""
+        self._dirty.update(names)
+        if not self._flushing and self._pending is None:
+            self._pending = self.widget.after_idle(self.flush)
+
+    def flush(self):
+        """Run every dirty node once, in order. Returns {node name: runs}."""
+        if self._pending is not None:
+            try:
+                self.widget.after_cancel(self._pending)
+            except tk.TclError:
+                pass
+            self._pending = None
+
+        runs = {}
+        self._flushing = True
+        try:
+            for _ in range(self.MAX_PASSES):
+                if not self._dirty:
+                    break
+                for name in self.order:
+                    if name in self._dirty:
+                        self._dirty.discard(name)
+                        runs[name] = runs.get(name, 0) + 1
+                        self.nodes[name].func()
+            dropped = [name for name in self.order if name in self._dirty]
+            self._dirty.clear()
+        finally:
+            self._flushing = False
+
+        if dropped:
+            # Nodes that keep re-marking each other: a feedback loop in the graph
+            log(f"Update nodes still dirty after {self.MAX_PASSES} passes, dropped: {', '.join(dropped)}",
+                level="WARN")
+
+        for name, count in runs.items():
+            self.totals[name] = self.totals.get(name, 0) + count
+        self.actions.append({"triggers": list(dict.fromkeys(self._triggers)),
+                             "writes": len(self._triggers),
+                             "recomputes": runs,
+                             "dropped": dropped})
+        self._triggers = []
+        return runs
+
+    @property
+    def last_action(self):
+        return self.actions[-1] if self.actions else None
+
+    def stats(self) -> dict:
+        """Recompute counts: per node overall, and per action for recent actions."""
+        return {
+            "actions": len(self.actions),
+            "totals": dict(self.totals),
+            "recent": list(self.actions),
+        }
@@ -0,0 +1,73 @@
+# gui/jobs_panel.py
+
+from tkinter import Frame, Label, Button, LEFT, RIGHT, BOTH, X
+from tkinter import ttk
+
+from core.jobs import JOBS, JOB_RUNNING, start_job_drain
+
+JOB_COLUMNS = (
+    ("name", "Job", 150),
+    ("state", "State", 70),
+    ("progress", "Progress", 95),
+    ("rate", "Throughput", 80),
+)
+
+
+def _format_rate(job):
+    if not job.nbytes or job.elapsed <= 0:
+        return ""
+    rate = job.throughput
+    if rate >= 1024 * 1024:
+        return f"{rate / (1024 * 1024):.1f} MB/s"
+    return f"{rate / 1024:.0f} KB/s"
+
+
+def _format_progress(job):
+    text = f"{job.progress * 100:3.0f}%"
+    if job.state == JOB_RUNNING and job.stage:
+        text += f" {job.stage}"
+    return text
+
+
+def create_jobs_panel(parent, manager=JOBS, height=3):
+    """
+    A small table of the manager's jobs (state, progress, throughput) with
+    a Cancel button for the selected job. Rows update on the Tk thread as
+    the manager is polled. Returns the panel's frame.
+    """
+    frame = Frame(parent)
+
+    header = Frame(frame)
+    header.pack(fill=X)
+    Label(header, text="Jobs:").pack(side=LEFT)
+
+    tree = ttk.Treeview(frame, columns=[column for column, _, _ in JOB_COLUMNS], show="headings",
+                        height=height, selectmode="browse")
+    for column, title, width in JOB_COLUMNS:
+        tree.heading(column, text=title)
+        tree.column(column, width=width, stretch=(column == "name"))
+    tree.pack(fill=BOTH, expand=True)
+
+    def cancel_selected():
+        for item in tree.selection():
+            manager.cancel(int(item))
+
+    Button(header, text="Cancel", command=cancel_selected).pack(side=RIGHT)
+
+    def update_row(job):
+        item = str(job.id)
+        values = (job.name, job.state, _format_progress(job), _format_rate(job))
+        if tree.exists(item):
+            tree.item(item, values=values)
+        else:
+            tree.insert("", 0, iid=item, values=values)
+            # Keep the table to the jobs the manager still remembers
+            for stale in tree.get_children()[len(manager.jobs):]:
+                tree.delete(stale)
+
+    for job in list(manager.jobs.values()):
+        update_row(job)
+    manager.add_listener(update_row)
+    frame.bind("<Destroy>", lambda e: manager.remove_listener(update_row) if e.widget is frame else None)
+    start_job_drain(frame, manager)
+    return frame
@@ -4,9 +4,8 @@ import os
 import tkinter as tk
 from tkinter import Frame, Label, Button
 
-# Import system GUIs
-from systems.n64.gui.n64_gui_main import setup_n64_gui
-from systems.gba.gui.gba_gui_main import setup_gba_gui
+# System GUIs are imported on demand through the registry
+from systems.registry import discover_plugins, get_system, systems
 
 # Consoles grouped by manufacturer
 NINTENDO_HOME = ["NES", "SNES", "Nintendo 64", "Nintendo Virtual Boy", "Nintendo GameCube", "Nintendo Wii"]
@@ -22,27 +21,23 @@ PASTEL_DARK_BLUE = "#4A6FA5"
 PASTEL_HOVER_BLUE = "#5E84B8"
 TEXT_COLOR = "#1E3A5F"
 
-# Console → GUI map
-CONSOLE_GUI_MAP = {
-    "Game Boy / Game Boy Color": None,
-    "Game Boy Advance": setup_gba_gui,
-    "Nintendo DS / Nintendo DSi": None,
-    "NES": None,
-    "SNES": None,
-    "Nintendo 64": setup_n64_gui,
-    "Nintendo Virtual Boy": None,
-    "Nintendo GameCube": None,
-    "Nintendo Wii": None,
-    "Sega Master System": None,
-    "Sega Genesis/Megadrive": None,
-    "Sega Saturn": None,
-    "Sega Dreamcast": None,
-    "Sega GameGear": None,
-    "Sony PlayStation": None,
-    "Sony PlayStation 2": None,
-    "Sony PlayStation Portable": None,
-    "Sony PlayStation Vita": None,
-}
+ALL_CONSOLES = NINTENDO_HOME + NINTENDO_HANDHELD + SEGA_HOME + SEGA_HANDHELD + SONY_HOME + SONY_HANDHELD
+
+
+def console_gui_map():
+    """
+    Console → lazy GUI entry (systems.registry.SystemEntry, or None for
+    "coming soon"), including consoles added by installed plugins.
+    """
+    discover_plugins()
+    console_map = {console: get_system(console) for console in ALL_CONSOLES}
+    for console, entry in systems().items():
+        console_map.setdefault(console, entry)
+    return console_map
+
+
+# Console → GUI map (built-in systems; nothing is imported until a console is opened)
+CONSOLE_GUI_MAP = {console: get_system(console) for console in ALL_CONSOLES}
 
 
 class TopLevelGUI:
@@ -77,8 +72,7 @@ class TopLevelGUI:
 
     def _calculate_button_width(self):
         """Calculate a uniform button width based on the longest console name"""
-        all_names = NINTENDO_HOME + NINTENDO_HANDHELD + SEGA_HOME + SEGA_HANDHELD + SONY_HOME + SONY_HANDHELD
-        longest_name = max(all_names, key=len)
+        longest_name = max(ALL_CONSOLES, key=len)
         return len(longest_name) + 2
 
     def setup_logo(self):
@@ -126,11 +120,15 @@ class TopLevelGUI:
         grid_frame = Frame(self.console_frame)
         grid_frame.pack(fill="both", expand=True)
 
+        console_map = console_gui_map()
         manufacturers = [
             ("Nintendo", NINTENDO_HOME, NINTENDO_HANDHELD),
             ("Sega", SEGA_HOME, SEGA_HANDHELD),
             ("Sony", SONY_HOME, SONY_HANDHELD),
         ]
+        plugin_consoles = [console for console in console_map if console not in ALL_CONSOLES]
+        if plugin_consoles:
+            manufacturers.append(("Other", sorted(plugin_consoles), []))
 
         for col_index, (name, home_list, handheld_list) in enumerate(manufacturers):
             Label(grid_frame, text=name, font=("Arial", 14, "bold")).grid(row=0, column=col_index, padx=20, pady=(0, 5), sticky="w")
@@ -140,7 +138,7 @@ class TopLevelGUI:
                     grid_frame,
                     text=console,
                     width=self.button_width,
-                    command=lambda c=console: self.load_console_gui(c, CONSOLE_GUI_MAP.get(c)),
+                    command=lambda c=console: self.load_console_gui(c, console_map.get(c)),
                     bg=PASTEL_DARK_BLUE,
                     fg=TEXT_COLOR,
                     activebackground=PASTEL_HOVER_BLUE,
@@ -152,7 +150,10 @@ class TopLevelGUI:
                 row += 1
 
     def load_console_gui(self, console_name, gui_func):
-        """Load console GUI in a Toplevel window for full functionality"""
+        """
+        Load console GUI in a Toplevel window for full functionality.
+        gui_func is a setup function or a registry entry, which imports the system now.
+        """
         self._clear_current_frame()
         if self.console_frame:
             self.console_frame.pack_forget()
@@ -174,7 +175,20 @@ class TopLevelGUI:
         back_btn.pack(anchor="nw", pady=(0, 10), padx=10)
         self._add_hover_effect(back_btn)
 
-        if gui_func is None:
+        load_error = None
+        if gui_func is not None and hasattr(gui_func, "load"):
+            try:
+                gui_func = gui_func.load()
+            except Exception as e:
+                load_error, gui_func = e, None
+
+        if load_error is not None:
+            Label(
+                self.current_frame,
+                text=f"Could not load {console_name}: {load_error}",
+                font=("Arial", 14)
+            ).pack(pady=50)
+        elif gui_func is None:
             Label(
                 self.current_frame,
                 text=f"{console_name} Coming Soon...",
@@ -1,9 +1,17 @@
 # main.py
 
-from gui.main_gui import TopLevelGUI
+import sys
 
-def main():
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Command-line mode never imports the GUI (or tkinter)
+        from cli import main as cli_main
+        return cli_main(argv)
+
+    from gui.main_gui import TopLevelGUI
     TopLevelGUI()  # Launch the top-level console selection GUI
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
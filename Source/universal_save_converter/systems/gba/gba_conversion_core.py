@@ -1,5 +1,6 @@
 import os
 from tkinter import filedialog, messagebox
+from core.exceptions import ConversionError
 from core.file_utils import read_bytes, write_bytes, resize_bytes, new_filename
 from core.swap_utils import byteswap, determine_swap_size
 from core.logger import log
@@ -19,7 +20,11 @@ def convert_save(path, src, src_type, tgt, tgt_type, byteswap_option, trim_pad_o
     key = f"{src}-{src_type}-{tgt}-{tgt_type}"
     log(f"Starting conversion: {path}", log_box=log_box, level="INFO")
 
-    data = read_bytes(path)
+    try:
+        data = read_bytes(path)
+    except ConversionError as e:
+        messagebox.showerror("Error", str(e))
+        data = None
     if not data:
         log("Error reading input file.", log_box=log_box, level="ERROR")
         return None
@@ -117,7 +122,13 @@ def convert_save(path, src, src_type, tgt, tgt_type, byteswap_option, trim_pad_o
         log("Save operation cancelled by user.", log_box=log_box, level="WARN")
         return None
 
-    if write_bytes(data, out_path):
+    try:
+        written = write_bytes(data, out_path)
+    except ConversionError as e:
+        messagebox.showerror("Error", str(e))
+        written = False
+
+    if written:
         log(f"File written successfully → {out_path}", log_box=log_box, level="SUCCESS")
         messagebox.showinfo("Success", f"File converted and saved as:\n{out_path}")
         return out_path
@@ -10,7 +10,7 @@ from systems.gba.gba_constants import SOURCE_LIST, TARGET_LIST
 
 # --- Utilities ---
 from core.gui_logger import set_log_widget
-from core.theme_utils import apply_theme, start_polling
+from core.theme_utils import start_polling
 from systems.gba.gba_utils import determine_valid_target_types, is_byteswap_allowed
 from systems.gba.gui import gba_gui_vars as gui_vars
 from gui.gui_utils import GUIResetManager
@@ -247,5 +247,4 @@ def setup_gba_gui(parent):
     # --------------------------
     # Apply Theme and Start Polling
     # --------------------------
-    apply_theme(parent)
     start_polling(parent)
\ No newline at end of file
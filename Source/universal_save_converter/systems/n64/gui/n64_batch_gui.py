@@ -0,0 +1,297 @@
+# systems/n64/gui/n64_batch_gui.py
+#
+# Batch queue window for the N64 GUI: add many saves (or whole folders),
+# pick one conversion profile and one output directory, and convert the
+# queue in the background with a progress bar. Files are grouped by
+# detected save type; each group gets its own plan.
+
+import os
+from tkinter import (
+    Toplevel, Frame, Label, Button, Entry, Checkbutton, StringVar, BooleanVar,
+    filedialog, LEFT, RIGHT, BOTH, X, W
+)
+from tkinter import ttk
+
+from core.exceptions import ConversionCancelled, ConversionError
+from core.file_utils import detect_file_type
+from core.jobs import JOBS, JOB_CANCELLED, JOB_DONE, start_job_drain
+from core.logger import log
+from gui.gui_utils import UpdateScheduler
+from systems.n64.n64_batch import expand_inputs, group_by_type, plan_jobs, record_batch_result, run_batch
+from systems.n64.n64_constants import (
+    SOURCE_LIST, TARGET_LIST, EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL
+)
+from systems.n64.n64_conversion_plan import resolve_plan
+from systems.n64.n64_utils import determine_valid_target_types
+
+SAVE_FILETYPES = [("N64 Saves", "*.eep *.sra *.fla *.mpk *.srm")]
+BYTESWAP_OPTIONS = ["Default", "2 bytes", "4 bytes"]
+AMBIGUOUS_TARGET_TYPES = [EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL]
+
+_windows = {}
+
+
+def group_plan(src, save_type, tgt, target_type=None):
+    """
+    The plan for one group of same-type saves, as (plan, None) or
+    (None, reason). target_type picks between several valid output types.
+    """
+    if save_type is None:
+        return None, "unknown save type"
+    valid = determine_valid_target_types(src, save_type, tgt)
+    if not valid:
+        return None, f"{tgt} has no output for {save_type}"
+    if len(valid) == 1:
+        target_type = valid[0]
+    elif target_type not in valid:
+        return None, "several output types possible (choose a target type)"
+    try:
+        return resolve_plan(src, save_type, tgt, target_type), None
+    except (ConversionError, KeyError, ValueError) as e:
+        return None, str(e)
+
+
+def convert_queue(jobs, log_box=None, job=None):
+    """
+    Convert a list of BatchJobs in this thread, recording each file in the
+    history as it finishes. Run as a core.jobs Job it reports progress per
+    file and stops between files once cancelled. Returns the BatchSummary.
+    """
+    total = len(jobs)
+    done = {"files": 0, "bytes": 0}
+
+    def progress(batch_job, result):
+        record_batch_result(batch_job, result)
+        if result.error:
+            log(f"{result.input_path}: {result.error}", log_box=log_box, level="ERROR")
+        done["files"] += 1
+        done["bytes"] += result.bytes_in
+        if job is not None:
+            job.report(os.path.basename(result.input_path), done["files"] / total, done["bytes"])
+            job.token.check()
+
+    try:
+        # One worker: files are small, and the GUI process never forks a pool
+        summary = run_batch(jobs, max_workers=1, progress=progress)
+    except ConversionCancelled:
+        log(f"Batch cancelled after {done['files']} of {total} file(s).", log_box=log_box, level="WARN")
+        raise
+
+    log(
+        f"Converted {summary.converted} file(s), {summary.failed} failed "
+        f"in {summary.elapsed:.2f}s ({summary.files_per_second:.1f} files/s, "
+        f"{summary.megabytes_per_second:.1f} MB/s)",
+        log_box=log_box, level="SUCCESS" if not summary.failed else "WARN"
+    )
+    return summary
+
+
+def open_batch_window(parent, log_box=None, source=None, target=None):
+    """Open the batch queue window for parent (or raise it if already open)."""
+    window = _windows.get(str(parent))
+    if window is not None and window.winfo_exists():
+        window.deiconify()
+        window.lift()
+        return window
+
+    window = Toplevel(parent)
+    window.title("N64 Batch Queue")
+    _windows[str(parent)] = window
+
+    queue = {}  # input path -> folder it was added from (None for single files)
+    source_var = StringVar(master=window, value=source or "")
+    target_var = StringVar(master=window, value=target or "")
+    target_type_var = StringVar(master=window)
+    byteswap_var = StringVar(master=window, value="Default")
+    output_dir_var = StringVar(master=window)
+    overwrite_var = BooleanVar(master=window, value=False)
+    queue_var = StringVar(master=window)  # bumped whenever the queue changes
+    status_var = StringVar(master=window, value="Add save files or a folder.")
+    running = {"job": None}
+
+    # --------------------------
+    # Queue: add / remove
+    # --------------------------
+    buttons = Frame(window)
+    buttons.pack(fill=X, padx=10, pady=(10, 5))
+
+    def add_inputs(inputs):
+        added = 0
+        for path, root in inputs:
+            if path not in queue:
+                queue[path] = root
+                added += 1
+        if added:
+            queue_var.set(str(len(queue)))
+
+    def add_files():
+        # Picked files are added as-is (not as glob patterns: names like "Game [USA].eep")
+        paths = filedialog.askopenfilenames(parent=window, filetypes=SAVE_FILETYPES)
+        add_inputs((path, None) for path in paths if os.path.isfile(path))
+
+    def add_folder():
+        folder = filedialog.askdirectory(parent=window)
+        if folder:
+            # Sub-folders are kept under the output folder
+            add_inputs(expand_inputs([folder], recursive=True))
+
+    def remove_selected():
+        for item in tree.selection():
+            if item in queue:
+                del queue[item]
+            else:
+                # A group row: drop every file in it
+                for child in tree.get_children(item):
+                    queue.pop(child, None)
+        queue_var.set(str(len(queue)))
+
+    def clear_queue():
+        queue.clear()
+        queue_var.set("0")
+
+    Button(buttons, text="Add Files…", command=add_files).pack(side=LEFT)
+    Button(buttons, text="Add Folder…", command=add_folder).pack(side=LEFT, padx=5)
+    Button(buttons, text="Remove", command=remove_selected).pack(side=LEFT)
+    Button(buttons, text="Clear", command=clear_queue).pack(side=LEFT, padx=5)
+
+    tree = ttk.Treeview(window, columns=("files", "output"), height=10)
+    tree.heading("#0", text="Save type / file")
+    tree.heading("files", text="Files")
+    tree.heading("output", text="Output")
+    tree.column("#0", width=300)
+    tree.column("files", width=50, anchor="e", stretch=False)
+    tree.column("output", width=280)
+    tree.pack(fill=BOTH, expand=True, padx=10)
+
+    # --------------------------
+    # Conversion profile
+    # --------------------------
+    profile = Frame(window)
+    profile.pack(fill=X, padx=10, pady=5)
+
+    def combo(row, column, text, var, values):
+        Label(profile, text=text).grid(row=row, column=column, sticky=W, padx=(0, 5), pady=2)
+        menu = ttk.Combobox(profile, textvariable=var, values=values, state="readonly", width=22)
+        menu.grid(row=row, column=column + 1, sticky=W, padx=(0, 15), pady=2)
+        return menu
+
+    combo(0, 0, "Source:", source_var, SOURCE_LIST)
+    combo(0, 2, "Target:", target_var, TARGET_LIST)
+    combo(1, 0, "Target type (if several):", target_type_var, AMBIGUOUS_TARGET_TYPES)
+    combo(1, 2, "Byte swap:", byteswap_var, BYTESWAP_OPTIONS)
+
+    Label(profile, text="Output folder:").grid(row=2, column=0, sticky=W, pady=2)
+    Entry(profile, textvariable=output_dir_var, width=40).grid(row=2, column=1, columnspan=2, sticky="we", pady=2)
+
+    def choose_output_dir():
+        folder = filedialog.askdirectory(parent=window, mustexist=False)
+        if folder:
+            output_dir_var.set(folder)
+
+    Button(profile, text="Choose…", command=choose_output_dir).grid(row=2, column=3, sticky=W, pady=2)
+    Checkbutton(profile, text="Overwrite existing files", variable=overwrite_var).grid(
+        row=3, column=1, columnspan=2, sticky=W)
+
+    # --------------------------
+    # Grouped view, recomputed once per change of queue or profile
+    # --------------------------
+    def refresh_groups():
+        tree.delete(*tree.get_children())
+        for save_type, paths in group_by_type(queue).items():
+            plan, reason = group_plan(source_var.get(), save_type, target_var.get(), target_type_var.get())
+            output = plan.key.split(" - ", 2)[-1].strip() if plan is not None else f"skipped: {reason}"
+            group = tree.insert("", "end", text=(save_type or "Unknown type").strip(), values=(len(paths), output), open=True)
+            for path in paths:
+                tree.insert(group, "end", iid=path, text=os.path.basename(path),
+                            values=("", os.path.dirname(path)))
+        if running["job"] is None:
+            status_var.set(f"{len(queue)} file(s) queued." if queue else "Add save files or a folder.")
+
+    updates = UpdateScheduler(window)
+    updates.add_node("groups", refresh_groups, inputs=[queue_var, source_var, target_var, target_type_var])
+
+    # --------------------------
+    # Progress and run
+    # --------------------------
+    footer = Frame(window)
+    footer.pack(fill=X, padx=10, pady=(5, 10))
+    progress_bar = ttk.Progressbar(footer, mode="determinate", maximum=1.0)
+    progress_bar.pack(fill=X)
+    Label(footer, textvariable=status_var, anchor=W).pack(fill=X, pady=(2, 5))
+
+    def on_progress(job):
+        if not window.winfo_exists():
+            return
+        progress_bar["value"] = job.progress
+        if job.stage:
+            rate = job.throughput / (1024 * 1024)
+            status_var.set(f"{job.progress * 100:.0f}%: {job.stage} ({rate:.1f} MB/s)")
+
+    def on_done(job):
+        running["job"] = None
+        if job.state not in (JOB_DONE, JOB_CANCELLED):
+            log(f"Batch failed: {job.error}", log_box=log_box, level="ERROR")
+        if not window.winfo_exists():
+            return  # closed while running: the other windows keep polling JOBS
+        convert_btn.config(state="normal")
+        cancel_btn.config(state="disabled")
+        if job.state == JOB_DONE:
+            summary = job.result
+            status_var.set(f"Done: {summary.converted} converted, {summary.failed} failed.")
+        elif job.state == JOB_CANCELLED:
+            status_var.set("Cancelled.")
+        else:
+            status_var.set(f"Failed: {job.error}")
+
+    def plan_for(path):
+        return group_plan(source_var.get(), detect_file_type(path), target_var.get(), target_type_var.get())
+
+    def start_batch():
+        if not queue:
+            status_var.set("The queue is empty.")
+            return
+        output_dir = output_dir_var.get()
+        if not output_dir:
+            output_dir = filedialog.askdirectory(parent=window, mustexist=False, title="Output folder")
+            if not output_dir:
+                return
+            output_dir_var.set(output_dir)
+
+        jobs, skipped = plan_jobs(queue.items(), plan_for, output_dir,
+                                  byteswap_option=byteswap_var.get(), overwrite=overwrite_var.get())
+        for path, reason in skipped:
+            log(f"Skipping {path}: {reason}.", log_box=log_box, level="WARN")
+        if not jobs:
+            status_var.set(f"Nothing to convert ({len(skipped)} skipped).")
+            return
+
+        progress_bar["value"] = 0
+        status_var.set(f"Converting {len(jobs)} file(s), {len(skipped)} skipped…")
+        convert_btn.config(state="disabled")
+        cancel_btn.config(state="normal")
+        running["job"] = JOBS.submit(
+            f"N64 batch ({len(jobs)} files)", convert_queue, jobs,
+            log_box=log_box, on_progress=on_progress, on_done=on_done
+        )
+
+    def cancel_batch():
+        if running["job"] is not None:
+            JOBS.cancel(running["job"].id)
+
+    cancel_btn = Button(footer, text="Cancel", command=cancel_batch, state="disabled")
+    cancel_btn.pack(side=RIGHT)
+    convert_btn = Button(footer, text="Convert Queue", width=20, command=start_batch)
+    convert_btn.pack(side=RIGHT, padx=5)
+
+    def on_destroy(event):
+        # Closing the window stops its batch; the files already written are kept
+        if event.widget is window:
+            cancel_batch()
+            if _windows.get(str(parent)) is window:
+                del _windows[str(parent)]
+
+    window.bind("<Destroy>", on_destroy, add="+")
+
+    updates.run("groups")
+    start_job_drain(window)
+    return window
@@ -1,8 +1,16 @@
 # systems/n64/gui/n64_callbacks.py
 
 import os
-from tkinter import filedialog
-from systems.n64.n64_conversion_core import convert_save
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from tkinter import filedialog, messagebox
+from core.exceptions import ConversionCancelled, ConversionError, InvalidInputError
+from core.file_utils import new_filename
+from core.history import record_conversion, RESULT_CANCELLED, RESULT_FAILED
+from core.jobs import JOBS, JOB_DONE, JOB_FAILED
+from core.profiling import profile_when_enabled
+from core.timing import StageTimer
+from systems.n64.n64_conversion_core import convert, record_stats, write_result
+from systems.n64.n64_conversion_plan import resolve_plan
 from core.logger import log
 from systems.n64.n64_constants import (
     EEP_EXT, SRA_EXT, FLA_EXT, MPK_EXT, SRM_EXT,
@@ -18,28 +26,194 @@ EXT_TO_LABEL = {
     SRM_EXT: SRM_LABEL
 }
 
+# Seconds between cancel checks while a job waits for the save dialog
+OUTPUT_PATH_POLL = 0.1
 
-def convert_save_n64(input_path, source_var, source_type_var,
-                     target_var, target_type_var, byteswap_var,
-                     trim_pad_var, log_box):
+
+# Stages of a GUI conversion job, for its progress fraction
+CONVERSION_STAGES = ("plan", "read", "resize", "swap", "dialog", "write")
+
+
+def _prepare(input_path, source_var, source_type_var, target_var, target_type_var, byteswap_var, log_box):
     """
-    Thin wrapper for GUI button. Pulls variables and passes to system convert.
-    Logs success if conversion completes without exceptions.
+    Tk-thread phase: read the GUI variables and resolve the plan (memoized,
+    so this is cheap). Returns (path, plan, byteswap option, plan seconds),
+    or None once the problem has been logged, recorded and shown.
     """
+    plan = None
+    path = input_path.get()
+    timer = StageTimer()
     try:
-        convert_save(
-            path=input_path.get(),
-            src=source_var.get(),
-            src_type=source_type_var.get(),
-            tgt=target_var.get(),
-            tgt_type=target_type_var.get(),
-            byteswap_option=byteswap_var.get(),
-            trim_pad_option=trim_pad_var.get(),
-            log_box=log_box
+        if not path or not os.path.exists(path):
+            log("Invalid input path.", log_box=log_box, level="ERROR")
+            raise InvalidInputError("Please select a valid input file.")
+        plan = resolve_plan(
+            source_var.get(), source_type_var.get(),
+            target_var.get(), target_type_var.get()
         )
-        log("Conversion completed successfully!", log_box=log_box, level="SUCCESS")
+    except ConversionError as e:
+        if not isinstance(e, InvalidInputError):
+            log(f"Conversion failed: {e}", log_box=log_box, level="ERROR")
+        record_conversion(path, plan=plan, result=RESULT_FAILED, error=e)
+        messagebox.showerror("Error", str(e))
+        return None
     except Exception as e:
         log(f"Conversion failed: {e}", log_box=log_box, level="ERROR")
+        record_conversion(path, plan=plan, result=RESULT_FAILED, error=e)
+        return None
+    return path, plan, byteswap_var.get(), timer.lap("plan")
+
+
+def _ask_output_path(path, plan):
+    """Save dialog for a conversion of path; returns the chosen path or None. Tk thread only."""
+    extension = plan.output_extension(path)
+    out_path = filedialog.asksaveasfilename(
+        initialfile=new_filename(os.path.basename(path), extension),
+        defaultextension=extension,
+        filetypes=[("N64 Save Files", f"*{extension}")]
+    )
+    return out_path or None
+
+
+def _await_output_path(out_path, job):
+    # A job keeps checking its cancel token while the dialog is open
+    if job is None:
+        return out_path.result()
+    while True:
+        try:
+            return out_path.result(timeout=OUTPUT_PATH_POLL)
+        except FutureTimeout:
+            job.token.check()
+
+
+@profile_when_enabled("convert_and_write_n64")
+def convert_and_write_n64(path, plan, byteswap_option, out_path, log_box=None, plan_seconds=0.0, job=None):
+    """
+    Worker phase of a GUI conversion: convert while the Tk thread asks for
+    the output path, then write once out_path (a concurrent.futures.Future
+    resolved with the chosen path, or None if the dialog was cancelled) is
+    ready. Every outcome is logged and appended to the history; failures
+    and cancellations are then re-raised for the caller to report, since
+    this never shows a dialog. Returns the written path.
+    """
+    timer = job.stage_timer() if job is not None else StageTimer()
+    timer.add("plan", plan_seconds)
+    try:
+        result = convert(
+            path, plan,
+            byteswap_option=byteswap_option,
+            log_box=log_box,
+            timer=timer
+        )
+        if job is not None:
+            job.report(nbytes=result.input_size)
+    except ConversionCancelled:
+        log("Conversion cancelled.", log_box=log_box, level="WARN")
+        record_conversion(path, plan=plan, result=RESULT_CANCELLED, timings=timer.stages)
+        raise
+    except Exception as e:
+        if not isinstance(e, InvalidInputError):
+            log(f"Conversion failed: {e}", log_box=log_box, level="ERROR")
+        record_conversion(path, plan=plan, result=RESULT_FAILED, error=e)
+        raise
+
+    history = {"input_size": result.input_size, "output_size": result.size,
+               "swap_size": result.swap_size, "timings": timer.stages}
+
+    with result:
+        # "dialog" is only the time spent waiting after the conversion finished
+        timer.restart()
+        try:
+            target = _await_output_path(out_path, job)
+            timer.lap("dialog")
+        except ConversionCancelled:
+            target = None  # the job was cancelled while the dialog was open
+        if not target:
+            log("Save operation cancelled by user.", log_box=log_box, level="WARN")
+            record_conversion(path, plan=plan, result=RESULT_CANCELLED, **history)
+            raise ConversionCancelled("Save operation cancelled by user.")
+
+        try:
+            write_result(result, target, log_box=log_box)
+        except ConversionError as e:
+            record_conversion(path, target, plan, result=RESULT_FAILED, error=e, **history)
+            raise
+
+    record_stats(result)
+    record_conversion(path, target, plan, **history)
+    log("Conversion completed successfully!", log_box=log_box, level="SUCCESS")
+    return target
+
+
+def _show_outcome(job):
+    # Runs on the Tk thread when the conversion job finishes
+    if job.state == JOB_DONE:
+        messagebox.showinfo("Success", f"File converted and saved as:\n{job.result}")
+    elif job.state == JOB_FAILED and isinstance(job.error, ConversionError):
+        messagebox.showerror("Error", str(job.error))
+
+
+def start_conversion_n64(input_path, source_var, source_type_var,
+                         target_var, target_type_var, byteswap_var,
+                         trim_pad_var, log_box, manager=JOBS):
+    """
+    Convert button handler; call on the Tk thread. The conversion is queued
+    on the job manager and runs while this thread shows the save dialog,
+    so choosing a filename overlaps the computation; the worker writes
+    once both are done. Dialogs only ever open on this thread.
+    Returns the Job, or None when the inputs are invalid.
+    """
+    prepared = _prepare(input_path, source_var, source_type_var,
+                        target_var, target_type_var, byteswap_var, log_box)
+    if prepared is None:
+        return None
+    path, plan, byteswap_option, plan_seconds = prepared
+
+    out_path = Future()
+    job = manager.submit(
+        os.path.basename(path), convert_and_write_n64, path, plan, byteswap_option, out_path,
+        log_box=log_box, plan_seconds=plan_seconds, stages=CONVERSION_STAGES, on_done=_show_outcome
+    )
+    try:
+        out_path.set_result(_ask_output_path(path, plan))
+    except BaseException:
+        out_path.set_result(None)
+        raise
+    return job
+
+
+@profile_when_enabled("convert_save_n64")
+def convert_save_n64(input_path, source_var, source_type_var,
+                     target_var, target_type_var, byteswap_var,
+                     trim_pad_var, log_box):
+    """
+    Synchronous conversion for callers without a job queue (benchmarks,
+    scripts): asks for the output path, then converts and writes on this
+    thread, reporting through dialogs. Call on the Tk thread.
+    Returns the written path, or None if cancelled/failed.
+    Every attempt is appended to the conversion history.
+    """
+    prepared = _prepare(input_path, source_var, source_type_var,
+                        target_var, target_type_var, byteswap_var, log_box)
+    if prepared is None:
+        return None
+    path, plan, byteswap_option, plan_seconds = prepared
+
+    out_path = Future()
+    out_path.set_result(_ask_output_path(path, plan))
+    try:
+        written = convert_and_write_n64(path, plan, byteswap_option, out_path,
+                                        log_box=log_box, plan_seconds=plan_seconds)
+    except ConversionCancelled:
+        return None
+    except ConversionError as e:
+        messagebox.showerror("Error", str(e))
+        return None
+    except Exception:
+        return None
+
+    messagebox.showinfo("Success", f"File converted and saved as:\n{written}")
+    return written
 
 
 def browse_file(filetypes, path_var, type_var):
@@ -2,12 +2,14 @@
 
 def setup_target_type_trace(
     source_var, source_type_var, target_var, target_type_var, target_type_menu,
-    determine_valid_target_types, input_path_var=None, convert_button=None
+    determine_valid_target_types, input_path_var=None, convert_button=None, scheduler=None
 ):
     """
     Updates target_type_menu based on current source and target selections.
     Auto-selects first valid target type for all sources except RetroArch SRM files.
     Optionally disables convert_button until a valid selection is made.
+    With an UpdateScheduler the update runs as its "target_types" node
+    (once per idle cycle) instead of from a trace on every write.
     """
     def update_target_type_menu(*args):
         valid_output_types = determine_valid_target_types(
@@ -34,12 +36,16 @@ def setup_target_type_trace(
             else:
                 convert_button.config(state="disabled")
 
-    # Attach trace callbacks
-    source_var.trace_add("write", update_target_type_menu)
-    source_type_var.trace_add("write", update_target_type_menu)
-    target_var.trace_add("write", update_target_type_menu)
+    inputs = [source_var, source_type_var, target_var]
     if input_path_var:
-        input_path_var.trace_add("write", update_target_type_menu)
+        inputs.append(input_path_var)
+
+    if scheduler is not None:
+        scheduler.add_node("target_types", update_target_type_menu, inputs=inputs, outputs=[target_type_var])
+    else:
+        # Attach trace callbacks
+        for var in inputs:
+            var.trace_add("write", update_target_type_menu)
 
     # Initial call
     update_target_type_menu()
@@ -58,10 +64,12 @@ def evaluate_byteswap_default(input_path_var, byteswap_var):
         byteswap_var.set("Default")
 
 
-def setup_byteswap_trace(source_type_var, target_type_var, byteswap_var, byteswap_menu, is_byteswap_allowed, input_path_var=None):
+def setup_byteswap_trace(source_type_var, target_type_var, byteswap_var, byteswap_menu, is_byteswap_allowed,
+                         input_path_var=None, scheduler=None):
     """
     Enables/disables byte swap options based on source type.
     Sets initial default based on system-specific logic if input_path_var is provided.
+    With an UpdateScheduler the update runs as its "byteswap" node.
     """
     def update_byteswap_menu(*args):
         if is_byteswap_allowed(source_type_var.get()):
@@ -80,7 +88,12 @@ def setup_byteswap_trace(source_type_var, target_type_var, byteswap_var, byteswa
     else:
         byteswap_var.set("Default")
 
-    source_type_var.trace_add("write", update_byteswap_menu)
-    target_type_var.trace_add("write", update_byteswap_menu)
+    inputs = [source_type_var, target_type_var]
     if input_path_var:
-        input_path_var.trace_add("write", update_byteswap_menu)
\ No newline at end of file
+        inputs.append(input_path_var)
+
+    if scheduler is not None:
+        scheduler.add_node("byteswap", update_byteswap_menu, inputs=inputs, outputs=[byteswap_var])
+    else:
+        for var in inputs:
+            var.trace_add("write", update_byteswap_menu)
\ No newline at end of file
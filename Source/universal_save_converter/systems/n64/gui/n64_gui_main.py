@@ -1,7 +1,6 @@
 # systems/n64/gui/n64_gui_main.py
 
 import os
-import threading
 from tkinter import PhotoImage, Label, Button, Frame, Text, Scrollbar, LEFT, RIGHT, BOTH, Y
 from tkinter import ttk
 
@@ -10,10 +9,13 @@ from systems.n64.n64_constants import SOURCE_LIST, TARGET_LIST
 
 # --- Utilities ---
 from core.gui_logger import set_log_widget
-from core.theme_utils import apply_theme, start_polling
+from core.log_view import GUI_LOG_MAX_LINES
+from core.theme_utils import start_polling
 from systems.n64.n64_utils import determine_valid_target_types, is_byteswap_allowed
 from systems.n64.gui import n64_gui_vars as gui_vars
-from gui.gui_utils import GUIResetManager
+from gui.gui_utils import GUIResetManager, UpdateScheduler
+from gui.config_manager import ConfigManager
+from gui.jobs_panel import create_jobs_panel
 
 # --- Callbacks ---
 from systems.n64.gui import n64_callbacks
@@ -39,7 +41,13 @@ VERTICAL_OFFSET = 35
 def setup_n64_gui(parent):
     """Set up the N64 GUI inside the given parent frame or Tk instance."""
     gui_vars.init_vars(parent)
-    log_visible = True
+    config = ConfigManager()
+    log_visible = config.get_log_visible()
+
+    # Derived widget state is recomputed once per idle cycle, in dependency order
+    updates = UpdateScheduler(parent)
+    for name in ("input_path", "source_type_var", "source_var", "target_var", "target_type_var"):
+        updates.name_input(getattr(gui_vars, name), name)
 
     # Disable resizing
     parent.resizable(False, False)
@@ -56,7 +64,7 @@ def setup_n64_gui(parent):
         parent.geometry(f"{width}x{height}+{x}+{y}")
         return x, y
 
-    center_window(EXPANDED_WIDTH, HEIGHT)
+    center_window(EXPANDED_WIDTH if log_visible else BASE_WIDTH, HEIGHT)
 
     # --------------------------
     # Load N64 Logo
@@ -89,10 +97,10 @@ def setup_n64_gui(parent):
         n64_callbacks.browse_file
     )
 
-    def scroll_to_end(*args):
-        parent.after_idle(lambda: directory_entry.xview_moveto(1))
+    def scroll_to_end():
+        directory_entry.xview_moveto(1)
 
-    gui_vars.input_path.trace_add("write", scroll_to_end)
+    updates.add_node("scroll_to_end", scroll_to_end, inputs=[gui_vars.input_path])
     directory_entry.bind("<KeyRelease>", lambda e: directory_entry.xview_moveto(1))
     directory_entry.bind("<<Paste>>", lambda e: parent.after_idle(lambda: directory_entry.xview_moveto(1)))
 
@@ -101,22 +109,35 @@ def setup_n64_gui(parent):
     # --------------------------
     log_frame = Frame(parent)
     log_frame.grid(row=0, column=3, rowspan=9, sticky="nsew", padx=5, pady=5)
+    if not log_visible:
+        log_frame.grid_remove()
     parent.grid_columnconfigure(3, weight=1)
 
-    log_label = Label(log_frame, text="Conversion Log:")
-    log_label.pack(anchor="w", padx=5, pady=(5, 0))
+    log_header = Frame(log_frame)
+    log_header.pack(fill="x", padx=5, pady=(5, 0))
+
+    log_label = Label(log_header, text="Conversion Log:")
+    log_label.pack(side=LEFT)
 
     log_text_frame = Frame(log_frame, height=200)
     log_text_frame.pack(fill=BOTH, expand=False, padx=5, pady=5)
 
-    log_box = Text(log_text_frame, height=25, width=50, wrap="word")
+    log_box = Text(log_text_frame, height=19, width=50, wrap="word")
     log_box.pack(side=LEFT, fill=BOTH, expand=True)
 
     scrollbar = Scrollbar(log_text_frame, command=log_box.yview)
     scrollbar.pack(side=RIGHT, fill=Y)
     log_box.config(yscrollcommand=scrollbar.set)
 
-    set_log_widget(log_box)
+    log_view = set_log_widget(log_box, max_lines=config.get_log_max_lines(GUI_LOG_MAX_LINES))
+
+    # Earlier records stay in the log file; page them back in on demand
+    load_older_btn = Button(log_header, text="Load older", command=log_view.load_older)
+    load_older_btn.pack(side=RIGHT)
+
+    # Queued and running conversions
+    jobs_panel = create_jobs_panel(log_frame)
+    jobs_panel.pack(fill=BOTH, expand=False, padx=5, pady=(0, 5))
 
     # --------------------------
     # Toggle Log Visibility
@@ -131,6 +152,7 @@ def setup_n64_gui(parent):
             log_frame.grid()
             center_window(EXPANDED_WIDTH, HEIGHT)
             log_visible = True
+        config.set_log_visible(log_visible)
 
     toggle_btn = Button(parent, text="Show/Hide Log", command=toggle_log_window)
     toggle_btn.grid(row=7, column=0, pady=15, padx=5)
@@ -158,23 +180,32 @@ def setup_n64_gui(parent):
     gui_vars.byteswap_var.set("default")
 
     # --------------------------
-    # Start Conversion (Threaded)
+    # Batch Queue (many files, one output folder)
+    # --------------------------
+    def open_batch_queue():
+        # Imported on first use; most sessions convert single files
+        from systems.n64.gui.n64_batch_gui import open_batch_window
+        open_batch_window(parent, log_box=log_box,
+                          source=gui_vars.source_var.get(), target=gui_vars.target_var.get())
+
+    batch_btn = Button(parent, text="Batch…", command=open_batch_queue)
+    batch_btn.grid(row=6, column=2, padx=10, pady=5)
+
+    # --------------------------
+    # Start Conversion (Job Queue)
     # --------------------------
     def start_conversion():
-        threading.Thread(
-            target=n64_callbacks.convert_save_n64,
-            kwargs={
-                "input_path": gui_vars.input_path,
-                "source_var": gui_vars.source_var,
-                "source_type_var": gui_vars.source_type_var,
-                "target_var": gui_vars.target_var,
-                "target_type_var": gui_vars.target_type_var,
-                "byteswap_var": gui_vars.byteswap_var,
-                "trim_pad_var": gui_vars.trim_pad_var,
-                "log_box": log_box
-            },
-            daemon=True
-        ).start()
+        # Converts on the job queue while the save dialog is open here
+        n64_callbacks.start_conversion_n64(
+            input_path=gui_vars.input_path,
+            source_var=gui_vars.source_var,
+            source_type_var=gui_vars.source_type_var,
+            target_var=gui_vars.target_var,
+            target_type_var=gui_vars.target_type_var,
+            byteswap_var=gui_vars.byteswap_var,
+            trim_pad_var=gui_vars.trim_pad_var,
+            log_box=log_box
+        )
 
     convert_btn = Button(parent, text="Convert", width=20, command=start_conversion, state="disabled")
     convert_btn.grid(row=7, column=1, pady=15)
@@ -188,9 +219,11 @@ def setup_n64_gui(parent):
         else:
             convert_btn.config(state="disabled")
 
-    gui_vars.source_var.trace_add("write", update_convert_button)
-    gui_vars.target_var.trace_add("write", update_convert_button)
-    gui_vars.target_type_var.trace_add("write", update_convert_button)
+    updates.add_node(
+        "convert_button",
+        update_convert_button,
+        inputs=[gui_vars.source_var, gui_vars.target_var, gui_vars.target_type_var]
+    )
 
     # --------------------------
     # GUI Reset Manager
@@ -198,7 +231,7 @@ def setup_n64_gui(parent):
     def reset_byteswap(_):
         evaluate_byteswap_default(gui_vars.input_path, gui_vars.byteswap_var)
 
-    reset_manager = GUIResetManager()
+    reset_manager = GUIResetManager(updates)
     reset_manager.add_dependency(
         gui_vars.input_path,
         [
@@ -208,7 +241,8 @@ def setup_n64_gui(parent):
             gui_vars.byteswap_var,
             gui_vars.trim_pad_var
         ],
-        custom_resets={id(gui_vars.byteswap_var): reset_byteswap}
+        custom_resets={id(gui_vars.byteswap_var): reset_byteswap},
+        name="reset"
     )
 
     # --------------------------
@@ -222,7 +256,8 @@ def setup_n64_gui(parent):
         target_type_menu,
         determine_valid_target_types,
         input_path_var=gui_vars.input_path,
-        convert_button=convert_btn
+        convert_button=convert_btn,
+        scheduler=updates
     )
 
     setup_byteswap_trace(
@@ -231,21 +266,28 @@ def setup_n64_gui(parent):
         gui_vars.byteswap_var,
         byteswap_menu,
         is_byteswap_allowed,
-        input_path_var=gui_vars.input_path
+        input_path_var=gui_vars.input_path,
+        scheduler=updates
     )
 
     # --------------------------
     # Auto-select RetroArch as source for SRM files
+    # (after the reset has cleared the previous source)
     # --------------------------
-    def auto_select_retroarch(*args):
+    def auto_select_retroarch():
         path = gui_vars.input_path.get()
         if path.lower().endswith(".srm"):
-            parent.after_idle(lambda: gui_vars.source_var.set("RetroArch"))
-
-    gui_vars.input_path.trace_add("write", auto_select_retroarch)
+            gui_vars.source_var.set("RetroArch")
+
+    updates.add_node(
+        "auto_select_retroarch",
+        auto_select_retroarch,
+        inputs=[gui_vars.input_path],
+        outputs=[gui_vars.source_var],
+        after=["reset"]
+    )
 
     # --------------------------
     # Apply Theme and Start Polling
     # --------------------------
-    apply_theme(parent)
     start_polling(parent)
\ No newline at end of file
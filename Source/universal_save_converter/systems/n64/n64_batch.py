@@ -0,0 +1,245 @@
+# systems/n64/n64_batch.py
+#
+# Batch conversion over a process pool. Workers only import the headless
+# core, so they start quickly and never touch tkinter.
+
+import glob
+import os
+import time
+from functools import partial
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from core.exceptions import ConversionError
+from core.file_utils import MMAP_THRESHOLD, detect_file_type, new_filename
+from core.history import record_conversion, RESULT_FAILED, RESULT_OK
+from core.timing import STATS, StageTimer
+from .n64_constants import LABEL_TO_EXT
+from .n64_conversion_core import convert, convert_file, write_result
+from .n64_conversion_plan import ConversionPlan
+
+SAVE_EXTS = tuple(LABEL_TO_EXT.values())
+
+
+class BatchJob(NamedTuple):
+    """One file to convert. Plans are immutable and pickle by value."""
+    input_path: str
+    output_path: str
+    plan: ConversionPlan
+    byteswap_option: str = "Default"
+    overwrite: bool = False
+
+
+class BatchResult(NamedTuple):
+    input_path: str
+    output_path: str
+    bytes_in: int
+    bytes_out: int
+    error: Optional[str] = None
+    swap_size: int = 1
+    elapsed: float = 0.0
+    timings: Optional[dict] = None
+    worker: int = 0
+    started: float = 0.0
+    spans: Optional[list] = None
+
+
+class BatchSummary(NamedTuple):
+    results: List[BatchResult]
+    elapsed: float
+    started: float = 0.0
+
+    @property
+    def converted(self) -> int:
+        return sum(1 for r in self.results if r.error is None)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.converted
+
+    @property
+    def bytes_in(self) -> int:
+        return sum(r.bytes_in for r in self.results if r.error is None)
+
+    @property
+    def files_per_second(self) -> float:
+        return self.converted / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_in / (1024 * 1024) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def expand_inputs(patterns, recursive=False):
+    """
+    Expand files, directories and glob patterns into (path, root) pairs.
+    root is the directory an input was found under (None for plain files).
+    Plain paths are passed through even when missing, so plan_jobs()
+    reports them instead of the batch dropping them silently.
+    """
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            walker = os.walk(pattern) if recursive else [(pattern, [], os.listdir(pattern))]
+            for dir_path, _, names in walker:
+                for name in sorted(names):
+                    path = os.path.join(dir_path, name)
+                    if name.lower().endswith(SAVE_EXTS) and os.path.isfile(path) and path not in seen:
+                        seen.add(path)
+                        yield path, pattern
+            continue
+
+        if not glob.has_magic(pattern):
+            if pattern not in seen:
+                seen.add(pattern)
+                yield pattern, None
+            continue
+
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if os.path.isfile(path) and path not in seen:
+                seen.add(path)
+                yield path, None
+
+
+def group_by_type(paths: Iterable[str]) -> dict:
+    """Paths grouped by detected save type label (None when unknown), in first-seen order."""
+    groups = {}
+    for path in paths:
+        groups.setdefault(detect_file_type(path), []).append(path)
+    return groups
+
+
+def output_path_for(input_path: str, plan: ConversionPlan, output_dir: Optional[str] = None,
+                    prefix: str = "Converted_", relative_to: Optional[str] = None) -> str:
+    """
+    Deterministic output path for a batch input (no timestamp).
+    relative_to keeps an input directory's sub-folder layout under output_dir.
+    """
+    name = new_filename(os.path.basename(input_path), plan.output_extension(input_path),
+                        prefix=prefix, timestamp=False)
+    if output_dir is None:
+        return os.path.join(os.path.dirname(input_path), name)
+    if relative_to:
+        sub_dir = os.path.dirname(os.path.relpath(input_path, relative_to))
+        return os.path.join(output_dir, sub_dir, name)
+    return os.path.join(output_dir, name)
+
+
+def plan_jobs(inputs, plan_for: Callable, output_dir: Optional[str] = None, prefix: str = "Converted_",
+              byteswap_option: str = "Default", overwrite: bool = False):
+    """
+    BatchJobs for (path, root) pairs from expand_inputs(). plan_for(path)
+    returns (plan, None), or (None, reason) to skip the file. Outputs are
+    named deterministically; inputs that are missing, would overwrite
+    themselves or clash with an earlier output are skipped.
+    Returns (jobs, skipped) where skipped holds (path, reason) pairs.
+    """
+    jobs, outputs, skipped = [], {}, []
+    for path, root in inputs:
+        if not os.path.isfile(path):
+            skipped.append((path, "not a file" if os.path.exists(path) else "file not found"))
+            continue
+        plan, reason = plan_for(path)
+        if plan is None:
+            skipped.append((path, reason))
+            continue
+
+        out_path = output_path_for(path, plan, output_dir, prefix=prefix, relative_to=root)
+        if os.path.abspath(out_path) == os.path.abspath(path):
+            skipped.append((path, "output would overwrite the input"))
+            continue
+        if out_path in outputs:
+            skipped.append((path, f"output name clashes with {outputs[out_path]}"))
+            continue
+        outputs[out_path] = path
+        jobs.append(BatchJob(path, out_path, plan, byteswap_option, overwrite))
+    return jobs, skipped
+
+
+def convert_job(job: BatchJob, trace: bool = False) -> BatchResult:
+    """
+    Convert and write one file. Runs inside a worker process.
+    trace keeps epoch-time stage spans for a trace-event timeline.
+    """
+    started = time.time()
+    start = time.perf_counter()
+    timer = StageTimer(trace=trace)
+    try:
+        if not job.overwrite and os.path.exists(job.output_path):
+            raise ConversionError(f"Output exists (use --overwrite): {job.output_path}")
+        out_dir = os.path.dirname(job.output_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        bytes_in = os.path.getsize(job.input_path)
+        if bytes_in >= MMAP_THRESHOLD:
+            # Large images go file-to-file through mmap instead of three in-memory copies
+            result = convert_file(job.input_path, job.output_path, job.plan, job.byteswap_option,
+                                  quiet=True, timer=timer)
+        else:
+            with convert(job.input_path, job.plan, job.byteswap_option, quiet=True, timer=timer) as result:
+                write_result(result, job.output_path, quiet=True)
+        # Stage timings travel back to the parent, which owns the statistics
+        return BatchResult(job.input_path, job.output_path, bytes_in, result.size,
+                           swap_size=result.swap_size, elapsed=time.perf_counter() - start,
+                           timings=timer.stages, worker=os.getpid(), started=started,
+                           spans=timer.wall_spans() if trace else None)
+    except (ConversionError, OSError) as e:
+        return BatchResult(job.input_path, job.output_path, 0, 0, str(e),
+                           elapsed=time.perf_counter() - start, worker=os.getpid(), started=started,
+                           spans=timer.wall_spans() if trace else None)
+
+
+def record_batch_result(job: BatchJob, result: BatchResult, origin: str = "batch") -> dict:
+    """Append one batch file's outcome to the conversion history."""
+    return record_conversion(
+        result.input_path, result.output_path, job.plan,
+        input_size=result.bytes_in if not result.error else None,
+        output_size=result.bytes_out if not result.error else None,
+        swap_size=result.swap_size if not result.error else None,
+        timings=result.timings or {"total": result.elapsed}, origin=origin,
+        result=RESULT_FAILED if result.error else RESULT_OK, error=result.error
+    )
+
+
+def run_batch(jobs: Iterable[BatchJob], max_workers: Optional[int] = None,
+              trace: bool = False, progress: Optional[Callable] = None) -> BatchSummary:
+    """
+    Convert every job, fanning out over a process pool sized to the CPU count.
+    A single worker runs in-process, skipping pool start-up entirely.
+    Stage timings of converted files are added to core.timing.STATS;
+    trace collects stage spans for core.trace.write_trace().
+    progress(job, result) is called in this process as each file finishes,
+    in job order; an exception from it stops the batch (files not yet
+    started are dropped) and propagates.
+    """
+    jobs = list(jobs)
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs) or 1))
+    started = time.time()
+    start = time.perf_counter()
+    job_func = partial(convert_job, trace=True) if trace else convert_job
+
+    results = []
+    if workers == 1:
+        for job in jobs:
+            results.append(job_func(job))
+            if progress is not None:
+                progress(job, results[-1])
+    else:
+        # Imported here: the pool machinery (multiprocessing, pickle) is only needed with >1 worker
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(jobs) // (workers * 4))
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            for job, result in zip(jobs, pool.map(job_func, jobs, chunksize=chunksize)):
+                results.append(result)
+                if progress is not None:
+                    progress(job, result)
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown(wait=True)
+
+    for job, result in zip(jobs, results):
+        if result.timings:
+            STATS.record(job.plan.key, result.timings, result.bytes_in)
+    return BatchSummary(results, time.perf_counter() - start, started)
@@ -1,6 +1,7 @@
 # systems/n64/n64_constants.py
 
-from typing import List
+from enum import IntEnum
+from typing import Dict, List
 
 # File Extensions
 EEP_EXT: str = ".eep"
@@ -38,3 +39,45 @@ WII_LABEL: str = " Wii/WiiU/Everdrive64 "
 FILE_TYPES: List[str] = [EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL]
 SOURCE_LIST: List[str] = [NATIVE_LABEL, PJ64_LABEL, RA_LABEL, WII_LABEL]
 TARGET_LIST: List[str] = [NATIVE_LABEL, PJ64_LABEL, RA_LABEL, WII_LABEL]
+
+
+# Compact identifiers used to index compiled conversion plans
+class N64System(IntEnum):
+    NATIVE = 0
+    PJ64 = 1
+    RA = 2
+    WII = 3
+
+
+class N64SaveType(IntEnum):
+    EEP = 0
+    SRA = 1
+    FLA = 2
+    MPK = 3
+    SRM = 4
+
+
+SYSTEM_LABELS: Dict[N64System, str] = {
+    N64System.NATIVE: NATIVE_LABEL,
+    N64System.PJ64: PJ64_LABEL,
+    N64System.RA: RA_LABEL,
+    N64System.WII: WII_LABEL,
+}
+SAVE_TYPE_LABELS: Dict[N64SaveType, str] = {
+    N64SaveType.EEP: EEP_LABEL,
+    N64SaveType.SRA: SRA_LABEL,
+    N64SaveType.FLA: FLA_LABEL,
+    N64SaveType.MPK: MPK_LABEL,
+    N64SaveType.SRM: SRM_LABEL,
+}
+LABEL_TO_SYSTEM: Dict[str, N64System] = {label: system for system, label in SYSTEM_LABELS.items()}
+LABEL_TO_SAVE_TYPE: Dict[str, N64SaveType] = {label: save_type for save_type, label in SAVE_TYPE_LABELS.items()}
+
+# Output extension for each file type label
+LABEL_TO_EXT: Dict[str, str] = {
+    EEP_LABEL: EEP_EXT,
+    SRA_LABEL: SRA_EXT,
+    FLA_LABEL: FLA_EXT,
+    MPK_LABEL: MPK_EXT,
+    SRM_LABEL: SRM_EXT,
+}
@@ -1,127 +1,293 @@
+# systems/n64/n64_conversion_core.py
+#
+# Headless N64 conversion. Nothing here may import tkinter: the GUI shows
+# dialogs in systems/n64/gui/n64_callbacks.py, scripts and worker processes
+# call convert()/convert_save() directly and handle the typed exceptions.
+
 import os
-from tkinter import filedialog, messagebox
-from core.file_utils import read_bytes, write_bytes, resize_bytes, new_filename
-from core.swap_utils import byteswap, determine_swap_size
-from core.logger import log
-from .n64_conversion_table import conversion_table
-from .n64_constants import *
-
-def convert_save(path, src, src_type, tgt, tgt_type, byteswap_option, trim_pad_option, log_box=None):
+from core.buffer_pool import BUFFER_POOL
+from core.exceptions import InvalidInputError, SaveReadError, SaveWriteError
+from core.file_utils import (
+    read_bytes_into, write_bytes, resize_bytes, place_bytes, new_filename, map_input, map_output
+)
+from core.stream_utils import STREAM_CHUNK_SIZE, stream_convert
+from core.swap_utils import byteswap_inplace, determine_swap_size
+from core.logger import log as _log
+from core.profiling import profile_when_enabled
+from core.timing import STATS, StageTimer
+from .n64_conversion_plan import ConversionPlan, resolve_plan
+
+
+class ConversionResult:
     """
-    System-specific N64 save conversion.
-    Returns path of saved file or None if cancelled/failed.
+    Converted save data plus everything needed to name and write it.
+    data is None when the conversion was written straight to disk (convert_file).
+    When data was borrowed from a BufferPool, release() hands it back; use the
+    result as a context manager to do that automatically.
+    timings is the StageTimer holding how long each stage took so far.
     """
-    if not path or not os.path.exists(path):
-        log("Invalid input path.", log_box=log_box, level="ERROR")
-        messagebox.showerror("Error", "Please select a valid input file.")
-        return None
+    __slots__ = ("data", "size", "input_size", "plan", "swap_size", "extension", "source_path",
+                 "output_path", "pool", "timings")
 
-    key = f"{src}-{src_type}-{tgt}-{tgt_type}"
-    log(f"Starting conversion: {path}", log_box=log_box, level="INFO")
+    def __init__(self, data, plan, swap_size, extension, source_path=None, output_path=None,
+                 size=None, pool=None, input_size=None, timings=None):
+        self.data = data
+        self.pool = pool
+        self.size = len(data) if size is None else size
+        self.input_size = input_size
+        self.timings = timings if timings is not None else StageTimer()
+        self.plan = plan
+        self.swap_size = swap_size
+        self.extension = extension
+        self.source_path = source_path
+        self.output_path = output_path
 
-    data = read_bytes(path)
-    if not data:
-        log("Error reading input file.", log_box=log_box, level="ERROR")
-        return None
-
-    # Default conversion parameters
-    tgt_size = len(data)
-    offset = 0
-    swap_required = False
-    extension = os.path.splitext(path)[1]
-
-    # --- Conversion table lookup ---
-    conv = conversion_table.get(key)
-    if conv:
-        src_size, tgt_size, offset, swap_required, extension = conv
-        log(f"Using conversion table entry: {key}", log_box=log_box, level="CONVERSION")
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def release(self) -> None:
+        """Return pooled data to its pool. data is unusable afterwards."""
+        if self.pool is not None and self.data is not None:
+            self.pool.release(self.data)
+        self.data = None
+        self.pool = None
+
+    def suggested_filename(self, prefix: str = "Converted_", timestamp: bool = True) -> str:
+        """Default output filename, derived from the input file name."""
+        name = os.path.basename(self.source_path) if self.source_path else "save"
+        return new_filename(name, self.extension, prefix=prefix, timestamp=timestamp)
+
+
+class _NoPool:
+    """Allocator used when a caller opts out of buffer pooling."""
+
+    @staticmethod
+    def acquire(size: int) -> bytearray:
+        return bytearray(size)
+
+
+_NO_POOL = _NoPool()
+
+
+def _discard(message, *, level="INFO", log_box=None):
+    """Stand-in for log() when a caller asks for quiet conversions."""
+
+
+def _log_plan(plan, log, log_box):
+    if plan.matched:
+        log(f"Using conversion table entry: {plan.key}", log_box=log_box, level="CONVERSION")
     else:
         log("No matching conversion found; using raw copy.", log_box=log_box, level="WARN")
-
-    # Native target adjustments
-    if tgt == NATIVE_LABEL:
-        tgt_size = len(data)
-        offset = 0
-        swap_required = False
-        extension = os.path.splitext(path)[1]
+    if plan.native:
         log("Target is Native — using direct copy.", log_box=log_box, level="CONVERSION")
 
-    # SRM-specific offsets
-    if src_type == SRA_LABEL and tgt_type == SRM_LABEL:
-        tgt_size = SIZE_SRM
-        offset = SIZE_SRA_SRM_OFFSET
-        swap_required = True
-        extension = SRM_EXT
-    elif src_type == FLA_LABEL and tgt_type == SRM_LABEL:
-        tgt_size = SIZE_SRM
-        offset = SIZE_FLA_SRM_OFFSET
-        swap_required = True
-        extension = SRM_EXT
-    elif src_type == MPK_LABEL and tgt_type == SRM_LABEL:
-        tgt_size = SIZE_SRM
-        offset = SIZE_MPK_SRM_OFFSET
-        swap_required = False
-        extension = SRM_EXT
-    elif src_type == SRM_LABEL:
-        if tgt_type == SRA_LABEL:
-            tgt_size = SIZE_SRA
-            offset = -SIZE_SRA_SRM_OFFSET
-            swap_required = True
-            extension = SRA_EXT
-        elif tgt_type == FLA_LABEL:
-            tgt_size = SIZE_FLA
-            offset = -SIZE_FLA_SRM_OFFSET
-            swap_required = True
-            extension = FLA_EXT
-        elif tgt_type == MPK_LABEL:
-            tgt_size = SIZE_MPK
-            offset = -SIZE_MPK_SRM_OFFSET
-            swap_required = False
-            extension = MPK_EXT
-        elif tgt_type == EEP_LABEL:
-            tgt_size = SIZE_EEP
-            offset = 0
-            swap_required = False
-            extension = EEP_EXT
-    elif src_type == EEP_LABEL and tgt_type == SRM_LABEL:
-        tgt_size = SIZE_SRM
-        offset = 0
-        swap_required = False
-        extension = SRM_EXT
-
-    log(f"Resizing data to {tgt_size} bytes (offset {offset})", log_box=log_box, level="CONVERSION")
-    data = resize_bytes(data, tgt_size, offset)
-
-    # --- Byte swap ---
-    swap_size = determine_swap_size(swap_required_from_table=swap_required,
+
+def _swap_size(plan, byteswap_option, log, log_box) -> int:
+    swap_size = determine_swap_size(swap_required_from_table=plan.swap_required,
                                     user_choice=byteswap_option)
     if swap_size > 1:
         log(f"Applying {swap_size}-byte swap...", log_box=log_box, level="CONVERSION")
-        data = byteswap(data, swap_size)
     else:
         log("No byte swap applied.", log_box=log_box, level="CONVERSION")
+    return swap_size
 
-    # --- Determine output extension ---
-    ext_map = {EEP_LABEL: EEP_EXT, SRA_LABEL: SRA_EXT, FLA_LABEL: FLA_EXT,
-               MPK_LABEL: MPK_EXT, SRM_LABEL: SRM_EXT}
-    out_ext = ext_map.get(tgt_type, extension)
-    new_name = new_filename(os.path.basename(path), out_ext)
-
-    # --- Save file dialog ---
-    out_path = filedialog.asksaveasfilename(
-        initialfile=new_name,
-        defaultextension=out_ext,
-        filetypes=[("N64 Save Files", f"*{out_ext}")]
-    )
-    if not out_path:
-        log("Save operation cancelled by user.", log_box=log_box, level="WARN")
-        return None
-
-    if write_bytes(data, out_path):
-        log(f"File written successfully → {out_path}", log_box=log_box, level="SUCCESS")
-        messagebox.showinfo("Success", f"File converted and saved as:\n{out_path}")
-        return out_path
-    else:
+
+def convert(source, plan: ConversionPlan, byteswap_option: str = "Default",
+            log_box=None, quiet: bool = False, pool=BUFFER_POOL, timer=None) -> ConversionResult:
+    """
+    Convert one save according to plan.
+
+    source is a file path or a bytes-like object holding the save.
+    quiet skips per-step logging (batch workers log a summary instead).
+    Input and output buffers come from pool (None allocates fresh ones);
+    call release() on the result once it has been written.
+    timer continues a caller's StageTimer (e.g. one that already timed the plan lookup).
+    Raises InvalidInputError or SaveReadError; never shows a dialog.
+    """
+    log = _discard if quiet else _log
+    timer = timer or StageTimer()
+    timer.restart()
+    allocator = pool or _NO_POOL
+    path = None
+    borrowed = out = None
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if not path or not os.path.exists(path):
+            log("Invalid input path.", log_box=log_box, level="ERROR")
+            raise InvalidInputError("Please select a valid input file.")
+        log(f"Starting conversion: {path}", log_box=log_box, level="INFO")
+
+    # Every lap may raise (a job's on_lap cancels between stages), so the
+    # pooled buffers go back to the pool on any exception from here on.
+    try:
+        if path is not None:
+            data = borrowed = read_bytes_into(path, allocator)
+            timer.lap("read")
+        else:
+            data = source
+
+        if not data:
+            log("Error reading input file.", log_box=log_box, level="ERROR")
+            raise SaveReadError(f"Input is empty: {path or '<bytes>'}")
+
+        _log_plan(plan, log, log_box)
+
+        input_size = len(data)
+        tgt_size = plan.output_size(input_size)
+        log(f"Resizing data to {tgt_size} bytes (offset {plan.offset})", log_box=log_box, level="CONVERSION")
+        out = allocator.acquire(tgt_size)
+        resize_bytes(memoryview(data), tgt_size, plan.offset, out=out)
+        timer.lap("resize")
+        if borrowed is not None and pool is not None:
+            # The input is no longer needed; hand it back before swapping
+            pool.release(borrowed)
+        borrowed = None
+
+        # --- Byte swap ---
+        swap_size = _swap_size(plan, byteswap_option, log, log_box)
+        timer.restart()
+        byteswap_inplace(out, swap_size)
+        timer.lap("swap")
+    except BaseException:
+        if out is not None and pool is not None:
+            pool.release(out)
+        raise
+    finally:
+        if borrowed is not None and pool is not None:
+            pool.release(borrowed)
+
+    extension = plan.output_extension(path or "")
+    return ConversionResult(out, plan, swap_size, extension, source_path=path, pool=pool,
+                            input_size=input_size, timings=timer)
+
+
+def convert_file(in_path: str, out_path: str, plan: ConversionPlan, byteswap_option: str = "Default",
+                 log_box=None, quiet: bool = False, timer=None) -> ConversionResult:
+    """
+    Convert in_path straight into out_path through memory-mapped files.
+
+    The input window is placed into the preallocated output mapping and
+    swapped there in place, so peak memory stays at about one image
+    however large the save or memory-card file is.
+    """
+    log = _discard if quiet else _log
+    if not in_path or not os.path.exists(in_path):
+        log("Invalid input path.", log_box=log_box, level="ERROR")
+        raise InvalidInputError("Please select a valid input file.")
+    if os.path.exists(out_path) and os.path.samefile(in_path, out_path):
+        raise InvalidInputError(f"Output would overwrite the input: {out_path}")
+
+    log(f"Starting conversion: {in_path}", log_box=log_box, level="INFO")
+    timer = timer or StageTimer()
+    timer.restart()
+    with map_input(in_path) as src:
+        if not len(src):
+            log("Error reading input file.", log_box=log_box, level="ERROR")
+            raise SaveReadError(f"Input is empty: {in_path}")
+
+        _log_plan(plan, log, log_box)
+        input_size = len(src)
+        tgt_size = plan.output_size(input_size)
+        log(f"Resizing data to {tgt_size} bytes (offset {plan.offset})", log_box=log_box, level="CONVERSION")
+        swap_size = _swap_size(plan, byteswap_option, log, log_box)
+        timer.lap("read")
+
+        try:
+            with map_output(out_path, tgt_size) as dst:
+                # The new file is already zero-filled, so only the window is copied
+                place_bytes(src, dst, plan.offset, zero_fill=False)
+                timer.lap("resize")
+                byteswap_inplace(dst, swap_size)
+                timer.lap("swap")
+            timer.lap("write")
+        except SaveWriteError:
+            log("Error writing file.", log_box=log_box, level="ERROR")
+            raise
+
+    log(f"File written successfully → {out_path}", log_box=log_box, level="SUCCESS")
+    extension = plan.output_extension(in_path)
+    return ConversionResult(None, plan, swap_size, extension, source_path=in_path,
+                            output_path=out_path, size=tgt_size, input_size=input_size, timings=timer)
+
+
+def convert_stream(reader, writer, plan: ConversionPlan, byteswap_option: str = "Default",
+                   chunk_size: int = STREAM_CHUNK_SIZE, drain: bool = False,
+                   log_box=None, quiet: bool = False, timer=None) -> ConversionResult:
+    """
+    Convert from one binary file object to another in fixed-size chunks.
+
+    Works on pipes (stdin/stdout) and inputs of any size with constant
+    memory. Plans that keep the input size pass the stream straight through.
+    An empty input raises SaveReadError before anything is written.
+    Reading, resizing, swapping and writing interleave, so they are timed as one "stream" stage.
+    """
+    log = _discard if quiet else _log
+    name = getattr(reader, "name", None)
+    source_path = name if isinstance(name, str) else None
+
+    log(f"Starting streamed conversion: {source_path or '<stream>'}", log_box=log_box, level="INFO")
+    _log_plan(plan, log, log_box)
+    swap_size = _swap_size(plan, byteswap_option, log, log_box)
+
+    timer = timer or StageTimer()
+    timer.restart()
+    try:
+        bytes_in, bytes_out = stream_convert(reader, writer, plan.tgt_size, plan.offset,
+                                             swap_size, chunk_size, drain=drain)
+    except SaveReadError:
+        log("Error reading input file.", log_box=log_box, level="ERROR")
+        raise
+    except OSError as e:
+        log("Error streaming file.", log_box=log_box, level="ERROR")
+        raise SaveWriteError(f"Stream conversion failed: {e}") from e
+    timer.lap("stream")
+
+    log(f"Streamed {bytes_in} bytes in, {bytes_out} bytes out", log_box=log_box, level="SUCCESS")
+    extension = plan.output_extension(source_path or "")
+    return ConversionResult(None, plan, swap_size, extension, source_path=source_path, size=bytes_out,
+                            input_size=bytes_in, timings=timer)
+
+
+def write_result(result: ConversionResult, out_path: str, log_box=None, quiet: bool = False) -> str:
+    """Write a converted save to out_path. Raises SaveWriteError on failure."""
+    log = _discard if quiet else _log
+    result.timings.restart()
+    try:
+        write_bytes(result.data, out_path)
+        result.timings.lap("write")
+    except SaveWriteError:
         log("Error writing file.", log_box=log_box, level="ERROR")
-        return None
-    
\ No newline at end of file
+        raise
+    result.output_path = out_path
+    log(f"File written successfully → {out_path}", log_box=log_box, level="SUCCESS")
+    return out_path
+
+
+def record_stats(result: ConversionResult) -> None:
+    """Add a finished conversion's stage timings to the rolling per-path statistics."""
+    STATS.record(result.plan.key, result.timings.stages, result.input_size or 0)
+
+
+@profile_when_enabled("convert_save")
+def convert_save(path, src, src_type, tgt, tgt_type, byteswap_option="Default",
+                 trim_pad_option=False, out_path=None, log_box=None, quiet=False) -> ConversionResult:
+    """
+    System-specific N64 save conversion from GUI labels.
+    With out_path the result is written and its buffer released (data is
+    None afterwards); without it the caller must release() the result.
+    Raises ConversionError subclasses.
+    """
+    timer = StageTimer()
+    plan = resolve_plan(src, src_type, tgt, tgt_type)
+    timer.lap("plan")
+    result = convert(path, plan, byteswap_option, log_box=log_box, quiet=quiet, timer=timer)
+    if out_path:
+        try:
+            write_result(result, out_path, log_box=log_box, quiet=quiet)
+        finally:
+            result.release()
+        record_stats(result)
+    return result
@@ -0,0 +1,124 @@
+# systems/n64/n64_conversion_plan.py
+
+import os
+from functools import lru_cache
+from itertools import product
+from typing import Dict, Optional, Tuple
+
+from .n64_conversion_table import conversion_table, srm_overrides
+from .n64_constants import (
+    NATIVE_LABEL, LABEL_TO_EXT,
+    N64System, N64SaveType, SYSTEM_LABELS, SAVE_TYPE_LABELS,
+    LABEL_TO_SYSTEM, LABEL_TO_SAVE_TYPE
+)
+
+
+class ConversionPlan:
+    """
+    Immutable description of one N64 conversion path.
+
+    tgt_size None: keep the input size.
+    extension None: keep the input file's extension.
+    """
+    __slots__ = ("key", "src_size", "tgt_size", "offset", "swap_size", "extension", "matched", "native")
+
+    def __init__(self, key, src_size, tgt_size, offset, swap_size, extension, matched, native):
+        for name, value in zip(self.__slots__, (key, src_size, tgt_size, offset, swap_size, extension, matched, native)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConversionPlan is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ConversionPlan is immutable")
+
+    def __reduce__(self):
+        # Rebuild through __init__ so plans can cross process boundaries
+        return (ConversionPlan, tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return (f"ConversionPlan(key={self.key!r}, tgt_size={self.tgt_size}, offset={self.offset}, "
+                f"swap_size={self.swap_size}, extension={self.extension!r})")
+
+    @property
+    def swap_required(self) -> bool:
+        return self.swap_size > 1
+
+    def output_size(self, input_size: int) -> int:
+        """Size of the converted file for an input of input_size bytes."""
+        return input_size if self.tgt_size is None else self.tgt_size
+
+    def output_extension(self, path: str) -> str:
+        """Extension of the converted file for the given input path."""
+        return os.path.splitext(path)[1] if self.extension is None else self.extension
+
+
+def compile_plan(src: str, src_type: str, tgt: str, tgt_type: str) -> ConversionPlan:
+    """
+    Build the plan for a (source, source type, target, target type) label tuple.
+    Order of precedence: conversion table, native target, SRM layout override.
+    """
+    key = f"{src}-{src_type}-{tgt}-{tgt_type}"
+
+    conv = conversion_table.get(key)
+    if conv:
+        src_size, tgt_size, offset, swap_required, extension = conv
+    else:
+        src_size, tgt_size, offset, swap_required, extension = None, None, 0, False, None
+
+    native = tgt == NATIVE_LABEL
+    if native:
+        tgt_size, offset, swap_required, extension = None, 0, False, None
+
+    override = srm_overrides.get((src_type, tgt_type))
+    if override:
+        tgt_size, offset, swap_required, extension = override
+
+    extension = LABEL_TO_EXT.get(tgt_type, extension)
+    return ConversionPlan(
+        key=key,
+        src_size=src_size,
+        tgt_size=tgt_size,
+        offset=offset,
+        swap_size=2 if swap_required else 1,
+        extension=extension,
+        matched=conv is not None,
+        native=native
+    )
+
+
+PlanKey = Tuple[N64System, N64SaveType, N64System, N64SaveType]
+
+# Every known combination, compiled once at import
+PLAN_INDEX: Dict[PlanKey, ConversionPlan] = {
+    (src, src_type, tgt, tgt_type): compile_plan(
+        SYSTEM_LABELS[src], SAVE_TYPE_LABELS[src_type], SYSTEM_LABELS[tgt], SAVE_TYPE_LABELS[tgt_type]
+    )
+    for src, src_type, tgt, tgt_type in product(N64System, N64SaveType, N64System, N64SaveType)
+}
+
+
+def get_plan(src: N64System, src_type: N64SaveType, tgt: N64System, tgt_type: N64SaveType) -> ConversionPlan:
+    """Look up a precompiled plan by enum key."""
+    return PLAN_INDEX[(src, src_type, tgt, tgt_type)]
+
+
+@lru_cache(maxsize=None)
+def resolve_plan(src: str, src_type: str, tgt: str, tgt_type: str) -> ConversionPlan:
+    """
+    Resolve a plan from GUI label strings. Memoized, so repeated conversions
+    with the same selections do no string formatting or table lookups.
+    Labels outside the known lists get a plan compiled on demand.
+    """
+    key = _enum_key(src, src_type, tgt, tgt_type)
+    if key is not None:
+        return PLAN_INDEX[key]
+    return compile_plan(src, src_type, tgt, tgt_type)
+
+
+def _enum_key(src, src_type, tgt, tgt_type) -> Optional[PlanKey]:
+    try:
+        return (LABEL_TO_SYSTEM[src], LABEL_TO_SAVE_TYPE[src_type],
+                LABEL_TO_SYSTEM[tgt], LABEL_TO_SAVE_TYPE[tgt_type])
+    except KeyError:
+        return None
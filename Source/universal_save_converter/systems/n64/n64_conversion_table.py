@@ -53,3 +53,16 @@ conversion_table = {
     f"{NATIVE_LABEL}-{FLA_LABEL}-{PJ64_LABEL}-{FLA_LABEL}": (SIZE_FLA, SIZE_FLA, 0, True, FLA_EXT),
     f"{NATIVE_LABEL}-{MPK_LABEL}-{PJ64_LABEL}-{MPK_LABEL}": (SIZE_MPK, SIZE_MPK, 0, False, MPK_EXT),
 }
+
+# RetroArch SRM layouts, keyed by (source type, target type).
+# These apply on top of the table above for every source/target system.
+srm_overrides = {
+    (SRA_LABEL, SRM_LABEL): (SIZE_SRM, SIZE_SRA_SRM_OFFSET, True, SRM_EXT),
+    (FLA_LABEL, SRM_LABEL): (SIZE_SRM, SIZE_FLA_SRM_OFFSET, True, SRM_EXT),
+    (MPK_LABEL, SRM_LABEL): (SIZE_SRM, SIZE_MPK_SRM_OFFSET, False, SRM_EXT),
+    (EEP_LABEL, SRM_LABEL): (SIZE_SRM, 0, False, SRM_EXT),
+    (SRM_LABEL, SRA_LABEL): (SIZE_SRA, -SIZE_SRA_SRM_OFFSET, True, SRA_EXT),
+    (SRM_LABEL, FLA_LABEL): (SIZE_FLA, -SIZE_FLA_SRM_OFFSET, True, FLA_EXT),
+    (SRM_LABEL, MPK_LABEL): (SIZE_MPK, -SIZE_MPK_SRM_OFFSET, False, MPK_EXT),
+    (SRM_LABEL, EEP_LABEL): (SIZE_EEP, 0, False, EEP_EXT),
+}
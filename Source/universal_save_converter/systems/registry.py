@@ -0,0 +1,94 @@
+# systems/registry.py
+#
+# Console GUI registry. Each system is recorded as a "module:function"
+# string and imported only when its console is opened, so startup cost
+# doesn't grow with the number of systems. Third-party packages add systems
+# through the entry point group below, e.g. in pyproject.toml:
+#
+#   [project.entry-points."universal_save_converter.systems"]
+#   "Sega Saturn" = "usc_saturn.gui:setup_saturn_gui"
+
+import importlib
+
+ENTRY_POINT_GROUP = "universal_save_converter.systems"
+
+# Built-in systems: console button label -> "module:setup function"
+BUILTIN_SYSTEMS = {
+    "Game Boy Advance": "systems.gba.gui.gba_gui_main:setup_gba_gui",
+    "Nintendo 64": "systems.n64.gui.n64_gui_main:setup_n64_gui",
+}
+
+
+class SystemEntry:
+    """A console's GUI setup function, imported on first load()."""
+    __slots__ = ("console", "target", "origin", "_func")
+
+    def __init__(self, console: str, target: str, origin: str = "builtin"):
+        self.console = console
+        self.target = target
+        self.origin = origin
+        self._func = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._func is not None
+
+    def load(self):
+        """Import the module and return the setup function. Raises ImportError/AttributeError."""
+        if self._func is None:
+            module_name, _, attr = self.target.partition(":")
+            func = importlib.import_module(module_name)
+            for part in attr.split(".") if attr else ():
+                func = getattr(func, part)
+            self._func = func
+        return self._func
+
+    def __call__(self, parent):
+        return self.load()(parent)
+
+    def __repr__(self):
+        return f"SystemEntry({self.console!r}, {self.target!r}, origin={self.origin!r})"
+
+
+_registry = {}
+_discovered = False
+
+
+def register_system(console: str, target: str, origin: str = "builtin") -> SystemEntry:
+    """Register (or replace) the GUI for a console label."""
+    entry = _registry[console] = SystemEntry(console, target, origin)
+    return entry
+
+
+def discover_plugins() -> list:
+    """
+    Register systems published under ENTRY_POINT_GROUP by installed packages.
+    Runs once; built-in systems win over plugins with the same label.
+    """
+    global _discovered
+    if _discovered:
+        return []
+    _discovered = True
+
+    from importlib.metadata import entry_points
+    found = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        if entry_point.name in BUILTIN_SYSTEMS:
+            continue
+        origin = entry_point.dist.name if entry_point.dist else "plugin"
+        found.append(register_system(entry_point.name, entry_point.value, origin))
+    return found
+
+
+def get_system(console: str):
+    """The SystemEntry for a console label, or None when it has no GUI yet."""
+    return _registry.get(console)
+
+
+def systems() -> dict:
+    """Every registered console label -> SystemEntry (nothing is imported)."""
+    return dict(_registry)
+
+
+for _console, _target in BUILTIN_SYSTEMS.items():
+    register_system(_console, _target)
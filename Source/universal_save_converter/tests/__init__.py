@@ -0,0 +1,31 @@
+# tests/__init__.py
+#
+# Headless tests. Tk-dependent tests use a tkinter.Tcl() interpreter,
+# so no display is needed.
+# Run from Source/universal_save_converter:
+#     python -m unittest            (or: python -m pytest tests)
+#
+# Log lines and history records written by the code under test go to a
+# temporary directory, not the terminal, conversion_log.txt or the history.
+
+import atexit
+import os
+import shutil
+import tempfile
+
+import core.history
+import core.logger
+
+_log_dir = tempfile.mkdtemp(prefix="usc-tests-")
+_devnull = open(os.devnull, "w")
+core.logger.LOG_FILE = os.path.join(_log_dir, "conversion_log.txt")
+core.history.HISTORY_FILE = os.path.join(_log_dir, "conversion_history.jsonl")
+core.logger.set_console_stream(_devnull)
+
+
+def _cleanup():
+    core.logger.flush_logs()
+    shutil.rmtree(_log_dir, ignore_errors=True)
+
+
+atexit.register(_cleanup)
@@ -0,0 +1,150 @@
+# tests/test_batch.py
+#
+# Batch input expansion, job planning and the `usc convert` / `usc history`
+# command line, run in-process with a single worker.
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+from systems.n64.n64_batch import expand_inputs, output_path_for, plan_jobs, run_batch
+from systems.n64.n64_constants import SIZE_SRA, SOURCE_LIST, TARGET_LIST, SRA_LABEL, SRM_LABEL
+from systems.n64.n64_conversion_plan import resolve_plan
+
+PLAN = resolve_plan(SOURCE_LIST[0], SRA_LABEL, TARGET_LIST[0], SRM_LABEL)
+
+
+def plan_all(path):
+    return PLAN, None
+
+
+class BatchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.root = self.work_dir.name
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def touch(self, *parts, size=SIZE_SRA):
+        path = os.path.join(self.root, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(bytes(range(256)) * (size // 256))
+        return path
+
+
+class ExpandInputsTest(BatchTestCase):
+
+    def test_directories_and_globs(self):
+        a = self.touch("a.sra")
+        b = self.touch("b.SRM")
+        self.touch("notes.txt")
+        nested = self.touch("sub", "c.eep")
+
+        self.assertEqual(list(expand_inputs([self.root])), [(a, self.root), (b, self.root)])
+        self.assertEqual([path for path, _ in expand_inputs([self.root], recursive=True)], [a, b, nested])
+        self.assertEqual(list(expand_inputs([os.path.join(self.root, "*.sra"), a])), [(a, None)])
+
+    def test_missing_paths_are_passed_through(self):
+        missing = os.path.join(self.root, "missing.sra")
+        self.assertEqual(list(expand_inputs([missing, missing])), [(missing, None)])
+        self.assertEqual(list(expand_inputs([os.path.join(self.root, "*.none")])), [])
+
+
+class PlanJobsTest(BatchTestCase):
+
+    def test_outputs_are_named_deterministically(self):
+        a = self.touch("in", "a.sra")
+        nested = self.touch("in", "sub", "b.sra")
+        out_dir = os.path.join(self.root, "out")
+        jobs, skipped = plan_jobs(expand_inputs([os.path.join(self.root, "in")], recursive=True),
+                                  plan_all, out_dir)
+        self.assertEqual(skipped, [])
+        self.assertEqual([job.output_path for job in jobs],
+                         [os.path.join(out_dir, "Converted_a.srm"), os.path.join(out_dir, "sub", "Converted_b.srm")])
+        self.assertEqual(output_path_for(a, PLAN), os.path.join(self.root, "in", "Converted_a.srm"))
+        self.assertEqual(jobs[1].input_path, nested)
+
+    def test_skips_are_reported(self):
+        a = self.touch("one", "a.sra")
+        clash = self.touch("two", "a.sra")
+        unknown = self.touch("x.bin")
+        missing = os.path.join(self.root, "missing.sra")
+        out_dir = os.path.join(self.root, "out")
+
+        def plan_for(path):
+            return (None, "unknown save type") if path == unknown else (PLAN, None)
+
+        inputs = [(a, None), (clash, None), (unknown, None), (missing, None), (self.root, None)]
+        jobs, skipped = plan_jobs(inputs, plan_for, out_dir)
+        self.assertEqual([job.input_path for job in jobs], [a])
+        self.assertEqual([path for path, _ in skipped], [clash, unknown, missing, self.root])
+        self.assertIn("clashes", skipped[0][1])
+        self.assertEqual([reason for _, reason in skipped[1:]],
+                         ["unknown save type", "file not found", "not a file"])
+
+    def test_output_may_not_replace_input(self):
+        a = self.touch("a.srm")
+        jobs, skipped = plan_jobs([(a, None)], plan_all, prefix="")
+        self.assertEqual(jobs, [])
+        self.assertEqual(skipped, [(a, "output would overwrite the input")])
+
+
+class RunBatchTest(BatchTestCase):
+
+    def test_single_worker_runs_in_process(self):
+        inputs = [(self.touch(f"{name}.sra"), None) for name in "abc"]
+        jobs, _ = plan_jobs(inputs, plan_all, os.path.join(self.root, "out"))
+        seen = []
+        summary = run_batch(jobs, max_workers=1, progress=lambda job, result: seen.append(job.input_path))
+        self.assertEqual(seen, [path for path, _ in inputs])
+        self.assertEqual((summary.converted, summary.failed), (3, 0))
+        for job in jobs:
+            self.assertEqual(os.path.getsize(job.output_path), PLAN.output_size(SIZE_SRA))
+
+        # A second run refuses to replace the outputs without overwrite
+        summary = run_batch(jobs, max_workers=1)
+        self.assertEqual(summary.failed, 3)
+        self.assertIn("Output exists", summary.results[0].error)
+
+
+class CommandLineTest(BatchTestCase):
+
+    def run_cli(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                code = cli.main(list(argv))
+            except SystemExit as e:
+                code = e.code
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_convert(self):
+        a = self.touch("a.sra")
+        out_dir = os.path.join(self.root, "out")
+        code, _, _ = self.run_cli("convert", a, "--source", "pj64", "--target", "ra", "-o", out_dir, "-j", "1")
+        self.assertEqual(code, 0)
+        self.assertTrue(os.path.isfile(os.path.join(out_dir, "Converted_a.srm")))
+
+    def test_missing_input_fails(self):
+        code, _, _ = self.run_cli("convert", os.path.join(self.root, "missing.sra"),
+                                  "--source", "pj64", "--target", "ra")
+        self.assertEqual(code, 1)
+
+    def test_counts_must_be_positive(self):
+        for argv in (("convert", "a.sra", "--source", "pj64", "--target", "ra", "-j", "0"),
+                     ("convert", "-", "--source", "pj64", "--target", "ra", "--chunk-size", "0"),
+                     ("history", "--last", "-1")):
+            with self.subTest(argv=argv):
+                code, _, stderr = self.run_cli(*argv)
+                self.assertEqual(code, 2)
+                self.assertIn("must be at least 1", stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
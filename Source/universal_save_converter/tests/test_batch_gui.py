@@ -0,0 +1,87 @@
+# tests/test_batch_gui.py
+#
+# The batch queue's grouping: saves grouped by detected type, one plan per
+# group, and the queue runner's per-file progress and cancellation.
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core.exceptions import ConversionCancelled
+from core.jobs import Job
+from systems.n64.gui import n64_batch_gui
+from systems.n64.gui.n64_batch_gui import convert_queue, group_plan
+from systems.n64.n64_batch import group_by_type, plan_jobs
+from systems.n64.n64_constants import (
+    NATIVE_LABEL, PJ64_LABEL, RA_LABEL, SIZE_SRA, EEP_LABEL, SRA_LABEL, SRM_LABEL
+)
+from systems.n64.n64_conversion_plan import resolve_plan
+
+
+class GroupTest(unittest.TestCase):
+
+    def test_group_by_type_in_first_seen_order(self):
+        groups = group_by_type(["b.sra", "a.eep", "notes.txt", "c.SRA", "d.srm", "e"])
+        self.assertEqual(list(groups), [SRA_LABEL, EEP_LABEL, None, SRM_LABEL])
+        self.assertEqual(groups[SRA_LABEL], ["b.sra", "c.SRA"])
+        self.assertEqual(groups[None], ["notes.txt", "e"])
+
+    def test_single_output_type_is_chosen(self):
+        plan, reason = group_plan(PJ64_LABEL, SRA_LABEL, RA_LABEL)
+        self.assertIsNone(reason)
+        self.assertEqual(plan.key, resolve_plan(PJ64_LABEL, SRA_LABEL, RA_LABEL, SRM_LABEL).key)
+
+    def test_ambiguous_output_needs_a_target_type(self):
+        plan, reason = group_plan(RA_LABEL, SRM_LABEL, PJ64_LABEL)
+        self.assertIsNone(plan)
+        self.assertIn("several output types", reason)
+        plan, reason = group_plan(RA_LABEL, SRM_LABEL, PJ64_LABEL, target_type=EEP_LABEL)
+        self.assertIsNone(reason)
+        self.assertEqual(plan.key, resolve_plan(RA_LABEL, SRM_LABEL, PJ64_LABEL, EEP_LABEL).key)
+
+    def test_groups_without_a_plan(self):
+        self.assertEqual(group_plan(NATIVE_LABEL, None, PJ64_LABEL), (None, "unknown save type"))
+        self.assertEqual(group_plan(NATIVE_LABEL, "Sega Saturn", PJ64_LABEL),
+                         (None, f"{PJ64_LABEL} has no output for Sega Saturn"))
+
+
+class ConvertQueueTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.work_dir.cleanup)
+        inputs = []
+        for name in ("a.sra", "b.sra", "c.sra"):
+            path = os.path.join(self.work_dir.name, name)
+            with open(path, "wb") as f:
+                f.write(bytes(SIZE_SRA))
+            inputs.append((path, None))
+        plan, _ = group_plan(PJ64_LABEL, SRA_LABEL, RA_LABEL)
+        self.jobs, _ = plan_jobs(inputs, lambda path: (plan, None), os.path.join(self.work_dir.name, "out"))
+        patch = mock.patch.object(n64_batch_gui, "record_batch_result")
+        self.recorded = patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_progress_per_file(self):
+        job = Job(1, "batch")
+        seen = []
+        job.report = lambda stage=None, fraction=None, nbytes=None: seen.append((stage, fraction, nbytes))
+        summary = convert_queue(self.jobs, job=job)
+        self.assertEqual((summary.converted, summary.failed), (3, 0))
+        self.assertEqual(seen, [("a.sra", 1 / 3, SIZE_SRA), ("b.sra", 2 / 3, 2 * SIZE_SRA),
+                                ("c.sra", 1.0, 3 * SIZE_SRA)])
+        self.assertEqual(self.recorded.call_count, 3)
+
+    def test_cancel_stops_between_files(self):
+        job = Job(1, "batch")
+        job.report = lambda *args: job.token.cancel()
+        with self.assertRaises(ConversionCancelled):
+            convert_queue(self.jobs, job=job)
+        self.assertEqual(self.recorded.call_count, 1)
+        written = os.listdir(os.path.join(self.work_dir.name, "out"))
+        self.assertEqual(len(written), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_buffer_pool.py
+#
+# BufferPool reuse, and that pooled conversions hand every buffer back,
+# including when a stage fails or a job is cancelled between stages.
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from core.buffer_pool import BUFFER_POOL, BufferPool
+from core.exceptions import ConversionCancelled
+from core.timing import StageTimer
+from systems.n64.n64_constants import SIZE_SRA, SIZE_SRM, SOURCE_LIST, TARGET_LIST, SRA_LABEL, SRM_LABEL
+from systems.n64.n64_conversion_core import convert, convert_save
+from systems.n64.n64_conversion_plan import resolve_plan
+
+LABELS = (SOURCE_LIST[0], SRA_LABEL, TARGET_LIST[0], SRM_LABEL)
+
+
+def cancel_at(stage):
+    """A StageTimer whose on_lap cancels at stage, like a cancelled job's timer."""
+    def on_lap(lap_stage, seconds):
+        if lap_stage == stage:
+            raise ConversionCancelled(stage)
+    return StageTimer(on_lap=on_lap)
+
+
+class BufferPoolTest(unittest.TestCase):
+
+    def test_buffers_are_reused_zeroed(self):
+        pool = BufferPool(sizes=(16,), max_per_size=1)
+        buffer = pool.acquire(16)
+        buffer[:] = b"\xff" * 16
+        pool.release(buffer)
+        again = pool.acquire(16)
+        self.assertIs(again, buffer)
+        self.assertEqual(again, bytearray(16))
+        self.assertEqual((pool.hits, pool.misses, pool.returns), (1, 1, 1))
+
+    def test_extra_and_unclassed_buffers_are_dropped(self):
+        pool = BufferPool(sizes=(16,), max_per_size=1)
+        pool.release(bytearray(16))
+        pool.release(bytearray(16))
+        pool.release(bytearray(10))
+        pool.release(b"\0" * 16)
+        self.assertEqual(pool.stats()["idle"], {16: 1})
+        self.assertEqual((pool.returns, pool.discards), (1, 3))
+        self.assertEqual(len(pool.acquire(10)), 10)
+
+
+class PooledConversionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.data = random.Random(8).randbytes(SIZE_SRA)
+        self.path = os.path.join(self.work_dir.name, "game.sra")
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+        self.plan = resolve_plan(*LABELS)
+        self.pool = BufferPool(sizes=(SIZE_SRA, SIZE_SRM))
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def assertAllReturned(self, pool):
+        self.assertEqual(pool.hits + pool.misses, pool.returns + pool.discards)
+
+    def test_matches_unpooled_conversion(self):
+        with convert(self.data, self.plan, quiet=True, pool=None) as expected:
+            for _ in range(3):
+                with convert(self.path, self.plan, quiet=True, pool=self.pool) as result:
+                    self.assertEqual(result.data, expected.data)
+        self.assertAllReturned(self.pool)
+        self.assertEqual(self.pool.hits, 4)  # every run after the first reuses both buffers
+
+    def test_cancelled_stage_returns_buffers(self):
+        for stage in ("read", "resize", "swap"):
+            with self.subTest(stage=stage):
+                pool = BufferPool(sizes=(SIZE_SRA, SIZE_SRM))
+                with self.assertRaises(ConversionCancelled):
+                    convert(self.path, self.plan, quiet=True, pool=pool, timer=cancel_at(stage))
+                self.assertAllReturned(pool)
+                self.assertGreater(pool.returns, 0)
+
+    def test_failed_resize_returns_buffers(self):
+        with mock.patch("systems.n64.n64_conversion_core.resize_bytes", side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                convert(self.path, self.plan, quiet=True, pool=self.pool)
+        self.assertAllReturned(self.pool)
+        self.assertEqual(self.pool.returns, 2)
+
+    def test_convert_save_releases_written_result(self):
+        before = BUFFER_POOL.stats()
+        result = convert_save(self.path, *LABELS, out_path=os.path.join(self.work_dir.name, "out.srm"),
+                              quiet=True)
+        after = BUFFER_POOL.stats()
+        self.assertIsNone(result.data)
+        self.assertEqual(after["hits"] + after["misses"] - before["hits"] - before["misses"],
+                         after["returns"] + after["discards"] - before["returns"] - before["discards"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# tests/test_config_store.py
+#
+# ConfigStore: lazy load, debounced writes, atomic replacement and the
+# typed getters' fallbacks for hand-edited files.
+
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from gui.config_manager import ConfigStore
+
+DELAY = 0.05
+
+
+class ConfigStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, "gui_config.json")
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def read_file(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def wait_for_writes(self, store, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while store.writes < count and time.monotonic() < deadline:
+            time.sleep(DELAY / 5)
+
+    def test_burst_of_changes_is_written_once(self):
+        store = ConfigStore(self.path, delay=DELAY, max_delay=10)
+        for lines in range(1, 21):
+            store.set("log_max_lines", lines)
+        store.set("log_visible", False)
+        self.assertEqual(store.writes, 0)
+        self.assertFalse(os.path.exists(self.path))
+
+        self.wait_for_writes(store, 1)
+        time.sleep(DELAY * 3)
+        self.assertEqual(store.writes, 1)
+        self.assertFalse(store.dirty)
+        self.assertEqual(self.read_file(), {"log_max_lines": 20, "log_visible": False})
+
+    def test_unchanged_values_do_not_write(self):
+        store = ConfigStore(self.path, delay=DELAY)
+        store.set("log_visible", True)
+        self.assertTrue(store.flush())
+        store.set("log_visible", True)
+        store.update({"log_visible": True})
+        self.assertFalse(store.dirty)
+        self.assertFalse(store.flush())
+        self.assertEqual(store.writes, 1)
+
+    def test_max_delay_bounds_a_steady_stream_of_changes(self):
+        store = ConfigStore(self.path, delay=DELAY, max_delay=DELAY * 2)
+        deadline = time.monotonic() + DELAY * 8
+        count = 0
+        while time.monotonic() < deadline:
+            count += 1
+            store.set("counter", count)
+            time.sleep(DELAY / 5)
+        # Changes never paused for `delay`, yet they were written along the way
+        self.assertGreaterEqual(store.writes, 1)
+        store.flush()
+        self.assertEqual(self.read_file()["counter"], count)
+
+    def test_write_replaces_atomically_and_keeps_mode(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"log_visible": True}, f)
+        os.chmod(self.path, 0o640)
+
+        store = ConfigStore(self.path, delay=DELAY)
+        store.set("log_visible", False)
+        store.flush()
+        self.assertEqual(self.read_file(), {"log_visible": False})
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+        self.assertEqual(os.listdir(self.work_dir.name), ["gui_config.json"])
+
+    def test_failed_write_keeps_file_and_pending_changes(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"log_visible": True}, f)
+        store = ConfigStore(self.path, delay=60)
+        store.set("log_visible", False)
+
+        with mock.patch("gui.config_manager.os.replace", side_effect=OSError("disk full")):
+            self.assertFalse(store.flush())
+        self.assertTrue(store.dirty)
+        self.assertEqual(self.read_file(), {"log_visible": True})
+        self.assertEqual(os.listdir(self.work_dir.name), ["gui_config.json"])
+
+        self.assertTrue(store.flush())
+        self.assertEqual(self.read_file(), {"log_visible": False})
+
+    def test_reload_discards_pending_changes(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"log_visible": True}, f)
+        store = ConfigStore(self.path, delay=60)
+        store.set("log_visible", False)
+        store.reload()
+        self.assertFalse(store.dirty)
+        self.assertTrue(store.get("log_visible"))
+
+    def test_typed_getters_fall_back_on_bad_values(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"flag": "yes", "lines": True, "small": -5, "ratio": 2, "name": 3,
+                       "items": {"a": 1}, "options": [1]}, f)
+        store = ConfigStore(self.path)
+        self.assertFalse(store.get_bool("flag"))
+        self.assertEqual(store.get_int("lines", 100), 100)
+        self.assertEqual(store.get_int("small", 100, minimum=1), 1)
+        self.assertEqual(store.get_float("ratio"), 2.0)
+        self.assertEqual(store.get_str("name", "x"), "x")
+        self.assertEqual(store.get_list("items", ["d"]), ["d"])
+        self.assertEqual(store.get_dict("options", {"d": 1}), {"d": 1})
+
+    def test_unreadable_file_loads_as_empty(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("{not json")
+        store = ConfigStore(self.path)
+        self.assertEqual(store.snapshot(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
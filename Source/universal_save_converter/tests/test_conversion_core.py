@@ -0,0 +1,138 @@
+# tests/test_conversion_core.py
+#
+# The headless N64 conversion API (in-memory and memory-mapped) against the
+# original resize-then-swap pipeline, for every distinct conversion the GUI offers.
+
+import os
+import random
+import tempfile
+import unittest
+
+from benchmarks.legacy_kernels import byteswap_loop, resize_bytes_loop
+from core.exceptions import InvalidInputError, SaveReadError
+from core.swap_utils import determine_swap_size
+from systems.n64.n64_constants import (
+    SOURCE_LIST, TARGET_LIST, EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL,
+    SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM
+)
+from systems.n64.n64_conversion_core import convert, convert_file, convert_save, write_result
+from systems.n64.n64_conversion_plan import resolve_plan
+
+SAVE_TYPES = (EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL)
+TYPE_SIZES = {EEP_LABEL: SIZE_EEP, SRA_LABEL: SIZE_SRA, FLA_LABEL: SIZE_FLA, MPK_LABEL: SIZE_MPK, SRM_LABEL: SIZE_SRM}
+
+
+def distinct_plans():
+    """One plan per distinct (input size, output size, offset, swap) the GUI labels produce."""
+    plans = {}
+    for src in SOURCE_LIST:
+        for src_type in SAVE_TYPES:
+            for tgt in TARGET_LIST:
+                for tgt_type in SAVE_TYPES:
+                    plan = resolve_plan(src, src_type, tgt, tgt_type)
+                    size = TYPE_SIZES[src_type]
+                    plans.setdefault((size, plan.output_size(size), plan.offset, plan.swap_size), plan)
+    return [(params[0], plan) for params, plan in plans.items()]
+
+
+def legacy_convert(data, plan):
+    swap_size = determine_swap_size(plan.swap_required, "Default")
+    return byteswap_loop(resize_bytes_loop(data, plan.output_size(len(data)), plan.offset), swap_size)
+
+
+class ConversionTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cases = distinct_plans()
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write_input(self, data, name="input.bin"):
+        path = os.path.join(self.work_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+class ConvertTest(ConversionTestCase):
+
+    def test_bytes_match_legacy_pipeline(self):
+        for size, plan in self.cases:
+            data = random.Random(size).randbytes(size)
+            with self.subTest(plan=plan.key):
+                with convert(data, plan, quiet=True, pool=None) as result:
+                    self.assertEqual(bytes(result.data), legacy_convert(data, plan))
+                    self.assertEqual((result.size, result.input_size), (len(result.data), size))
+
+    def test_path_input_and_write_result(self):
+        size, plan = self.cases[0]
+        data = random.Random(1).randbytes(size)
+        in_path = self.write_input(data, "game.sra")
+        out_path = os.path.join(self.work_dir.name, "out")
+        with convert(in_path, plan, quiet=True, pool=None) as result:
+            self.assertEqual(result.source_path, in_path)
+            write_result(result, out_path, quiet=True)
+        with open(out_path, "rb") as f:
+            self.assertEqual(f.read(), legacy_convert(data, plan))
+        self.assertIn("read", result.timings.stages)
+        self.assertIn("write", result.timings.stages)
+
+    def test_invalid_inputs_raise(self):
+        plan = self.cases[0][1]
+        with self.assertRaises(InvalidInputError):
+            convert(os.path.join(self.work_dir.name, "missing.sra"), plan, quiet=True)
+        with self.assertRaises(SaveReadError):
+            convert(b"", plan, quiet=True)
+        with self.assertRaises(SaveReadError):
+            convert(self.write_input(b"", "empty.sra"), plan, quiet=True)
+
+    def test_convert_save_from_labels(self):
+        data = random.Random(2).randbytes(SIZE_SRA)
+        in_path = self.write_input(data, "game.sra")
+        out_path = os.path.join(self.work_dir.name, "game.srm")
+        labels = (SOURCE_LIST[0], SRA_LABEL, TARGET_LIST[0], SRM_LABEL)
+        result = convert_save(in_path, *labels, out_path=out_path, quiet=True)
+        self.assertEqual(result.output_path, out_path)
+        with open(out_path, "rb") as f:
+            self.assertEqual(f.read(), legacy_convert(data, resolve_plan(*labels)))
+
+
+class ConvertFileTest(ConversionTestCase):
+
+    def test_matches_legacy_pipeline(self):
+        out_path = os.path.join(self.work_dir.name, "output.bin")
+        for size, plan in self.cases:
+            data = random.Random(size + 1).randbytes(size)
+            in_path = self.write_input(data)
+            with self.subTest(plan=plan.key):
+                result = convert_file(in_path, out_path, plan, quiet=True)
+                self.assertIsNone(result.data)
+                self.assertEqual((result.output_path, result.input_size), (out_path, size))
+                with open(out_path, "rb") as f:
+                    self.assertEqual(f.read(), legacy_convert(data, plan))
+
+    def test_refuses_to_overwrite_its_input(self):
+        size, plan = self.cases[0]
+        data = random.Random(3).randbytes(size)
+        in_path = self.write_input(data)
+        with self.assertRaises(InvalidInputError):
+            convert_file(in_path, in_path, plan, quiet=True)
+        with open(in_path, "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_invalid_inputs_raise(self):
+        plan = self.cases[0][1]
+        out_path = os.path.join(self.work_dir.name, "output.bin")
+        with self.assertRaises(InvalidInputError):
+            convert_file(os.path.join(self.work_dir.name, "missing.sra"), out_path, plan, quiet=True)
+        with self.assertRaises(SaveReadError):
+            convert_file(self.write_input(b"", "empty.sra"), out_path, plan, quiet=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
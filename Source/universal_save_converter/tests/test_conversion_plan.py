@@ -0,0 +1,109 @@
+# tests/test_conversion_plan.py
+#
+# Compiled ConversionPlans against the if/elif chain of the original
+# convert_save, for every label combination.
+
+import os
+import unittest
+
+from systems.n64.n64_constants import (
+    NATIVE_LABEL, SOURCE_LIST, TARGET_LIST,
+    EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL,
+    EEP_EXT, SRA_EXT, FLA_EXT, MPK_EXT, SRM_EXT,
+    SIZE_EEP, SIZE_SRA, SIZE_FLA, SIZE_MPK, SIZE_SRM,
+    SIZE_SRA_SRM_OFFSET, SIZE_FLA_SRM_OFFSET, SIZE_MPK_SRM_OFFSET
+)
+from systems.n64.n64_conversion_plan import compile_plan, resolve_plan
+from systems.n64.n64_conversion_table import conversion_table
+
+SAVE_TYPES = (EEP_LABEL, SRA_LABEL, FLA_LABEL, MPK_LABEL, SRM_LABEL)
+# Labels outside the GUI lists still get a plan (compiled on demand)
+UNKNOWN_SYSTEM = "Unknown System"
+UNKNOWN_TYPE = "Unknown"
+
+
+def legacy_parameters(path, input_size, src, src_type, tgt, tgt_type):
+    """
+    The original convert_save's conversion parameters, branch for branch:
+    (target size, offset, swap required, output extension).
+    """
+    key = f"{src}-{src_type}-{tgt}-{tgt_type}"
+    tgt_size = input_size
+    offset = 0
+    swap_required = False
+    extension = os.path.splitext(path)[1]
+
+    conv = conversion_table.get(key)
+    if conv:
+        src_size, tgt_size, offset, swap_required, extension = conv
+
+    if tgt == NATIVE_LABEL:
+        tgt_size = input_size
+        offset = 0
+        swap_required = False
+        extension = os.path.splitext(path)[1]
+
+    if src_type == SRA_LABEL and tgt_type == SRM_LABEL:
+        tgt_size, offset, swap_required, extension = SIZE_SRM, SIZE_SRA_SRM_OFFSET, True, SRM_EXT
+    elif src_type == FLA_LABEL and tgt_type == SRM_LABEL:
+        tgt_size, offset, swap_required, extension = SIZE_SRM, SIZE_FLA_SRM_OFFSET, True, SRM_EXT
+    elif src_type == MPK_LABEL and tgt_type == SRM_LABEL:
+        tgt_size, offset, swap_required, extension = SIZE_SRM, SIZE_MPK_SRM_OFFSET, False, SRM_EXT
+    elif src_type == SRM_LABEL:
+        if tgt_type == SRA_LABEL:
+            tgt_size, offset, swap_required, extension = SIZE_SRA, -SIZE_SRA_SRM_OFFSET, True, SRA_EXT
+        elif tgt_type == FLA_LABEL:
+            tgt_size, offset, swap_required, extension = SIZE_FLA, -SIZE_FLA_SRM_OFFSET, True, FLA_EXT
+        elif tgt_type == MPK_LABEL:
+            tgt_size, offset, swap_required, extension = SIZE_MPK, -SIZE_MPK_SRM_OFFSET, False, MPK_EXT
+        elif tgt_type == EEP_LABEL:
+            tgt_size, offset, swap_required, extension = SIZE_EEP, 0, False, EEP_EXT
+    elif src_type == EEP_LABEL and tgt_type == SRM_LABEL:
+        tgt_size, offset, swap_required, extension = SIZE_SRM, 0, False, SRM_EXT
+
+    ext_map = {EEP_LABEL: EEP_EXT, SRA_LABEL: SRA_EXT, FLA_LABEL: FLA_EXT,
+               MPK_LABEL: MPK_EXT, SRM_LABEL: SRM_EXT}
+    return tgt_size, offset, swap_required, ext_map.get(tgt_type, extension)
+
+
+def label_combinations():
+    sources = list(SOURCE_LIST) + [UNKNOWN_SYSTEM]
+    targets = list(TARGET_LIST) + [UNKNOWN_SYSTEM]
+    types = SAVE_TYPES + (UNKNOWN_TYPE,)
+    for src in sources:
+        for src_type in types:
+            for tgt in targets:
+                for tgt_type in types:
+                    yield src, src_type, tgt, tgt_type
+
+
+class CompilePlanTest(unittest.TestCase):
+
+    def test_matches_legacy_branches(self):
+        for labels in label_combinations():
+            plan = compile_plan(*labels)
+            for path, input_size in (("game.sra", 1234), ("dir/game.BIN", SIZE_SRM)):
+                with self.subTest(labels=labels, path=path):
+                    self.assertEqual(
+                        (plan.output_size(input_size), plan.offset, plan.swap_required,
+                         plan.output_extension(path)),
+                        legacy_parameters(path, input_size, *labels)
+                    )
+
+    def test_resolve_plan_matches_compile_plan(self):
+        for labels in label_combinations():
+            with self.subTest(labels=labels):
+                resolved, compiled = resolve_plan(*labels), compile_plan(*labels)
+                self.assertEqual(
+                    [getattr(resolved, name) for name in resolved.__slots__],
+                    [getattr(compiled, name) for name in compiled.__slots__]
+                )
+
+    def test_plans_are_immutable(self):
+        plan = resolve_plan(SOURCE_LIST[0], SRA_LABEL, TARGET_LIST[1], SRA_LABEL)
+        with self.assertRaises(AttributeError):
+            plan.offset = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
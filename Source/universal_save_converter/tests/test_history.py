@@ -0,0 +1,123 @@
+# tests/test_history.py
+#
+# Size-based rotation and the JSONL conversion history, read back across
+# plain and gzip-compressed segments.
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core import history
+from core.history import RESULT_FAILED, RESULT_OK, read_history, record_conversion
+from core.log_rotation import Rotation, rotate, segment_paths
+from systems.n64.n64_constants import SOURCE_LIST, TARGET_LIST, SRA_LABEL, SRM_LABEL, EEP_LABEL
+from systems.n64.n64_conversion_plan import resolve_plan
+
+SRA_TO_SRM = resolve_plan(SOURCE_LIST[0], SRA_LABEL, TARGET_LIST[0], SRM_LABEL)
+SRM_TO_EEP = resolve_plan(SOURCE_LIST[0], SRM_LABEL, TARGET_LIST[0], EEP_LABEL)
+
+
+class HistoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, "history.jsonl")
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def read(self, path):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            return f.read()
+
+
+class RotateTest(HistoryTestCase):
+
+    def test_segments_shift_and_expire(self):
+        for generation in range(5):
+            self.write(self.path, f"generation {generation}\n")
+            rotate(self.path, backups=3)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual([self.read(segment) for segment in segment_paths(self.path)],
+                         ["generation 2\n", "generation 3\n", "generation 4\n"])
+
+    def test_compressed_segments(self):
+        for generation in range(3):
+            self.write(self.path, f"generation {generation}\n")
+            rotate(self.path, backups=5, compress=True)
+        self.write(self.path, "live\n")
+        segments = segment_paths(self.path)
+        self.assertEqual([os.path.basename(segment) for segment in segments],
+                         ["history.jsonl.3.gz", "history.jsonl.2.gz", "history.jsonl.1.gz", "history.jsonl"])
+        self.assertEqual([self.read(segment) for segment in segments],
+                         ["generation 0\n", "generation 1\n", "generation 2\n", "live\n"])
+        self.assertEqual(segment_paths(self.path, include_rotated=False), [self.path])
+
+    def test_segments_sort_numerically(self):
+        for n in (1, 2, 10, 11):
+            self.write(f"{self.path}.{n}", "")
+        self.assertEqual([segment.rsplit(".", 1)[1] for segment in segment_paths(self.path)],
+                         ["11", "10", "2", "1"])
+
+    def test_no_backups_deletes_the_file(self):
+        self.write(self.path, "gone\n")
+        rotate(self.path, backups=0)
+        self.assertEqual(os.listdir(self.work_dir.name), [])
+
+
+class ReadHistoryTest(HistoryTestCase):
+
+    def record_many(self, count):
+        records = []
+        for i in range(count):
+            plan = SRA_TO_SRM if i % 2 == 0 else SRM_TO_EEP
+            records.append(record_conversion(f"save{i}.sra", f"out{i}", plan, input_size=i,
+                                             result=RESULT_OK if i % 3 else RESULT_FAILED,
+                                             timings={"read": 0.001}, origin="test"))
+        return records
+
+    def test_records_survive_rotation_in_order(self):
+        rotation = Rotation(max_bytes=2048, backups=50, compress=True)
+        with mock.patch.object(history, "HISTORY_FILE", self.path), \
+                mock.patch.object(history, "HISTORY_ROTATION", rotation):
+            written = self.record_many(60)
+            read = list(read_history())
+        self.assertTrue(any(segment.endswith(".gz") for segment in segment_paths(self.path)))
+        self.assertEqual(read, written)
+        self.assertEqual(read[0]["timings_ms"], {"read": 1.0})
+        self.assertEqual(read[0]["plan"]["key"], SRA_TO_SRM.key)
+
+    def test_filters(self):
+        with mock.patch.object(history, "HISTORY_FILE", self.path), \
+                mock.patch.object(history, "HISTORY_ROTATION", Rotation(max_bytes=1024, backups=20, compress=True)):
+            written = self.record_many(12)
+            failed = list(read_history(result=RESULT_FAILED))
+            current = list(read_history(include_rotated=False))
+            by_plan = list(read_history(plan_key=SRM_TO_EEP.key))
+            since = list(read_history(since=written[-1]["time"]))
+
+        self.assertEqual(failed, [record for record in written if record["result"] == RESULT_FAILED])
+        self.assertEqual(current, written[len(written) - len(current):])
+        self.assertLess(len(current), len(written))
+        self.assertEqual([record["input_size"] for record in by_plan], [1, 3, 5, 7, 9, 11])
+        self.assertEqual(since[-1], written[-1])
+
+    def test_bad_lines_are_skipped(self):
+        record = {"time": "2024-01-01T00:00:00.000", "result": RESULT_OK}
+        with gzip.open(self.path + ".1.gz", "wt", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n\n")
+        self.write(self.path, '{"time": "2024-01-02T00:00:00.000"}\n{"torn')
+        self.assertEqual([r["time"] for r in read_history(self.path)],
+                         ["2024-01-01T00:00:00.000", "2024-01-02T00:00:00.000"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+# tests/test_jobs.py
+#
+# JobManager: bounded concurrency, cancellation of queued and running
+# jobs, failure states, and callback delivery on the polling thread.
+
+import threading
+import time
+import tkinter as tk
+import unittest
+from unittest import mock
+
+from core.exceptions import ConversionCancelled
+from core.jobs import JOB_CANCELLED, JOB_DONE, JOB_FAILED, JobManager, start_job_drain
+
+TIMEOUT = 5.0
+
+
+def wait_until(condition, timeout=TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+class JobManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = JobManager(max_workers=2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.manager.shutdown(wait=True)
+
+    def blocking(self, job=None):
+        self.release.wait(TIMEOUT)
+        return "released"
+
+    def test_result_and_callbacks_are_delivered_by_poll(self):
+        seen = []
+        job = self.manager.submit("add", lambda a, b, job=None: a + b, 2, 3,
+                                  on_progress=lambda j: seen.append(("progress", j.state)),
+                                  on_done=lambda j: seen.append(("done", j.result)))
+        wait_until(lambda: job.done)
+        self.assertEqual(seen, [])  # nothing runs until the Tk thread polls
+        self.assertEqual(self.manager.poll(), 1)
+        self.assertEqual(seen, [("progress", JOB_DONE), ("done", 5)])
+        self.assertEqual((job.state, job.progress), (JOB_DONE, 1.0))
+        self.assertEqual(self.manager.poll(), 0)
+
+    def test_concurrency_is_bounded(self):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def work(job=None):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            self.release.wait(TIMEOUT)
+            with lock:
+                running[0] -= 1
+
+        jobs = [self.manager.submit(f"job {i}", work) for i in range(5)]
+        wait_until(lambda: running[0] == 2)
+        time.sleep(0.05)
+        self.assertEqual(len(self.manager.active()), 5)
+        self.release.set()
+        wait_until(lambda: all(job.done for job in jobs))
+        self.assertEqual(peak[0], 2)
+
+    def test_cancelled_queued_job_never_starts(self):
+        started = []
+        blockers = [self.manager.submit(f"blocker {i}", self.blocking) for i in range(2)]
+        queued = self.manager.submit("queued", lambda job=None: started.append(job))
+        self.assertTrue(self.manager.cancel(queued.id))
+        self.release.set()
+        wait_until(lambda: all(job.done for job in blockers + [queued]))
+        self.assertEqual(queued.state, JOB_CANCELLED)
+        self.assertEqual(started, [])
+        self.assertFalse(self.manager.cancel(queued.id))
+
+    def test_running_job_stops_at_the_next_stage(self):
+        reached = threading.Event()
+        stages = []
+
+        def work(job=None):
+            timer = job.stage_timer()
+            timer.lap("read")
+            stages.append("read")
+            reached.set()
+            self.release.wait(TIMEOUT)
+            timer.lap("resize")
+            stages.append("resize")
+
+        job = self.manager.submit("convert", work, stages=("read", "resize", "swap"))
+        reached.wait(TIMEOUT)
+        self.manager.cancel(job.id)
+        self.release.set()
+        wait_until(lambda: job.done)
+        self.assertEqual(job.state, JOB_CANCELLED)
+        self.assertIsInstance(job.error, ConversionCancelled)
+        self.assertEqual(stages, ["read"])
+        self.assertEqual(job.stage, "resize")
+
+    def test_cancel_after_the_write_stage_has_no_effect(self):
+        def work(job=None):
+            timer = job.stage_timer()
+            job.token.cancel()  # arrives while the output is being written
+            timer.lap("write")
+            return "written"
+
+        job = self.manager.submit("convert", work, stages=("write",))
+        wait_until(lambda: job.done)
+        self.assertEqual((job.state, job.result), (JOB_DONE, "written"))
+
+    def test_failures(self):
+        def raises(job=None):
+            raise OSError("disk gone")
+
+        def flags(job=None):
+            job.error = ValueError("bad input")
+
+        failed = self.manager.submit("raises", raises)
+        flagged = self.manager.submit("flags", flags)
+        wait_until(lambda: failed.done and flagged.done)
+        self.assertEqual(failed.state, JOB_FAILED)
+        self.assertIsInstance(failed.error, OSError)
+        self.assertEqual(flagged.state, JOB_FAILED)
+
+    def test_failing_callback_does_not_lose_other_jobs(self):
+        done = []
+
+        def broken(job):
+            raise RuntimeError("callback bug")
+
+        self.manager.add_listener(broken)
+        first = self.manager.submit("first", lambda job=None: 1, on_done=broken)
+        second = self.manager.submit("second", lambda job=None: 2, on_done=lambda j: done.append(j.result))
+        wait_until(lambda: first.done and second.done)
+        with mock.patch("core.jobs.log") as log:
+            self.manager.poll()
+        self.assertEqual(done, [2])
+        self.assertEqual(log.call_count, 3)  # first's on_done, and the listener for both jobs
+
+    def test_drain_survives_a_failing_poll(self):
+        interp = tk.Tcl()
+        polls = []
+
+        class BrokenManager:
+            def poll(self):
+                polls.append(time.monotonic())
+                raise RuntimeError("poll failed")
+
+        class Widget:
+            def winfo_exists(self):
+                return True
+
+            def after(self, delay, func):
+                return interp.after(delay, func)
+
+        start_job_drain(Widget(), BrokenManager(), interval_ms=1)
+        deadline = time.monotonic() + TIMEOUT
+        while len(polls) < 3 and time.monotonic() < deadline:
+            try:
+                interp.update()
+            except RuntimeError:
+                pass  # Tk reports the callback error; the drain must reschedule anyway
+            time.sleep(0.002)
+        self.assertGreaterEqual(len(polls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
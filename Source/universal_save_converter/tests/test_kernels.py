@@ -0,0 +1,90 @@
+# tests/test_kernels.py
+#
+# The byte-swap and resize kernels against the original per-byte loops
+# (benchmarks/legacy_kernels.py): output must be byte-for-byte identical.
+
+import random
+import unittest
+from unittest import mock
+
+from benchmarks.legacy_kernels import byteswap_loop, resize_bytes_loop
+from core import swap_utils
+from core.file_utils import place_bytes, resize_bytes
+from core.swap_utils import byteswap, byteswap_inplace
+
+SIZES = (0, 1, 2, 3, 4, 5, 7, 8, 9, 15, 16, 17, 63, 64, 65, 1023)
+SWAP_SIZES = (1, 2, 3, 4, 8)
+NEW_SIZES = (0, 1, 5, 64, 100)
+OFFSETS = (-200, -5, -1, 0, 1, 5, 63, 200)
+
+
+def random_bytes(size, seed=0):
+    return bytes(random.Random(seed * 7919 + size).randrange(256) for _ in range(size))
+
+
+class ByteswapTest(unittest.TestCase):
+
+    def test_matches_baseline(self):
+        for size in SIZES:
+            data = random_bytes(size)
+            for swap_size in SWAP_SIZES:
+                with self.subTest(size=size, swap_size=swap_size):
+                    self.assertEqual(bytes(byteswap(data, swap_size)), byteswap_loop(data, swap_size))
+
+    def test_inplace_matches_baseline(self):
+        for size in SIZES:
+            data = random_bytes(size)
+            for swap_size in SWAP_SIZES:
+                with self.subTest(size=size, swap_size=swap_size):
+                    buffer = bytearray(data)
+                    self.assertIs(byteswap_inplace(buffer, swap_size), buffer)
+                    self.assertEqual(bytes(buffer), byteswap_loop(data, swap_size))
+
+    def test_inplace_on_memoryview_slice(self):
+        data = random_bytes(100)
+        buffer = bytearray(data)
+        byteswap_inplace(memoryview(buffer)[10:90], 4)
+        self.assertEqual(bytes(buffer), data[:10] + byteswap_loop(data[10:90], 4) + data[90:])
+
+    def test_swaps_across_block_boundaries(self):
+        # A tiny block size exercises the block loop without megabyte inputs
+        data = random_bytes(1000)
+        with mock.patch.object(swap_utils, "SWAP_BLOCK_SIZE", 64):
+            for swap_size in (2, 4, 8):
+                with self.subTest(swap_size=swap_size):
+                    buffer = bytearray(data)
+                    byteswap_inplace(buffer, swap_size)
+                    self.assertEqual(bytes(buffer), byteswap_loop(data, swap_size))
+
+
+class ResizeTest(unittest.TestCase):
+
+    def test_matches_baseline(self):
+        for size in SIZES:
+            data = random_bytes(size, seed=1)
+            for new_size in NEW_SIZES:
+                for offset in OFFSETS:
+                    with self.subTest(size=size, new_size=new_size, offset=offset):
+                        self.assertEqual(resize_bytes(data, new_size, offset),
+                                         resize_bytes_loop(data, new_size, offset))
+
+    def test_out_buffer_is_filled_in_place(self):
+        data = random_bytes(64, seed=2)
+        for offset in OFFSETS:
+            with self.subTest(offset=offset):
+                out = bytearray(b"\xff" * 100)  # stale contents must be cleared
+                self.assertIs(resize_bytes(memoryview(data), 100, offset, out=out), out)
+                self.assertEqual(bytes(out), resize_bytes_loop(data, 100, offset))
+
+    def test_out_buffer_size_is_checked(self):
+        with self.assertRaises(ValueError):
+            resize_bytes(b"abc", 8, out=bytearray(4))
+
+    def test_place_bytes_returns_copied_length(self):
+        self.assertEqual(place_bytes(b"abcdef", bytearray(4), 2), 2)
+        self.assertEqual(place_bytes(b"abcdef", bytearray(4), -5), 1)
+        self.assertEqual(place_bytes(b"abcdef", bytearray(4), 10), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
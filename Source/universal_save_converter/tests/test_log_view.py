@@ -0,0 +1,162 @@
+# tests/test_log_view.py
+#
+# Reverse line reading and the bounded GUI log view. LogView only needs
+# a handful of Text methods, so a small in-memory stand-in replaces the
+# widget (tkinter.Tcl() has no Text widgets).
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core import logger
+from core.log_view import LogView, read_lines_reverse
+
+
+class FakeText:
+    """The Text widget methods LogView uses, over whole lines."""
+
+    def __init__(self, lines=()):
+        self.lines = list(lines)
+
+    def index(self, index):
+        assert index == "end-1c"
+        # A Text widget always holds one more (empty) line than it was given
+        return f"{len(self.lines) + 1}.0"
+
+    def delete(self, start, end):
+        assert start == "1.0" and end.endswith(".0")
+        del self.lines[:int(end.split(".")[0]) - 1]
+
+    def get(self, start, end):
+        assert (start, end) == ("1.0", "1.end")
+        return self.lines[0] if self.lines else ""
+
+    def insert(self, index, *chunks):
+        assert index == "1.0"
+        text = "".join(chunks[::2])
+        self.lines[:0] = text.splitlines()
+
+    def yview_moveto(self, fraction):
+        pass
+
+
+def file_line(i):
+    return f"[2024-01-01 12:{i // 60:02d}:{i % 60:02d}] [INFO] record {i}"
+
+
+def shown_line(i):
+    return f"[2024-01-01 12:{i // 60:02d}:{i % 60:02d}] record {i}"
+
+
+class ReadLinesReverseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, "log.txt")
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, data):
+        with open(self.path, "wb") as f:
+            f.write(data)
+
+    def test_matches_forward_reading(self):
+        cases = [b"", b"one", b"one\n", b"one\ntwo", b"one\r\ntwo\r\n", b"\n\nx\n\n",
+                 "café\nnaïve\n".encode("utf-8") * 20]
+        for data in cases:
+            self.write(data)
+            expected = data.decode("utf-8").splitlines()
+            for block_size in (1, 2, 3, 7, 4096):
+                with self.subTest(data=data[:20], block_size=block_size):
+                    lines = [line for _, line in read_lines_reverse(self.path, block_size=block_size)]
+                    self.assertEqual(lines[::-1], expected)
+
+    def test_offsets_resume_before_a_line(self):
+        data = b"".join(f"line {i}\n".encode() for i in range(100))
+        self.write(data)
+        first = list(read_lines_reverse(self.path, block_size=16))
+        offset, line = first[10]
+        self.assertEqual(line, "line 89")
+        self.assertTrue(data[offset:].startswith(b"line 89\n"))
+        resumed = [line for _, line in read_lines_reverse(self.path, end=offset, block_size=16)]
+        self.assertEqual(resumed, [f"line {i}" for i in range(88, -1, -1)])
+
+    def test_missing_file_yields_nothing(self):
+        self.assertEqual(list(read_lines_reverse(self.path)), [])
+
+
+class LogViewTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.work_dir.name, "conversion_log.txt")
+        patch = mock.patch.object(logger, "LOG_FILE", self.log_file)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write_log(self, path, numbers):
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(file_line(i) + "\n" for i in numbers)
+
+    def test_trim_removes_a_batch_past_the_limit(self):
+        widget = FakeText(f"line {i}" for i in range(9))
+        view = LogView(widget, max_lines=10, trim_lines=4)
+        self.assertEqual(view.line_count(), 10)
+        self.assertEqual(view.trim(), 0)
+        widget.lines.append("line 9")
+        self.assertEqual(view.trim(), 5)
+        self.assertEqual(view.line_count(), 10 - 4)
+        self.assertEqual(widget.lines, [f"line {i}" for i in range(5, 10)])
+
+    def test_zero_max_lines_never_trims(self):
+        widget = FakeText(f"line {i}" for i in range(5000))
+        view = LogView(widget, max_lines=0)
+        self.assertEqual(view.trim(), 0)
+        self.assertEqual(len(widget.lines), 5000)
+
+    def test_load_older_pages_back_through_rotated_segments(self):
+        self.write_log(self.log_file + ".2", range(0, 10))
+        self.write_log(self.log_file + ".1", range(10, 20))
+        self.write_log(self.log_file, range(20, 30))
+        with open(self.log_file + ".3.gz", "wb") as f:
+            f.write(b"compressed segments are skipped")
+        widget = FakeText(shown_line(i) for i in range(27, 30))
+        view = LogView(widget, max_lines=100, page_lines=5)
+
+        self.assertEqual(view.load_older(), 5)
+        self.assertEqual(widget.lines, [shown_line(i) for i in range(22, 30)])
+        self.assertEqual(view.load_older(10), 10)
+        self.assertEqual(widget.lines[0], shown_line(12))
+        self.assertEqual(view.load_older(100), 12)
+        self.assertEqual(widget.lines, [shown_line(i) for i in range(30)])
+        self.assertEqual(view.load_older(), 0)
+
+    def test_loaded_lines_do_not_count_against_the_limit(self):
+        self.write_log(self.log_file, range(50))
+        widget = FakeText(shown_line(i) for i in range(46, 50))
+        view = LogView(widget, max_lines=5, trim_lines=2)
+        self.assertEqual(view.load_older(20), 20)
+        self.assertEqual(view.trim(), 0)
+        widget.lines.append("new record")
+        self.assertEqual(view.trim(), 3)
+        # The view re-anchors on the new oldest line after trimming
+        self.assertEqual(widget.lines[0], shown_line(29))
+        self.assertEqual(view.load_older(1), 1)
+        self.assertEqual(widget.lines[:2], [shown_line(28), shown_line(29)])
+
+    def test_gui_only_lines_anchor_on_the_next_older_record(self):
+        self.write_log(self.log_file, range(10))
+        # The GUI shows a line the file never saw, in the same second as record 7
+        widget = FakeText(["[2024-01-01 12:00:07] shown only in the GUI", shown_line(7)])
+        view = LogView(widget, max_lines=100)
+        self.assertEqual(view.load_older(2), 2)
+        self.assertEqual(widget.lines[:2], [shown_line(5), shown_line(6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
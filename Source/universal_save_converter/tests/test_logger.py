@@ -0,0 +1,130 @@
+# tests/test_logger.py
+#
+# The background log writer: batching, flush barriers, rotation and
+# shutdown, on a private _LogWriter so the process-wide one is untouched.
+
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from core import logger
+from core.log_rotation import Rotation
+
+TIMEOUT = 5.0
+
+
+class LogWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.work_dir.name, "test.log")
+        self.console = io.StringIO()
+        patch = mock.patch.object(logger, "console_stream", self.console)
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.writer = None
+
+    def tearDown(self):
+        if self.writer is not None and self.writer.is_alive():
+            self.stop()
+        self.work_dir.cleanup()
+
+    def start(self):
+        self.writer = logger._LogWriter()
+        self.writer.start()
+        return self.writer
+
+    def put(self, text, console=True, path=None, rotation=None):
+        self.writer.queue.put((text if console else None, path or self.path, text, rotation))
+
+    def flush(self):
+        done = threading.Event()
+        self.writer.queue.put(done)
+        self.assertTrue(done.wait(TIMEOUT))
+
+    def stop(self):
+        self.writer.queue.put(logger._LogWriter._STOP)
+        self.writer.join(TIMEOUT)
+        self.assertFalse(self.writer.is_alive())
+
+    def read(self, path=None):
+        if not os.path.exists(path or self.path):
+            return ""
+        with open(path or self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_flush_writes_everything_in_order(self):
+        self.start()
+        lines = [f"line {i}\n" for i in range(50)]
+        for i, line in enumerate(lines):
+            self.put(line, console=i % 2 == 0)
+        self.flush()
+        self.assertEqual(self.read(), "".join(lines))
+        self.assertEqual(self.console.getvalue(), "".join(lines[::2]))
+
+    def test_records_wait_for_the_interval_or_a_full_batch(self):
+        with mock.patch.object(logger, "FLUSH_INTERVAL", 60), mock.patch.object(logger, "FLUSH_MAX_RECORDS", 3):
+            self.start()
+            self.put("a\n")
+            time.sleep(0.1)
+            self.assertEqual(self.read(), "")  # batched, not written per record
+
+            self.put("b\n")
+            self.put("c\n")
+            deadline = time.monotonic() + TIMEOUT
+            while self.read() != "a\nb\nc\n" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.read(), "a\nb\nc\n")
+
+    def test_interval_flushes_a_partial_batch(self):
+        with mock.patch.object(logger, "FLUSH_INTERVAL", 0.05):
+            self.start()
+            self.put("a\n")
+            deadline = time.monotonic() + TIMEOUT
+            while not self.read() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.read(), "a\n")
+
+    def test_files_rotate_at_their_cap(self):
+        rotation = Rotation(max_bytes=100, backups=2)
+        self.start()
+        for i in range(25):
+            self.put(f"record {i:03d}\n", rotation=rotation)  # 11 bytes each: rotates at 110 and 220
+            self.flush()
+        segments = sorted(name for name in os.listdir(self.work_dir.name))
+        self.assertEqual(segments, ["test.log", "test.log.1", "test.log.2"])
+        self.assertLessEqual(os.path.getsize(self.path), 100)
+        self.assertTrue(self.read().startswith("record 020\n"))
+        self.assertTrue(self.read().endswith("record 024\n"))
+
+    def test_unwritable_path_does_not_stop_the_writer(self):
+        self.start()
+        self.put("lost\n", path=os.path.join(self.work_dir.name, "missing", "x.log"))
+        self.put("kept\n")
+        self.flush()
+        self.assertEqual(self.read(), "kept\n")
+
+    def test_stop_writes_pending_records_and_closes_files(self):
+        with mock.patch.object(logger, "FLUSH_INTERVAL", 60):
+            self.start()
+            self.put("last\n")
+            self.stop()
+        self.assertEqual(self.read(), "last\n")
+        self.assertEqual(self.writer._files, {})
+
+
+class LogTest(unittest.TestCase):
+
+    def test_log_reaches_the_log_file(self):
+        logger.log("written through the writer thread", level="WARN")
+        logger.flush_logs()
+        with open(logger.LOG_FILE, encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith("[WARN] written through the writer thread\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_profiling.py
+#
+# Profiling sessions: report files, one session at a time, and report
+# failures that must not hide the profiled block's own exception.
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from core.profiling import profiled
+
+
+def busy():
+    return sum(i * i for i in range(10000))
+
+
+class ProfiledTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.work_dir.name, "reports", "run")
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def test_reports_are_written(self):
+        with profiled(self.prefix, memory_top=5) as profiler:
+            self.assertIsNotNone(profiler)
+            busy()
+        for suffix in (".pstats", ".collapsed", ".memory.txt"):
+            self.assertTrue(os.path.getsize(self.prefix + suffix) > 0, suffix)
+        with open(self.prefix + ".collapsed", encoding="utf-8") as f:
+            self.assertIn("busy (test_profiling.py:", f.read())
+
+    def test_one_session_at_a_time(self):
+        inner = []
+
+        def other_thread():
+            with profiled(self.prefix + "-thread") as session:
+                inner.append(session)
+
+        with profiled(self.prefix) as outer:
+            with profiled(self.prefix + "-nested") as nested:
+                inner.append(nested)
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+        self.assertIsNotNone(outer)
+        self.assertEqual(inner, [None, None])
+        with profiled(self.prefix) as again:
+            self.assertIsNotNone(again)
+
+    def test_report_failure_keeps_the_block_exception(self):
+        blocker = os.path.join(self.work_dir.name, "not-a-directory")
+        with open(blocker, "w"):
+            pass
+        with mock.patch("core.profiling.log") as log:
+            with self.assertRaises(KeyError):
+                with profiled(os.path.join(blocker, "run")):
+                    raise KeyError("from the profiled block")
+        self.assertEqual(log.call_args.kwargs["level"], "ERROR")
+
+    def test_report_failure_without_a_block_exception_is_logged(self):
+        with mock.patch("core.profiling.write_collapsed", side_effect=OSError("disk full")), \
+                mock.patch("core.profiling.log") as log:
+            with profiled(self.prefix):
+                busy()
+        self.assertIn("disk full", log.call_args.args[0])
+        with profiled(self.prefix) as session:
+            self.assertIsNotNone(session)  # the lock was released
+
+
+if __name__ == "__main__":
+    unittest.main()
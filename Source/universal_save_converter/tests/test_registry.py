@@ -0,0 +1,74 @@
+# tests/test_registry.py
+#
+# The console system registry: built-ins are registered without being
+# imported, plugins are discovered once from entry points, and a system's
+# module is only imported on first load().
+
+import os
+import subprocess
+import sys
+import unittest
+from importlib.metadata import EntryPoint
+from unittest import mock
+
+from systems import registry
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def plugin(name, value):
+    return EntryPoint(name, value, registry.ENTRY_POINT_GROUP)
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        for patch in (mock.patch.dict(registry._registry), mock.patch.object(registry, "_discovered", False)):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_builtins_are_registered_lazily(self):
+        entries = registry.systems()
+        self.assertEqual(set(entries), set(registry.BUILTIN_SYSTEMS))
+        for console, entry in entries.items():
+            self.assertEqual((entry.target, entry.origin), (registry.BUILTIN_SYSTEMS[console], "builtin"))
+        self.assertIsNone(registry.get_system("Sega Saturn"))
+
+    def test_listing_systems_imports_no_gui(self):
+        code = ("import sys; from systems import registry; registry.systems(); "
+                "print(sorted(m for m in sys.modules if m.endswith('_gui_main') or m == 'tkinter'))")
+        output = subprocess.run([sys.executable, "-c", code], cwd=SOURCE_DIR, capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+    def test_load_imports_on_first_use(self):
+        entry = registry.register_system("Test System", "os:path.join")
+        self.assertFalse(entry.loaded)
+        self.assertIs(entry.load(), os.path.join)
+        self.assertTrue(entry.loaded)
+        self.assertEqual(entry("a"), "a")
+        self.assertIs(registry.get_system("Test System"), entry)
+
+    def test_bad_targets_raise_on_load(self):
+        with self.assertRaises(ImportError):
+            registry.SystemEntry("Missing", "no_such_module:setup").load()
+        with self.assertRaises(AttributeError):
+            registry.SystemEntry("Missing", "os:no_such_function").load()
+
+    def test_discover_plugins_once(self):
+        found = [plugin("Sega Saturn", "usc_saturn.gui:setup_saturn_gui"),
+                 plugin("Nintendo 64", "evil.gui:setup")]
+        with mock.patch("importlib.metadata.entry_points", return_value=found) as entry_points:
+            discovered = registry.discover_plugins()
+            self.assertEqual(registry.discover_plugins(), [])
+        entry_points.assert_called_once_with(group=registry.ENTRY_POINT_GROUP)
+
+        self.assertEqual([entry.console for entry in discovered], ["Sega Saturn"])
+        self.assertEqual(discovered[0].origin, "plugin")
+        self.assertFalse(discovered[0].loaded)
+        # Built-ins win over plugins with the same label
+        self.assertEqual(registry.get_system("Nintendo 64").target, registry.BUILTIN_SYSTEMS["Nintendo 64"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# tests/test_streaming.py
+#
+# Chunked streaming against the original kernels and the in-memory path,
+# including chunk sizes that split words and the padding windows.
+
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from benchmarks.legacy_kernels import byteswap_loop, resize_bytes_loop
+from core.exceptions import SaveReadError
+from core.stream_utils import LazyFileWriter, stream_convert
+from systems.n64.n64_constants import SOURCE_LIST, TARGET_LIST, SRA_LABEL, SRM_LABEL, SIZE_SRA
+from systems.n64.n64_conversion_core import convert, convert_stream
+from systems.n64.n64_conversion_plan import resolve_plan
+
+CHUNK_SIZES = (1, 3, 8, 4096)
+
+
+class OneByteReader(io.RawIOBase):
+    """A pipe-like reader that returns at most one byte per read."""
+
+    def __init__(self, data):
+        self.data = memoryview(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.data:
+            return 0
+        buffer[0] = self.data[0]
+        self.data = self.data[1:]
+        return 1
+
+
+class StreamConvertTest(unittest.TestCase):
+
+    def test_matches_baseline(self):
+        rng = random.Random(3)
+        for size in (1, 3, 7, 64, 1000):
+            data = rng.randbytes(size)
+            for tgt_size in (None, 1, 5, 512, 2048):
+                for offset in ((0,) if tgt_size is None else (0, 3, -2, 100, -5000, 6000)):
+                    for swap_size in (1, 2, 4):
+                        expected = resize_bytes_loop(data, tgt_size, offset) if tgt_size is not None else data
+                        expected = byteswap_loop(expected, swap_size)
+                        for chunk_size in CHUNK_SIZES:
+                            for drain in (False, True):
+                                with self.subTest(size=size, tgt_size=tgt_size, offset=offset,
+                                                  swap_size=swap_size, chunk_size=chunk_size, drain=drain):
+                                    out = io.BytesIO()
+                                    bytes_in, bytes_out = stream_convert(io.BytesIO(data), out, tgt_size, offset,
+                                                                         swap_size, chunk_size, drain=drain)
+                                    self.assertEqual(out.getvalue(), expected)
+                                    self.assertEqual(bytes_out, len(expected))
+                                    if drain:
+                                        self.assertEqual(bytes_in, size)
+
+    def test_short_reads(self):
+        data = random.Random(4).randbytes(999)
+        out = io.BytesIO()
+        stream_convert(OneByteReader(data), out, 1200, 50, 4, chunk_size=64)
+        self.assertEqual(out.getvalue(), byteswap_loop(resize_bytes_loop(data, 1200, 50), 4))
+
+    def test_empty_input_writes_nothing(self):
+        out = io.BytesIO()
+        with self.assertRaises(SaveReadError):
+            stream_convert(io.BytesIO(b""), out, 2048, 100, 2)
+        self.assertEqual(out.getvalue(), b"")
+
+    def test_chunk_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            stream_convert(io.BytesIO(b"abc"), io.BytesIO(), chunk_size=0)
+
+    def test_offset_needs_target_size(self):
+        with self.assertRaises(ValueError):
+            stream_convert(io.BytesIO(b"abc"), io.BytesIO(), None, 4)
+
+
+class LazyFileWriterTest(unittest.TestCase):
+
+    def test_failed_stream_leaves_existing_file_unchanged(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "existing.srm")
+            with open(path, "wb") as f:
+                f.write(b"keep me")
+            writer = LazyFileWriter(path)
+            with self.assertRaises(SaveReadError):
+                stream_convert(io.BytesIO(b""), writer, 4096)
+            writer.close()
+            self.assertFalse(writer.opened)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"keep me")
+
+    def test_opens_on_first_write(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "out.sra")
+            writer = LazyFileWriter(path)
+            self.assertFalse(os.path.exists(path))
+            stream_convert(io.BytesIO(b"abcd"), writer, 8, 2, 2)
+            writer.close()
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), byteswap_loop(resize_bytes_loop(b"abcd", 8, 2), 2))
+
+
+class ConvertStreamTest(unittest.TestCase):
+
+    def test_matches_in_memory_conversion(self):
+        data = random.Random(5).randbytes(SIZE_SRA)
+        for tgt_type in (SRA_LABEL, SRM_LABEL):
+            for src in SOURCE_LIST:
+                for tgt in TARGET_LIST:
+                    plan = resolve_plan(src, SRA_LABEL, tgt, tgt_type)
+                    with self.subTest(plan=plan.key):
+                        out = io.BytesIO()
+                        result = convert_stream(io.BytesIO(data), out, plan, chunk_size=4099, quiet=True)
+                        with convert(data, plan, quiet=True, pool=None) as expected:
+                            self.assertEqual(out.getvalue(), bytes(expected.data))
+                        self.assertEqual(result.input_size, SIZE_SRA)
+                        self.assertEqual(result.size, len(out.getvalue()))
+
+    def test_empty_stream_raises_before_writing(self):
+        plan = resolve_plan(SOURCE_LIST[1], SRA_LABEL, TARGET_LIST[2], SRM_LABEL)
+        out = io.BytesIO()
+        with self.assertRaises(SaveReadError):
+            convert_stream(io.BytesIO(b""), out, plan, quiet=True)
+        self.assertEqual(out.getvalue(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# tests/test_timing.py
+#
+# StageTimer laps and the rolling per-path statistics, including the
+# nearest-rank percentiles they report.
+
+import time
+import unittest
+from fractions import Fraction
+
+from core.timing import RollingStats, StageTimer, _percentile, format_stats
+
+PERCENTILES = (1, 5, 25, 50, 75, 90, 95, 99, 100)
+
+
+def nearest_rank(ordered, pct):
+    """Smallest value with at least pct% of the samples at or below it, in exact arithmetic."""
+    for rank, value in enumerate(ordered, 1):
+        if Fraction(rank, len(ordered)) >= Fraction(pct, 100):
+            return value
+    return ordered[-1]
+
+
+class PercentileTest(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        for n in range(1, 202):
+            ordered = list(range(1, n + 1))
+            for pct in PERCENTILES:
+                with self.subTest(n=n, pct=pct):
+                    self.assertEqual(_percentile(ordered, pct), nearest_rank(ordered, pct))
+
+    def test_median_of_even_counts_is_the_lower_middle(self):
+        # round() rounds halves to even, which pushed these one rank too high
+        self.assertEqual(_percentile([1, 2], 50), 1)
+        self.assertEqual(_percentile([1, 2, 3, 4, 5, 6], 50), 3)
+        self.assertEqual(_percentile(list(range(1, 21)), 95), 19)
+
+
+class StageTimerTest(unittest.TestCase):
+
+    def test_laps_accumulate_per_stage(self):
+        timer = StageTimer(trace=True)
+        time.sleep(0.01)
+        first = timer.lap("read")
+        timer.lap("swap")
+        timer.lap("read")
+        timer.add("dialog", 2.0)
+        self.assertGreaterEqual(first, 0.005)
+        self.assertEqual(list(timer.stages), ["read", "swap", "dialog"])
+        self.assertAlmostEqual(timer.total, sum(timer.stages.values()))
+        self.assertEqual([stage for stage, _, _ in timer.spans], ["read", "swap", "read"])
+        for (_, start, end), (_, next_start, _) in zip(timer.spans, timer.spans[1:]):
+            self.assertLessEqual(start, end)
+            self.assertEqual(end, next_start)
+        wall_start = timer.wall_spans()[0][1]
+        self.assertLess(abs(wall_start / 1e9 - time.time()), 60)
+
+    def test_restart_discards_idle_time(self):
+        timer = StageTimer()
+        time.sleep(0.02)
+        timer.restart()
+        self.assertLess(timer.lap("resize"), 0.02)
+        self.assertIsNone(timer.spans)
+        self.assertEqual(timer.wall_spans(), [])
+
+    def test_on_lap_sees_every_lap(self):
+        seen = []
+        timer = StageTimer(on_lap=lambda stage, seconds: seen.append(stage))
+        timer.lap("read")
+        timer.lap("write")
+        self.assertEqual(seen, ["read", "write"])
+
+
+class RollingStatsTest(unittest.TestCase):
+
+    def test_summary_per_path(self):
+        stats = RollingStats(window=4)
+        for i in range(1, 7):
+            stats.record("a", {"swap": i / 1000, "read": i / 1000, "custom": 0.0}, nbytes=1000)
+        stats.record("b", {"read": 0.5})
+
+        result = stats.stats()
+        a = result["a"]
+        self.assertEqual((a["count"], a["window"]), (6, 4))
+        # Only the last four runs (3..6) remain: 6, 8, 10, 12 ms in total
+        self.assertAlmostEqual(a["total"]["p50_ms"], 8.0)
+        self.assertAlmostEqual(a["total"]["p99_ms"], 12.0)
+        self.assertAlmostEqual(a["stages"]["read"]["p50_ms"], 4.0)
+        self.assertEqual(list(a["stages"]), ["read", "swap", "custom"])
+        self.assertAlmostEqual(a["bytes_per_second"], 4000 / 0.036)
+        self.assertEqual(result["b"]["bytes_per_second"], 0.0)  # no byte counts recorded
+
+        lines = format_stats(result)
+        self.assertTrue(lines[0].startswith("b: 1 run(s)"))  # slowest path first
+        self.assertIn("read", lines[1])
+        stats.clear()
+        self.assertEqual(stats.stats(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# tests/test_trace.py
+#
+# Chrome trace-event export: tracks per worker, file spans with their
+# stage spans nested inside, and the written JSON file.
+
+import json
+import os
+import tempfile
+import unittest
+
+from core.trace import trace_events, write_trace
+from systems.n64.n64_batch import BatchJob, BatchResult, BatchSummary, plan_jobs, run_batch
+from systems.n64.n64_constants import SIZE_SRA, SOURCE_LIST, TARGET_LIST, SRA_LABEL, SRM_LABEL
+from systems.n64.n64_conversion_plan import resolve_plan
+
+PLAN = resolve_plan(SOURCE_LIST[0], SRA_LABEL, TARGET_LIST[0], SRM_LABEL)
+STARTED = 1_700_000_000.0
+BASE_NS = int(STARTED * 1e9)
+
+
+def result(name, worker, offset_s, elapsed, spans=(), error=None):
+    return BatchResult(name, f"out/{name}", 100, 200, error, elapsed=elapsed, worker=worker,
+                       started=STARTED + offset_s, spans=list(spans))
+
+
+def by_phase(events, phase):
+    return [event for event in events if event["ph"] == phase]
+
+
+class TraceEventsTest(unittest.TestCase):
+
+    def setUp(self):
+        stage_spans = [("read", BASE_NS + 1_000_000, BASE_NS + 3_000_000),
+                       ("resize", BASE_NS + 3_000_000, BASE_NS + 4_500_000)]
+        results = [
+            result("a.sra", 101, 0.001, 0.004, stage_spans),
+            result("b.sra", 102, 0.002, 0.001),
+            result("c.sra", 101, 0.006, 0.001, error="Output exists"),
+        ]
+        self.jobs = [BatchJob(r.input_path, r.output_path, PLAN) for r in results]
+        self.summary = BatchSummary(results, elapsed=0.01, started=STARTED)
+
+    def test_one_track_per_worker(self):
+        events = trace_events(self.summary, self.jobs)
+        names = [(e["pid"], e["args"]["name"]) for e in by_phase(events, "M") if e["name"] == "process_name"]
+        self.assertEqual(names[1:], [(101, "worker 1 (pid 101)"), (102, "worker 2 (pid 102)")])
+        self.assertEqual(names[0][0], os.getpid())
+        batch = next(e for e in events if e.get("cat") == "batch")
+        self.assertEqual((batch["ts"], batch["dur"]), (0.0, 10000.0))
+        self.assertEqual(batch["args"], {"files": 3, "converted": 2, "failed": 1})
+
+    def test_file_and_stage_spans(self):
+        events = trace_events(self.summary, self.jobs)
+        files = [e for e in events if e.get("cat") == "file"]
+        stages = [e for e in events if e.get("cat") == "stage"]
+        # Float epoch seconds only resolve about 0.25 us, so compare whole microseconds
+        self.assertEqual([(f["name"], f["pid"], round(f["ts"]), round(f["dur"])) for f in files],
+                         [("a.sra", 101, 1000, 4000), ("b.sra", 102, 2000, 1000), ("c.sra", 101, 6000, 1000)])
+        self.assertEqual(files[0]["args"]["plan"], PLAN.key.strip())
+        self.assertEqual(files[2]["args"]["error"], "Output exists")
+        self.assertNotIn("error", files[0]["args"])
+        self.assertEqual([(s["name"], s["ts"], s["dur"]) for s in stages],
+                         [("read", 1000.0, 2000.0), ("resize", 3000.0, 1500.0)])
+
+    def test_anchor_shifts_timestamps(self):
+        events = trace_events(self.summary, self.jobs, anchor_ns=BASE_NS + 1_000_000)
+        first_file = next(e for e in events if e.get("cat") == "file")
+        self.assertEqual(round(first_file["ts"]), 0)
+
+    def test_write_trace(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "trace.json")
+            count = write_trace(path, self.summary, self.jobs)
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+        self.assertEqual(len(payload["traceEvents"]), count)
+        self.assertEqual(payload["displayTimeUnit"], "ms")
+        self.assertEqual(payload["otherData"]["elapsed_seconds"], 0.01)
+
+
+class TracedBatchTest(unittest.TestCase):
+
+    def test_stage_spans_nest_inside_their_file(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            inputs = []
+            for name in ("a.sra", "b.sra"):
+                path = os.path.join(work_dir, name)
+                with open(path, "wb") as f:
+                    f.write(bytes(SIZE_SRA))
+                inputs.append((path, None))
+            jobs, _ = plan_jobs(inputs, lambda path: (PLAN, None), os.path.join(work_dir, "out"))
+            summary = run_batch(jobs, max_workers=1, trace=True)
+
+        events = trace_events(summary, jobs)
+        files = [e for e in events if e.get("cat") == "file"]
+        self.assertEqual(len(files), 2)
+        for result in summary.results:
+            self.assertEqual([stage for stage, _, _ in result.spans], ["read", "resize", "swap", "write"])
+        stages = [e for e in events if e.get("cat") == "stage"]
+        for stage in stages:
+            parent = next(f for f in files if f["ts"] <= stage["ts"] + 1 and
+                          stage["ts"] + stage["dur"] <= f["ts"] + f["dur"] + 1)
+            self.assertEqual(parent["pid"], stage["pid"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# tests/test_update_scheduler.py
+#
+# UpdateScheduler ordering and coalescing on a display-less Tcl interpreter.
+
+import tkinter as tk
+import unittest
+from unittest import mock
+
+from gui.gui_utils import GUIResetManager, UpdateScheduler
+
+
+class UpdateSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.interp = tk.Tcl()
+        self.scheduler = UpdateScheduler(self.interp)
+        self.calls = []
+
+    def var(self, value=""):
+        return tk.StringVar(master=self.interp, value=value)
+
+    def recorder(self, name, func=None):
+        def run():
+            self.calls.append(name)
+            if func is not None:
+                func()
+        return run
+
+    def idle(self):
+        self.interp.update()
+
+    def test_writes_are_coalesced_until_idle(self):
+        source = self.var()
+        self.scheduler.add_node("node", self.recorder("node"), inputs=[source])
+        for value in "abcde":
+            source.set(value)
+        self.assertEqual(self.calls, [])
+        self.idle()
+        self.assertEqual(self.calls, ["node"])
+        self.assertEqual(self.scheduler.last_action["writes"], 5)
+        self.assertEqual(self.scheduler.last_action["recomputes"], {"node": 1})
+
+    def test_writers_run_before_readers(self):
+        source, derived, other = self.var(), self.var(), self.var()
+        # Registered reader first: the order must come from the graph, not registration
+        self.scheduler.add_node("reader", self.recorder("reader"), inputs=[derived, other])
+        self.scheduler.add_node("writer", self.recorder("writer", lambda: derived.set(source.get() + "!")),
+                                inputs=[source], outputs=[derived])
+        other.set("x")
+        source.set("y")
+        self.idle()
+        self.assertEqual(self.calls, ["writer", "reader"])
+        self.assertEqual(derived.get(), "y!")
+
+    def test_after_orders_unrelated_nodes(self):
+        source = self.var()
+        self.scheduler.add_node("second", self.recorder("second"), inputs=[source], after=["first"])
+        self.scheduler.add_node("first", self.recorder("first"), inputs=[source])
+        source.set("x")
+        self.idle()
+        self.assertEqual(self.calls, ["first", "second"])
+
+    def test_run_marks_nodes_directly(self):
+        self.scheduler.add_node("node", self.recorder("node"))
+        self.scheduler.run("node")
+        self.scheduler.run("node")
+        self.idle()
+        self.assertEqual(self.calls, ["node"])
+
+    def test_cycles_are_rejected(self):
+        a, b = self.var(), self.var()
+        self.scheduler.add_node("a", self.recorder("a"), inputs=[a], outputs=[b])
+        with self.assertRaises(ValueError):
+            self.scheduler.add_node("b", self.recorder("b"), inputs=[b], outputs=[a])
+        self.assertNotIn("b", self.scheduler.nodes)
+        with self.assertRaises(ValueError):
+            self.scheduler.add_node("a", self.recorder("a"))
+
+    def test_feedback_loop_is_dropped_with_a_warning(self):
+        a, b = self.var(), self.var()
+        # "echo" writes a without declaring it, so the graph cannot order it away
+        self.scheduler.add_node("copy", self.recorder("copy", lambda: b.set(a.get() + "1")),
+                                inputs=[a], outputs=[b])
+        self.scheduler.add_node("echo", self.recorder("echo", lambda: a.set(b.get())), inputs=[b])
+        with mock.patch("gui.gui_utils.log") as log:
+            a.set("x")
+            self.idle()
+        runs = self.scheduler.last_action["recomputes"]
+        self.assertEqual(runs, {"copy": UpdateScheduler.MAX_PASSES, "echo": UpdateScheduler.MAX_PASSES})
+        self.assertEqual(self.scheduler.last_action["dropped"], ["copy"])
+        log.assert_called_once()
+        self.assertIn("copy", log.call_args.args[0])
+
+    def test_reset_manager_runs_resets_as_nodes(self):
+        source, target_type = self.var(), self.var("EEPROM")
+        manager = GUIResetManager(scheduler=self.scheduler)
+        manager.add_dependency(source, [target_type], name="reset")
+        self.scheduler.add_node("reader", self.recorder("reader", lambda: self.calls.append(target_type.get())),
+                                inputs=[target_type])
+        source.set("Retroarch")
+        self.idle()
+        self.assertEqual(target_type.get(), "")
+        self.assertEqual(self.calls, ["reader", ""])
+        self.assertEqual(self.scheduler.stats()["totals"], {"reset": 1, "reader": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()